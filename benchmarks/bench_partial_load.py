@@ -0,0 +1,73 @@
+"""
+Compare full and table-scoped config loading.
+
+Generates a config with a small `[qualibrate]` table and a large unrelated
+`[quam]` table, then times `get_config_dict(path, "qualibrate")` against a
+full `read_config_file`.
+
+    python benchmarks/bench_partial_load.py --size-mb 5
+"""
+
+import argparse
+import tempfile
+import timeit
+from pathlib import Path
+
+import tomli_w
+
+from qualibrate_config.file import read_config_file
+from qualibrate_config.resolvers import get_config_dict
+from qualibrate_config.vars import QUALIBRATE_CONFIG_KEY
+
+
+def write_config(path: Path, size_mb: float) -> None:
+    item = {
+        "frequency": 5.1e9,
+        "amplitude": 0.25,
+        "name": "qubit",
+        "ports": [1, 2, 3, 4],
+    }
+    item_size = len(tomli_w.dumps({"q": item}))
+    count = int(size_mb * 1024 * 1024 / item_size)
+    config = {
+        QUALIBRATE_CONFIG_KEY: {
+            "version": 6,
+            "project": "bench",
+            "storage": {"location": str(path.parent / "storage")},
+        },
+        "quam": {f"q{i}": item for i in range(count)},
+    }
+    with path.open("wb") as f_out:
+        tomli_w.dump(config, f_out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "config.toml"
+        write_config(path, args.size_mb)
+        size = path.stat().st_size / 1024 / 1024
+        full = min(
+            timeit.repeat(
+                lambda: read_config_file(path, solve_references=False),
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        partial = min(
+            timeit.repeat(
+                lambda: get_config_dict(path, QUALIBRATE_CONFIG_KEY),
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+    print(f"config size: {size:.1f} MiB")
+    print(f"full parse:     {full * 1000:8.1f} ms")
+    print(f"[qualibrate]:   {partial * 1000:8.1f} ms ({full / partial:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
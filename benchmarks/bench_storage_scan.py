@@ -0,0 +1,94 @@
+"""
+Compare the single-pass storage scan with the previous glob-based one.
+
+Generates a storage tree with `--nodes` node directories
+(`<storage>/<date>/#<id>`) spread over `--days` date directories, then
+times `_storage_stat` (one `os.scandir` pass, serial and with date dirs
+scanned concurrently) against the three `Path.glob("*/#*")` passes it
+replaced, and the repeated scan with an up-to-date `.stats` index.
+
+    python benchmarks/bench_storage_scan.py --nodes 100000
+"""
+
+import argparse
+import os
+import tempfile
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+from qualibrate_config.core.project.p_list import _dt_from_ts, _storage_stat
+from qualibrate_config.core.project.storage import (
+    DEFAULT_SCAN_JOBS,
+    stat_ctime,
+)
+
+
+def make_storage(path: Path, nodes: int, days: int) -> None:
+    per_day = -(-nodes // days)
+    for node_id in range(nodes):
+        day_path = path / f"2025-01-{node_id // per_day:04d}"
+        (day_path / f"#{node_id}_node_{node_id % 7}").mkdir(parents=True)
+        if node_id % per_day == 0:
+            (day_path / "data.json").write_text("{}")
+    # old date dirs are trusted by the index
+    for day_path in path.iterdir():
+        os.utime(day_path, (0, 0))
+
+
+def glob_storage_stat(path: Path) -> tuple[int, object, object]:
+    """Previous implementation: three glob passes with per-entry stats."""
+    storage_stat = path.stat()
+    nodes = sum(1 for p in path.glob("*/#*") if p.is_dir())
+    first = min(
+        (p for p in path.glob("*/#*") if p.is_dir()),
+        key=lambda p: stat_ctime(p.stat()),
+        default=None,
+    )
+    created = stat_ctime(storage_stat)
+    if first is not None:
+        created = min(created, stat_ctime(first.stat()))
+    last = max(
+        (p for p in path.glob("*/#*") if p.is_dir()),
+        key=lambda p: p.stat().st_mtime,
+        default=None,
+    )
+    modified = storage_stat.st_mtime
+    if last is not None:
+        modified = max(modified, last.stat().st_mtime)
+    return nodes, _dt_from_ts(created), _dt_from_ts(modified)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=500)
+    parser.add_argument("--scan-jobs", type=int, default=DEFAULT_SCAN_JOBS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    def best(func: Callable[[], object]) -> float:
+        return min(timeit.repeat(func, number=1, repeat=args.repeat))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = Path(tmp) / "storage"
+        index_path = Path(tmp) / ".stats"
+        make_storage(storage, args.nodes, args.days)
+        assert glob_storage_stat(storage) == _storage_stat(storage)
+        glob_time = best(lambda: glob_storage_stat(storage))
+        timings = {
+            "scandir": best(lambda: _storage_stat(storage, scan_jobs=1)),
+            f"scandir, {args.scan_jobs} jobs": best(
+                lambda: _storage_stat(storage, scan_jobs=args.scan_jobs)
+            ),
+        }
+        _storage_stat(storage, index_path)
+        timings["indexed"] = best(lambda: _storage_stat(storage, index_path))
+    print(f"nodes: {args.nodes} in {args.days} dirs")
+    print(f"{'glob (3 passes)':<20} {glob_time * 1000:8.1f} ms")
+    for name, timing in timings.items():
+        print(f"{name:<20} {timing * 1000:8.1f} ms ({glob_time / timing:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
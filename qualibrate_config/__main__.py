@@ -4,6 +4,7 @@ from qualibrate_config.cli import (
     config_command,
     migrate_command,
     project_group,
+    serve_command,
 )
 
 
@@ -15,6 +16,7 @@ def cli() -> None:
 cli.add_command(config_command)
 cli.add_command(migrate_command)
 cli.add_command(project_group)
+cli.add_command(serve_command)
 
 
 def main() -> None:
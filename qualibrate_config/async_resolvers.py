@@ -0,0 +1,136 @@
+import asyncio
+from collections.abc import Callable, Hashable
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+from qualibrate_config.models import BaseConfig, QualibrateConfig
+from qualibrate_config.qulibrate_types import RawConfigType
+from qualibrate_config.resolvers import (
+    get_config_model,
+    get_qualibrate_config,
+    get_qualibrate_config_path,
+)
+
+__all__ = ["aget_config_model", "aget_qualibrate_config"]
+
+ConfigClass = TypeVar("ConfigClass", bound=BaseConfig)
+T = TypeVar("T")
+
+# Loads in progress, keyed by loop (futures are loop-bound) and call key
+_in_flight: dict[
+    tuple[asyncio.AbstractEventLoop, Hashable], "asyncio.Task[Any]"
+] = {}
+
+
+async def _single_flight(
+    key: Hashable, func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """
+    Run `func` in a worker thread. Concurrent calls with the same key await
+    the same run instead of starting a new one.
+    """
+    loop = asyncio.get_running_loop()
+    flight_key = (loop, key)
+    task = _in_flight.get(flight_key)
+    if task is None:
+        task = loop.create_task(asyncio.to_thread(func, *args, **kwargs))
+        _in_flight[flight_key] = task
+
+        def _done(done: "asyncio.Task[Any]") -> None:
+            if _in_flight.get(flight_key) is done:
+                del _in_flight[flight_key]
+
+        task.add_done_callback(_done)
+    # shield: a cancelled waiter mustn't cancel the load shared with others
+    return cast(T, await asyncio.shield(task))
+
+
+async def _resolve_config_path(config_path: Path | None) -> Path:
+    if config_path is None:
+        config_path = await asyncio.to_thread(get_qualibrate_config_path)
+    return config_path
+
+
+async def aget_config_model(
+    config_path: Path,
+    config_key: str | None,
+    config_class: type[ConfigClass] = QualibrateConfig,  # type: ignore
+    config: RawConfigType | None = None,
+    raw_config_validators: list[Callable[[RawConfigType], None]] | None = None,
+) -> ConfigClass:
+    """Async version of `get_config_model`.
+
+    File reading, parsing and model building run in a worker thread.
+    Concurrent calls for the same file, key and class share one load.
+    """
+    if config is not None:
+        return await asyncio.to_thread(
+            get_config_model,
+            config_path,
+            config_key,
+            config_class,
+            config,
+            raw_config_validators,
+        )
+    key = (
+        "model",
+        config_path.absolute(),
+        config_key,
+        config_class,
+        tuple(raw_config_validators or ()),
+    )
+    return await _single_flight(
+        key,
+        get_config_model,
+        config_path,
+        config_key,
+        config_class,
+        None,
+        raw_config_validators,
+    )
+
+
+async def aget_qualibrate_config(
+    config_path: Path | None = None,
+    config: RawConfigType | None = None,
+    auto_migrate: bool = True,
+    *,
+    use_cache: bool = True,
+    persist_migration: bool = True,
+    project: str | None = None,
+) -> QualibrateConfig:
+    """Async version of `get_qualibrate_config`.
+
+    Delegates to the sync function in a worker thread, so both share the
+    same loading path and cache. Concurrent cached calls for the same config
+    file (and project) share one load; calls with `use_cache=False` aren't
+    coalesced, so each of them gets its own config instance.
+    """
+    config_path = await _resolve_config_path(config_path)
+    if config is not None or not use_cache:
+        return await asyncio.to_thread(
+            get_qualibrate_config,
+            config_path,
+            config,
+            auto_migrate,
+            use_cache=use_cache,
+            persist_migration=persist_migration,
+            project=project,
+        )
+    key = (
+        "qualibrate",
+        config_path.absolute(),
+        project,
+        auto_migrate,
+        persist_migration,
+    )
+    return await _single_flight(
+        key,
+        get_qualibrate_config,
+        config_path,
+        None,
+        auto_migrate,
+        use_cache=use_cache,
+        persist_migration=persist_migration,
+        project=project,
+    )
@@ -1,5 +1,11 @@
 from .config import config_command
 from .migrate import migrate_command
 from .project import project_group
+from .serve import serve_command
 
-__all__ = ["config_command", "migrate_command", "project_group"]
+__all__ = [
+    "config_command",
+    "migrate_command",
+    "project_group",
+    "serve_command",
+]
@@ -1,8 +1,6 @@
-from copy import deepcopy
 from pathlib import Path
 
 import click
-from click.exceptions import Exit
 
 from qualibrate_config.cli.deprecated import (
     DeprecatedOption,
@@ -15,15 +13,18 @@ from qualibrate_config.cli.vars import (
     SINGLE_BACKEND_DEPRECATION_MSG,
     STORAGE_LOCATION_HELP,
 )
+from qualibrate_config.core.approve import print_and_confirm
 from qualibrate_config.core.content import (
     get_config_file_content,
-    simple_write,
     write_config,
 )
 from qualibrate_config.core.defaults import get_user_storage
+from qualibrate_config.core.fingerprint import file_fingerprint
 from qualibrate_config.core.from_sources import (
     qualibrate_config_from_sources,
 )
+from qualibrate_config.core.lock import config_lock
+from qualibrate_config.file import get_config_file
 from qualibrate_config.models import PathSerializer
 from qualibrate_config.models.qualibrate import QualibrateTopLevelConfig
 from qualibrate_config.models.storage_type import StorageType
@@ -32,6 +33,7 @@ from qualibrate_config.validation import (
     validate_version_and_migrate_if_needed,
 )
 from qualibrate_config.vars import (
+    DEFAULT_CONFIG_FILENAME,
     DEFAULT_CONFIG_FILEPATH,
     QUALIBRATE_CONFIG_KEY,
     QUALIBRATE_PATH,
@@ -271,14 +273,58 @@ def config_command(
     quam_state_path: Path | None,
     check_generator: bool,
 ) -> None:
+    config_file = get_config_file(
+        config_path, DEFAULT_CONFIG_FILENAME, raise_not_exists=False
+    )
+    # The confirmation may take long, so the lock isn't held while waiting
+    # for it. The config is built again under the lock from the current
+    # file content; other changes made meanwhile are kept.
+    fingerprint = file_fingerprint(config_file)
+    common_config, config_file, qs = _build_config(
+        ctx, config_path, quam_state_path, persist_migration=False
+    )
+    if not auto_accept or check_generator:
+        common_config[QUALIBRATE_CONFIG_KEY] = qs.qualibrate.serialize(
+            exclude_none=True
+        )
+        print_and_confirm(config_file, common_config, check_generator)
+    with config_lock(config_path):
+        if file_fingerprint(config_file) != fingerprint:
+            click.secho(
+                "Config file was changed while waiting for confirmation. "
+                "Changes are merged.",
+                fg="yellow",
+            )
+        common_config, config_file, qs = _build_config(
+            ctx, config_path, quam_state_path, persist_migration=True
+        )
+        write_config(
+            config_file,
+            common_config,
+            qs.qualibrate,
+            QUALIBRATE_CONFIG_KEY,
+            confirm=False,
+        )
+
+
+def _build_config(
+    ctx: click.Context,
+    config_path: Path,
+    quam_state_path: Path | None,
+    persist_migration: bool,
+) -> tuple[RawConfigType, Path, QualibrateTopLevelConfig]:
     common_config, config_file = get_config_file_content(config_path)
-    old_config = deepcopy(common_config)
     common_config, config_file = validate_version_and_migrate_if_needed(
-        common_config, config_file
+        common_config, config_file, persist=persist_migration
     )
     qualibrate_config = common_config.get(QUALIBRATE_CONFIG_KEY, {})
     required_subconfigs = ("storage",)
-    optional_subconfigs = ("app", "runner", "composite", "calibration_library")
+    optional_subconfigs = (
+        "app",
+        "runner",
+        "composite",
+        "calibration_library",
+    )
     qualibrate_config = qualibrate_config_from_sources(
         ctx,
         qualibrate_config,
@@ -287,20 +333,8 @@ def config_command(
     )
     qs = QualibrateTopLevelConfig({QUALIBRATE_CONFIG_KEY: qualibrate_config})
     qs.qualibrate.storage.location.mkdir(parents=True, exist_ok=True)
-    try:
-        _temporary_fill_quam_state_path(common_config, quam_state_path)
-        write_config(
-            config_file,
-            common_config,
-            qs.qualibrate,
-            QUALIBRATE_CONFIG_KEY,
-            confirm=not auto_accept,
-            check_generator=check_generator,
-        )
-    except Exit:
-        if old_config:
-            simple_write(config_file, old_config)
-        raise
+    _temporary_fill_quam_state_path(common_config, quam_state_path)
+    return common_config, config_file, qs
 
 
 def _temporary_fill_quam_state_path(
@@ -1,13 +1,19 @@
+from .apply import apply_command
+from .clone import clone_command
 from .create import create_command
 from .current import current_command
 from .delete import delete_command
 from .list import list_command
+from .purge import purge_command
 from .switch import switch_command
 
 __all__ = [
+    "apply_command",
+    "clone_command",
     "create_command",
     "current_command",
     "delete_command",
     "list_command",
+    "purge_command",
     "switch_command",
 ]
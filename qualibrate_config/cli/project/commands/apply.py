@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+import click
+
+from qualibrate_config.cli.vars import CONFIG_PATH_HELP
+from qualibrate_config.core.project.apply import apply_projects, read_manifest
+from qualibrate_config.vars import DEFAULT_CONFIG_FILEPATH
+
+__all__ = ["apply_command"]
+
+
+@click.command(
+    name="apply",
+    help=(
+        "Create, update and delete projects listed in the MANIFEST and "
+        "switch to its `switch` project. Nothing is changed if any of the "
+        "operations fails."
+    ),
+)
+@click.argument(
+    "manifest",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "--config-path",
+    type=click.Path(exists=True, path_type=Path),
+    default=DEFAULT_CONFIG_FILEPATH,
+    show_default=True,
+    help=CONFIG_PATH_HELP,
+)
+def apply_command(manifest: Path, config_path: Path) -> None:
+    try:
+        projects_manifest = read_manifest(manifest)
+        apply_projects(config_path, projects_manifest, detach=True)
+    except ValueError as e:
+        click.secho(str(e), fg="red")
+        sys.exit(1)
+    for operation in projects_manifest.operations:
+        click.echo(f"Project '{operation.name}': {operation.action}d.")
+    if projects_manifest.switch is not None:
+        click.echo(f"Project switched to '{projects_manifest.switch}'.")
+
+
+if __name__ == "__main__":
+    apply_command([], standalone_mode=False)
@@ -0,0 +1,102 @@
+import sys
+from pathlib import Path
+
+import click
+
+from qualibrate_config.cli.vars import (
+    CONFIG_PATH_HELP,
+    QUAM_STATE_PATH_HELP,
+    STORAGE_LOCATION_HELP,
+)
+from qualibrate_config.core.project.clone import (
+    CLONE_MODES,
+    DEFAULT_CLONE_JOBS,
+    clone_project,
+)
+from qualibrate_config.vars import DEFAULT_CONFIG_FILEPATH
+
+__all__ = ["clone_command"]
+
+
+@click.command(
+    name="clone",
+    help="Create project TARGET as a copy of project SOURCE with its data.",
+)
+@click.argument("source", type=str)
+@click.argument("target", type=str)
+@click.option(
+    "--config-path",
+    type=click.Path(exists=True, path_type=Path),
+    default=DEFAULT_CONFIG_FILEPATH,
+    show_default=True,
+    help=CONFIG_PATH_HELP,
+)
+@click.option(
+    "--storage-location",
+    type=click.Path(
+        file_okay=False, dir_okay=True, resolve_path=True, path_type=Path
+    ),
+    required=False,
+    help=(
+        f"{STORAGE_LOCATION_HELP} Derived from the source project storage "
+        "location if not specified."
+    ),
+)
+@click.option(
+    "--quam-state-path",
+    type=click.Path(
+        file_okay=False, dir_okay=True, resolve_path=True, path_type=Path
+    ),
+    required=False,
+    help=(
+        f"{QUAM_STATE_PATH_HELP} Derived from the source project quam state "
+        "path if not specified."
+    ),
+)
+@click.option(
+    "--mode",
+    type=click.Choice(CLONE_MODES),
+    default="auto",
+    show_default=True,
+    help=(
+        "How storage files are cloned: reflink (copy-on-write), hardlink "
+        "(files share content with the source project) or copy. Auto uses "
+        "the first one supported by the filesystem. Quam state files are "
+        "never hardlinked."
+    ),
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CLONE_JOBS,
+    show_default=True,
+    help="Number of dirs cloned concurrently.",
+)
+def clone_command(
+    source: str,
+    target: str,
+    config_path: Path,
+    storage_location: Path | None,
+    quam_state_path: Path | None,
+    mode: str,
+    jobs: int,
+) -> None:
+    try:
+        clone_project(
+            config_path,
+            source,
+            target,
+            storage_location,
+            quam_state_path,
+            mode=mode,
+            jobs=jobs,
+        )
+    except ValueError as e:
+        click.secho(str(e), fg="red")
+        sys.exit(1)
+    click.echo(f"Project '{source}' cloned to '{target}'.")
+
+
+if __name__ == "__main__":
+    clone_command([], standalone_mode=False)
@@ -19,12 +19,22 @@ from qualibrate_config.vars import DEFAULT_CONFIG_FILEPATH
     show_default=True,
     help=CONFIG_PATH_HELP,
 )
+@click.option(
+    "--background",
+    is_flag=True,
+    default=False,
+    help=(
+        "Move the project to the trash and remove it in a background "
+        "process instead of waiting for the removal."
+    ),
+)
 def delete_command(
     name: str,
     config_path: Path,
+    background: bool,
 ) -> None:
     try:
-        delete_project(config_path, name)
+        delete_project(config_path, name, background=background, detach=True)
     except RuntimeError as e:
         click.secho(f"Failed to remove project '{name}'. {e}", fg="red")
         sys.exit(1)
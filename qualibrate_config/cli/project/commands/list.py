@@ -4,9 +4,12 @@ import click
 
 from qualibrate_config.cli.vars import CONFIG_PATH_HELP
 from qualibrate_config.core.project.p_list import (
-    print_simple_projects_list,
-    print_verbose_projects_list,
+    DEFAULT_PROJECT_STAT_JOBS,
+    PROJECT_LIST_FORMATS,
+    PROJECT_SORT_KEYS,
+    print_projects_list,
 )
+from qualibrate_config.core.project.storage import DEFAULT_SCAN_JOBS
 from qualibrate_config.vars import DEFAULT_CONFIG_FILEPATH
 
 __all__ = ["list_command"]
@@ -21,11 +24,65 @@ __all__ = ["list_command"]
     help=CONFIG_PATH_HELP,
 )
 @click.option("--verbose", "-v", is_flag=True)
-def list_command(config_path: Path, verbose: bool) -> None:
-    print_ = (
-        print_verbose_projects_list if verbose else print_simple_projects_list
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=DEFAULT_PROJECT_STAT_JOBS,
+    show_default=True,
+    help="Number of projects inspected concurrently in verbose mode.",
+)
+@click.option(
+    "--scan-jobs",
+    type=click.IntRange(min=1),
+    default=DEFAULT_SCAN_JOBS,
+    show_default=True,
+    help=(
+        "Number of storage date directories of one project scanned "
+        "concurrently in verbose mode."
+    ),
+)
+@click.option(
+    "--sort",
+    type=click.Choice(PROJECT_SORT_KEYS),
+    default=None,
+    help=(
+        "Sort projects by name (ascending), last modification time or "
+        "number of nodes (descending). Projects are printed as soon as they "
+        "are ready if not passed."
+    ),
+)
+@click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Print at most this number of projects.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(PROJECT_LIST_FORMATS),
+    default="text",
+    show_default=True,
+)
+def list_command(
+    config_path: Path,
+    verbose: bool,
+    jobs: int,
+    scan_jobs: int,
+    sort: str | None,
+    limit: int | None,
+    output_format: str,
+) -> None:
+    print_projects_list(
+        config_path,
+        verbose,
+        sort=sort,
+        limit=limit,
+        output_format=output_format,
+        jobs=jobs,
+        scan_jobs=scan_jobs,
     )
-    print_(config_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+import click
+
+from qualibrate_config.cli.vars import CONFIG_PATH_HELP
+from qualibrate_config.core.project.delete import purge_trash
+from qualibrate_config.vars import DEFAULT_CONFIG_FILEPATH
+
+__all__ = ["purge_command"]
+
+
+@click.command(
+    name="purge",
+    help="Remove leftovers of projects deleted in background.",
+)
+@click.option(
+    "--config-path",
+    type=click.Path(exists=True, path_type=Path),
+    default=DEFAULT_CONFIG_FILEPATH,
+    show_default=True,
+    help=CONFIG_PATH_HELP,
+)
+def purge_command(config_path: Path) -> None:
+    removed, failed = purge_trash(config_path)
+    click.echo(f"Removed {removed} deleted project(s) from trash.")
+    if failed:
+        click.secho(
+            "Failed to remove: " + ", ".join(map(str, failed)), fg="red"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    purge_command([], standalone_mode=False)
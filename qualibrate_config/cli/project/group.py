@@ -1,10 +1,13 @@
 import click
 
 from .commands import (
+    apply_command,
+    clone_command,
     create_command,
     current_command,
     delete_command,
     list_command,
+    purge_command,
     switch_command,
 )
 
@@ -14,8 +17,11 @@ def project_group() -> None:
     pass
 
 
+project_group.add_command(apply_command)
+project_group.add_command(clone_command)
 project_group.add_command(create_command)
 project_group.add_command(current_command)
 project_group.add_command(delete_command)
 project_group.add_command(list_command)
+project_group.add_command(purge_command)
 project_group.add_command(switch_command)
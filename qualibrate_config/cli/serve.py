@@ -0,0 +1,67 @@
+import contextlib
+from pathlib import Path
+
+import click
+
+from qualibrate_config.cli.vars import CONFIG_PATH_HELP
+from qualibrate_config.file import get_config_file
+from qualibrate_config.vars import DEFAULT_CONFIG_FILENAME, QUALIBRATE_PATH
+
+__all__ = ["serve_command"]
+
+
+@click.command(
+    name="serve",
+    help=(
+        "Run local config daemon. It keeps the resolved config up to date "
+        "and serves it to processes on this host over a Unix socket."
+    ),
+)
+@click.option(
+    "--config-path",
+    type=click.Path(
+        exists=True,
+        path_type=Path,
+    ),
+    default=QUALIBRATE_PATH,
+    show_default=True,
+    help=CONFIG_PATH_HELP,
+)
+@click.option(
+    "--socket-path",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=None,
+    help=(
+        "Path to the daemon socket. Defaults to '.config.sock' next to the "
+        "config file or to QUALIBRATE_CONFIG_SOCKET env variable."
+    ),
+)
+@click.option(
+    "--poll-interval",
+    type=float,
+    default=1.0,
+    show_default=True,
+    help="Max seconds between config file checks.",
+)
+def serve_command(
+    config_path: Path, socket_path: Path | None, poll_interval: float
+) -> None:
+    from qualibrate_config.server import ConfigServer
+
+    try:
+        config_file = get_config_file(config_path, DEFAULT_CONFIG_FILENAME)
+    except OSError as ex:
+        # e.g. the config dir has no config file
+        raise click.ClickException(f"Can't find config file. {ex}") from ex
+    server = ConfigServer(config_file, socket_path, poll_interval=poll_interval)
+    try:
+        server.start()
+    except RuntimeError as ex:
+        raise click.ClickException(str(ex)) from ex
+    click.echo(f"Serving config {server.config_path} on {server.socket_path}")
+    with contextlib.suppress(KeyboardInterrupt):
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    serve_command([], standalone_mode=False)
@@ -0,0 +1,185 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Sequence
+from pathlib import Path
+from typing import Any, Generic, NamedTuple, TypeVar, cast
+
+from qualibrate_config.core.fingerprint import (
+    FileFingerprint,
+    files_fingerprint,
+)
+
+__all__ = ["CacheStats", "ConfigCache"]
+
+T = TypeVar("T")
+
+
+class _CacheEntry(NamedTuple):
+    value: Any
+    paths: tuple[Path, ...]
+    fingerprints: tuple[FileFingerprint, ...]
+    loaded_at: float
+    size: int
+
+
+class CacheStats(NamedTuple):
+    entries: int
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class ConfigCache(Generic[T]):
+    """
+    Thread-safe cache of values built from config files.
+
+    An entry stays valid while the files it was built from are unchanged
+    (compared by stat fingerprints on every lookup) and, if `ttl` is set,
+    isn't older than `ttl` seconds. Loading happens outside the cache lock,
+    so slow loads don't block lookups of other keys.
+
+    Args:
+        ttl: Max age of an entry in seconds. None means entries expire only
+            when files change or on `invalidate`.
+        max_entries: Max number of entries. Least recently used entries are
+            evicted above it. None means unlimited.
+        max_size: Max total size of entries (as measured by `sizeof`). Least
+            recently used entries are evicted above it, but the last loaded
+            entry is always kept. None means unlimited.
+        sizeof: Size of a value. Required for `max_size`.
+    """
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        max_entries: int | None = None,
+        max_size: int | None = None,
+        sizeof: Callable[[T], int] | None = None,
+    ) -> None:
+        if max_size is not None and sizeof is None:
+            raise ValueError("sizeof is required to limit cache size")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._sizeof = sizeof
+        self._entries: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                entries=len(self._entries),
+                size=self._size,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+            )
+
+    def _is_fresh(self, entry: _CacheEntry) -> bool:
+        if self.ttl is not None and (
+            time.monotonic() - entry.loaded_at > self.ttl
+        ):
+            return False
+        return files_fingerprint(entry.paths) == entry.fingerprints
+
+    def get(self, key: Hashable) -> T | None:
+        """Cached value if it's still fresh."""
+        entry = self._entries.get(key)
+        if entry is None or not self._is_fresh(entry):
+            return None
+        self._touch(key)
+        return cast(T, entry.value)
+
+    def _touch(self, key: Hashable) -> None:
+        with self._lock:
+            self._hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def _pop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def _over_limits(self) -> bool:
+        if self.max_entries is not None and (
+            len(self._entries) > self.max_entries
+        ):
+            return True
+        return self.max_size is not None and self._size > self.max_size
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        load: Callable[[], T],
+        dependencies: Callable[[T], Sequence[Path]],
+        *,
+        known_paths: Sequence[Path] = (),
+        refresh: bool = False,
+    ) -> T:
+        """
+        Cached value or the result of `load`, which is then cached.
+
+        Args:
+            key: Cache key.
+            load: Builds the value.
+            dependencies: Files the built value depends on.
+            known_paths: Files known to be read by `load` before it runs.
+            refresh: Load even if the cached value is fresh.
+        """
+        entry = self._entries.get(key)
+        if not refresh and entry is not None and self._is_fresh(entry):
+            self._touch(key)
+            return cast(T, entry.value)
+        # fingerprint before loading, so a write during load isn't missed
+        known = (*known_paths, *(entry.paths if entry is not None else ()))
+        before = dict(zip(known, files_fingerprint(known), strict=True))
+        loaded_at = time.monotonic()
+        value = load()
+        paths = tuple(dependencies(value))
+        fingerprints = tuple(
+            before.get(path, current)
+            for path, current in zip(
+                paths, files_fingerprint(paths), strict=True
+            )
+        )
+        size = self._sizeof(value) if self._sizeof is not None else 0
+        with self._lock:
+            self._misses += 1
+            self._pop(key)
+            self._entries[key] = _CacheEntry(
+                value, paths, fingerprints, loaded_at, size
+            )
+            self._size += size
+            while len(self._entries) > 1 and self._over_limits():
+                self._pop(next(iter(self._entries)))
+                self._evictions += 1
+        return value
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """Drop entry of `key` or all entries if key isn't passed."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._size = 0
+            else:
+                self._pop(key)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Drop entries with keys matching `predicate`."""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                self._pop(key)
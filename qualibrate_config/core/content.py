@@ -8,7 +8,9 @@ import tomli_w
 
 from qualibrate_config import vars as config_vars
 from qualibrate_config.core.approve import print_and_confirm
+from qualibrate_config.core.lock import config_lock
 from qualibrate_config.core.project.path import get_project_path
+from qualibrate_config.core.toml_edit import patch_config_values
 from qualibrate_config.file import get_config_file
 from qualibrate_config.models import BaseConfig, QualibrateConfig
 from qualibrate_config.qulibrate_types import RawConfigType
@@ -40,13 +42,14 @@ def get_config_file_content(config_path: Path) -> tuple[RawConfigType, Path]:
         config_path, config_vars.DEFAULT_CONFIG_FILENAME, raise_not_exists=False
     )
     # TODO: first location of tomllib.loads
-    if config_file.is_file():
-        return tomllib.loads(config_file.read_text()), config_path
+    with config_lock(config_file, shared=True):
+        if config_file.is_file():
+            return tomllib.loads(config_file.read_text()), config_path
     return {}, config_file
 
 
 def simple_write(path: Path, config: RawConfigType) -> None:
-    with path.open("wb") as f_out:
+    with config_lock(path), path.open("wb") as f_out:
         tomli_w.dump(config, f_out)
 
 
@@ -123,7 +126,10 @@ def write_config(
 
     if not config_file.parent.exists():
         config_file.parent.mkdir(parents=True)
-    simple_write(config_file, common_config)
+    # only changed values are rewritten if possible, whole file if not
+    with config_lock(config_file):
+        if not patch_config_values(config_file, common_config):
+            simple_write(config_file, common_config)
 
     if after_write_cb is None and isinstance(config, QualibrateConfig):
         after_write_cb = qualibrate_after_write_cb
@@ -0,0 +1,229 @@
+import os
+import socket
+import struct
+import threading
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from qualibrate_config.core import wire
+from qualibrate_config.core.snapshot import ConfigSnapshot
+from qualibrate_config.vars import CONFIG_SOCKET_ENV_NAME
+
+__all__ = [
+    "CONFIG_SOCKET_FILENAME",
+    "ConfigDaemonClient",
+    "DaemonRequestError",
+    "DaemonUnavailableError",
+    "ProtocolError",
+    "decode_message",
+    "encode_message",
+    "get_config_socket_path",
+    "recv_message",
+    "send_message",
+]
+
+CONFIG_SOCKET_FILENAME = ".config.sock"
+DEFAULT_CLIENT_TIMEOUT = 2.0
+MAX_MESSAGE_SIZE = 256 * 1024 * 1024
+
+# Frame: 4-byte big-endian payload length followed by `core.wire` JSON.
+_HEADER = struct.Struct(">I")
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+class DaemonUnavailableError(ConnectionError):
+    pass
+
+
+class DaemonRequestError(RuntimeError):
+    pass
+
+
+def get_config_socket_path(config_path: Path) -> Path:
+    """Daemon socket of the config file. Can be set by env variable."""
+    env_path = os.environ.get(CONFIG_SOCKET_ENV_NAME)
+    if env_path:
+        return Path(env_path)
+    return config_path.parent / CONFIG_SOCKET_FILENAME
+
+
+def encode_message(message: Any) -> bytes:
+    payload = wire.dumps(message)
+    if len(payload) > MAX_MESSAGE_SIZE:
+        raise ProtocolError(f"Message is too big ({len(payload)} bytes)")
+    return _HEADER.pack(len(payload)) + payload
+
+
+def decode_message(payload: bytes) -> Any:
+    try:
+        return wire.loads(payload)
+    except ValueError as ex:
+        raise ProtocolError(f"Invalid message: {ex}") from ex
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes | None:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            if received == 0:
+                return None
+            raise ProtocolError("Connection closed in the middle of message")
+        received += n
+    return bytes(buffer)
+
+
+def send_message(sock: socket.socket, message: Any) -> None:
+    sock.sendall(encode_message(message))
+
+
+def recv_message(sock: socket.socket) -> Any:
+    """Receive one message. None if the connection was closed before it."""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_MESSAGE_SIZE:
+        raise ProtocolError(f"Message is too big ({size} bytes)")
+    payload = _recv_exact(sock, size) if size else b""
+    if payload is None:
+        raise ProtocolError("Connection closed in the middle of message")
+    return decode_message(payload)
+
+
+class ConfigDaemonClient:
+    """
+    Client of the `qualibrate-config serve` daemon.
+
+    The connection is opened on the first request and reused; a broken
+    connection is reopened once per request.
+
+    Raises (on requests):
+        DaemonUnavailableError: The daemon isn't running or not responding.
+        DaemonRequestError: The daemon couldn't answer the request.
+    """
+
+    def __init__(
+        self, socket_path: Path, timeout: float = DEFAULT_CLIENT_TIMEOUT
+    ) -> None:
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock: socket.socket | None = None
+        self._lock = threading.Lock()
+        # {resolved: (daemon instance, snapshot)}
+        self._snapshots: dict[bool, tuple[str | None, ConfigSnapshot]] = {}
+
+    def _connect(self) -> socket.socket:
+        if not self.socket_path.exists():
+            raise DaemonUnavailableError(
+                f"Config daemon socket {self.socket_path} doesn't exist"
+            )
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(os.fspath(self.socket_path))
+        except OSError as ex:
+            sock.close()
+            raise DaemonUnavailableError(
+                f"Can't connect to config daemon {self.socket_path}: {ex}"
+            ) from ex
+        return sock
+
+    def _exchange(self, request: dict[str, Any]) -> Any:
+        if self._sock is None:
+            self._sock = self._connect()
+        try:
+            send_message(self._sock, request)
+            response = recv_message(self._sock)
+        except (OSError, ProtocolError):
+            self._close_socket()
+            raise
+        if response is None:
+            self._close_socket()
+            raise ConnectionResetError("Config daemon closed connection")
+        return response
+
+    def request(self, request: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            reused = self._sock is not None
+            try:
+                response = self._exchange(request)
+            except (OSError, ProtocolError) as ex:
+                if isinstance(ex, DaemonUnavailableError) or not reused:
+                    raise DaemonUnavailableError(str(ex)) from ex
+                # stale connection (e.g. daemon restarted), retry once
+                try:
+                    response = self._exchange(request)
+                except (OSError, ProtocolError) as retry_ex:
+                    raise DaemonUnavailableError(str(retry_ex)) from retry_ex
+        if not isinstance(response, dict):
+            raise DaemonRequestError("Unexpected config daemon response")
+        if not response.get("ok"):
+            raise DaemonRequestError(
+                response.get("error", "Config daemon request failed")
+            )
+        return response
+
+    def ping(self) -> bool:
+        try:
+            self.request({"op": "ping"})
+        except (DaemonUnavailableError, DaemonRequestError):
+            return False
+        return True
+
+    def get(self, resolved: bool = True) -> ConfigSnapshot:
+        """
+        Whole config with the project overlay applied. References are
+        solved if `resolved`. Data of an unchanged snapshot isn't resent.
+        Versions are compared together with the daemon instance, because
+        they start over when the daemon is restarted.
+        """
+        cached = self._snapshots.get(resolved)
+        request: dict[str, Any] = {"op": "get", "resolved": resolved}
+        if cached is not None:
+            request["instance"], request["since"] = cached[0], cached[1].version
+        response = self.request(request)
+        if (
+            cached is not None
+            and response.get("unchanged")
+            and response.get("instance") == cached[0]
+        ):
+            return cached[1]
+        snapshot = ConfigSnapshot.from_wire(response)
+        self._snapshots[resolved] = (response.get("instance"), snapshot)
+        return snapshot
+
+    def get_pointer(self, pointer: str, resolved: bool = True) -> Any:
+        """Value by JSON pointer (e.g. "/qualibrate/project")."""
+        return self.request(
+            {"op": "get_pointer", "pointer": pointer, "resolved": resolved}
+        )["data"]
+
+    def list_projects(self) -> list[str]:
+        return list(self.request({"op": "list_projects"})["data"])
+
+    def _close_socket(self) -> None:
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            sock.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_socket()
+
+    def __enter__(self) -> "ConfigDaemonClient":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
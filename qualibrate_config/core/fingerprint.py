@@ -0,0 +1,39 @@
+import hashlib
+import os
+from collections.abc import Iterable
+from pathlib import Path
+
+__all__ = [
+    "FileFingerprint",
+    "file_fingerprint",
+    "files_fingerprint",
+    "files_digest",
+]
+
+# (inode, size, mtime_ns, ctime_ns); None for a missing file
+FileFingerprint = tuple[int, int, int, int] | None
+
+
+def file_fingerprint(path: Path) -> FileFingerprint:
+    """Cheap stat-based identity of a file. Changes on any rewrite."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns
+
+
+def files_fingerprint(paths: Iterable[Path]) -> tuple[FileFingerprint, ...]:
+    return tuple(map(file_fingerprint, paths))
+
+
+def files_digest(paths: Iterable[Path]) -> str:
+    """Content digest of files. Missing files differ from empty ones."""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        try:
+            digest.update(b"+" + path.read_bytes())
+        except OSError:
+            digest.update(b"-")
+        digest.update(b"\0")
+    return digest.hexdigest()
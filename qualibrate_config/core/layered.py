@@ -0,0 +1,208 @@
+from collections.abc import Iterator, Mapping, MutableMapping
+from copy import deepcopy
+from typing import Any
+
+from qualibrate_config.qulibrate_types import RawConfigType
+
+__all__ = ["LayeredConfig", "OverlayBuilder", "to_plain_dict"]
+
+
+class _Deleted:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<deleted>"
+
+
+_DELETED = _Deleted()
+_MISSING = object()
+
+
+class _ChangesTable(dict[str, Any]):
+    """Writes to a nested table of the view (merged with the layers)."""
+
+
+class LayeredConfig(MutableMapping[str, Any]):
+    """
+    Nested `ChainMap`: a view of config layers without copying them.
+
+    Layers are ordered like in `ChainMap` (the first one wins) and merged
+    like `recursive_update_dict` merges an overlay into a base: tables of
+    all layers are merged recursively, any other value (or a table over a
+    non-table value) replaces values of lower layers.
+
+    Layers aren't modified. Writes (including writes to nested tables) are
+    stored in a separate top layer of the view, deletions are recorded as
+    tombstones. Arrays are returned as they're stored in the layers, so
+    they should be replaced rather than modified in place.
+
+    Args:
+        layers: Layers from the highest priority (e.g. project overlay) to
+            the lowest one (e.g. base config).
+    """
+
+    __slots__ = ("maps", "_changes", "_parent", "_key")
+
+    def __init__(self, *layers: Mapping[str, Any]) -> None:
+        self.maps: tuple[Mapping[str, Any], ...] = layers
+        self._changes: dict[str, Any] | None = None
+        self._parent: LayeredConfig | None = None
+        self._key: str | None = None
+
+    def _child(
+        self, key: str, layers: list[Mapping[str, Any]]
+    ) -> "LayeredConfig":
+        child = LayeredConfig(*layers)
+        child._parent = self
+        child._key = key
+        return child
+
+    def _own_changes(self) -> dict[str, Any]:
+        if self._changes is None:
+            if self._parent is None:
+                self._changes = {}
+            else:
+                assert self._key is not None
+                parent_changes = self._parent._own_changes()
+                existing = parent_changes.get(self._key)
+                if isinstance(existing, _ChangesTable):
+                    self._changes = existing
+                else:
+                    self._changes = parent_changes[self._key] = _ChangesTable()
+        return self._changes
+
+    def __getitem__(self, key: str) -> Any:
+        changes_table: _ChangesTable | None = None
+        if self._changes is not None and key in self._changes:
+            value = self._changes[key]
+            if value is _DELETED:
+                raise KeyError(key)
+            if not isinstance(value, _ChangesTable):
+                # assigned value replaces values of the layers
+                return value
+            changes_table = value
+        tables: list[Mapping[str, Any]] = []
+        for layer in self.maps:
+            if key not in layer:
+                continue
+            value = layer[key]
+            if isinstance(value, Mapping):
+                tables.append(value)
+            elif tables or changes_table is not None:
+                # non-table value below tables is replaced by them
+                break
+            else:
+                return value
+        if not tables and changes_table is None:
+            raise KeyError(key)
+        child = self._child(key, tables)
+        child._changes = changes_table
+        return child
+
+    def __contains__(self, key: object) -> bool:
+        if self._changes is not None and key in self._changes:
+            return self._changes[key] is not _DELETED
+        return any(key in layer for layer in self.maps)
+
+    def __iter__(self) -> Iterator[str]:
+        # base keys first and then new keys of upper layers, like
+        # `recursive_update_dict` orders them
+        keys: dict[str, None] = {}
+        for layer in reversed(self.maps):
+            keys.update(dict.fromkeys(layer))
+        if self._changes is not None:
+            keys.update(dict.fromkeys(self._changes))
+        return (key for key in keys if key in self)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._own_changes()[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._own_changes()[key] = _DELETED
+
+    def materialize(self) -> RawConfigType:
+        """
+        Merged config as plain nested dicts. It doesn't share any objects
+        with the layers.
+        """
+        return to_plain_dict(self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.materialize()!r})"
+
+
+def to_plain_dict(config: Mapping[str, Any]) -> RawConfigType:
+    """
+    Copy of the config (e.g. `LayeredConfig` view) as plain nested dicts.
+    It doesn't share any objects with the config.
+    """
+    result: RawConfigType = {}
+    for key, value in config.items():
+        if isinstance(value, Mapping):
+            result[key] = to_plain_dict(value)
+        else:
+            result[key] = deepcopy(value)
+    return result
+
+
+def _plain(value: Any) -> Any:
+    """Recorded value without tombstones."""
+    if not isinstance(value, _ChangesTable):
+        return value
+    return {
+        key: _plain(item) for key, item in value.items() if item is not _DELETED
+    }
+
+
+def _same(value: Any, base_value: Any) -> bool:
+    # 1 and True (or 1 and 1.0) are different values in a config file
+    return type(value) is type(base_value) and value == base_value
+
+
+def _overlay(
+    changes: Mapping[str, Any], base: Mapping[str, Any]
+) -> RawConfigType:
+    result: RawConfigType = {}
+    # new keys first and then changed ones in order of the base, like
+    # `jsonpatch.make_patch` orders its operations
+    for key, value in changes.items():
+        if key not in base and value is not _DELETED:
+            result[key] = _plain(value)
+    for key, base_value in base.items():
+        value = changes.get(key, _MISSING)
+        if value is _MISSING or value is _DELETED:
+            continue
+        if isinstance(value, Mapping) and isinstance(base_value, Mapping):
+            nested = _overlay(value, base_value)
+            if nested:
+                result[key] = nested
+        elif not _same(value, base_value):
+            result[key] = _plain(value)
+    return result
+
+
+class OverlayBuilder(LayeredConfig):
+    """
+    Records changes of a base config to build a project overlay.
+
+    The builder is a writable view of `base` (see `LayeredConfig`): changes
+    are stored in a sparse nested table and the base isn't modified or
+    copied. `overlay` returns changed values which differ from the base.
+    Assigned tables are compared with the base tables key by key, removed
+    keys are ignored. Arrays are compared as a whole.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, base: Mapping[str, Any]) -> None:
+        super().__init__(base)
+
+    def overlay(self) -> RawConfigType:
+        if self._changes is None:
+            return {}
+        return _overlay(self._changes, self.maps[0])
@@ -0,0 +1,162 @@
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment,unused-ignore]
+
+__all__ = [
+    "CONFIG_LOCK_FILENAME",
+    "DEFAULT_LOCK_TIMEOUT",
+    "ConfigLockTimeoutError",
+    "config_lock",
+    "get_config_lock_path",
+]
+
+CONFIG_LOCK_FILENAME = ".config.lock"
+DEFAULT_LOCK_TIMEOUT = 30.0
+
+_MIN_POLL_INTERVAL = 0.005
+_MAX_POLL_INTERVAL = 0.1
+
+
+class ConfigLockTimeoutError(TimeoutError):
+    def __init__(self, lock_path: Path, timeout: float) -> None:
+        super().__init__(
+            f"Can't acquire config lock '{lock_path}' in {timeout} seconds. "
+            "Another qualibrate-config operation is probably in progress."
+        )
+        self.lock_path = lock_path
+        self.timeout = timeout
+
+
+class _HeldLock:
+    __slots__ = ("fd", "shared", "depth")
+
+    def __init__(self, fd: int, shared: bool) -> None:
+        self.fd = fd
+        self.shared = shared
+        self.depth = 1
+
+
+_local = threading.local()
+
+
+def _held_locks() -> dict[Path, _HeldLock]:
+    held: dict[Path, _HeldLock] | None = getattr(_local, "locks", None)
+    if held is None:
+        held = _local.locks = {}
+    return held
+
+
+def get_config_lock_path(config_path: Path) -> Path:
+    """
+    Lock file guarding the config file and all project overlays that live
+    next to it. One lock per qualibrate directory, so project operations
+    and config updates are serialized against each other.
+    """
+    qualibrate_path = (
+        config_path if config_path.is_dir() else config_path.parent
+    )
+    return qualibrate_path.absolute() / CONFIG_LOCK_FILENAME
+
+
+def _open_lock_file(lock_path: Path, shared: bool) -> int | None:
+    if not shared:
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        return os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+    except OSError:
+        if not shared:
+            raise
+    # Readers of a missing or read-only directory can't race with writers
+    # that would need to create it, so they proceed without a lock.
+    try:
+        return os.open(lock_path, os.O_RDONLY)
+    except OSError:
+        return None
+
+
+def _acquire(
+    fd: int, lock_path: Path, shared: bool, timeout: float | None
+) -> None:
+    assert fcntl is not None
+    operation = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB
+    deadline = None if timeout is None else time.monotonic() + timeout
+    delay = _MIN_POLL_INTERVAL
+    while True:
+        try:
+            fcntl.flock(fd, operation)
+            return
+        except BlockingIOError:
+            pass
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ConfigLockTimeoutError(lock_path, timeout or 0.0)
+            delay = min(delay, remaining)
+        time.sleep(delay)
+        delay = min(delay * 2, _MAX_POLL_INTERVAL)
+
+
+@contextmanager
+def config_lock(
+    config_path: Path,
+    *,
+    shared: bool = False,
+    timeout: float | None = DEFAULT_LOCK_TIMEOUT,
+) -> Iterator[None]:
+    """
+    Advisory inter-process lock for read-modify-write config operations.
+
+    Readers take a shared lock, writers an exclusive one. The lock is
+    reentrant within a thread: nested acquisitions of a held lock are free,
+    except that a shared lock can't be upgraded to an exclusive one.
+
+    Args:
+        config_path: Path to the config file (or the directory containing
+            it).
+        shared: Take a shared (reader) lock instead of an exclusive one.
+        timeout: Seconds to wait for the lock. `None` waits forever.
+
+    Raises:
+        ConfigLockTimeoutError: If the lock isn't acquired within `timeout`.
+        RuntimeError: If an exclusive lock is requested while the current
+            thread holds a shared one.
+    """
+    if fcntl is None:  # pragma: no cover - Windows
+        yield
+        return
+    lock_path = get_config_lock_path(config_path)
+    held = _held_locks()
+    current = held.get(lock_path)
+    if current is not None:
+        if current.shared and not shared:
+            raise RuntimeError(
+                f"Can't upgrade shared config lock '{lock_path}' to exclusive."
+            )
+        current.depth += 1
+        try:
+            yield
+        finally:
+            current.depth -= 1
+        return
+    fd = _open_lock_file(lock_path, shared)
+    if fd is None:
+        yield
+        return
+    try:
+        _acquire(fd, lock_path, shared, timeout)
+        held[lock_path] = _HeldLock(fd, shared)
+        try:
+            yield
+        finally:
+            del held[lock_path]
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
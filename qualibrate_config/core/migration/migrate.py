@@ -1,28 +1,129 @@
+import logging
+import threading
 from pathlib import Path
+from typing import Any
 
 import click
 import tomli_w
 
 from qualibrate_config.core.content import get_config_file_content
+from qualibrate_config.core.fingerprint import FileFingerprint, file_fingerprint
+from qualibrate_config.core.lock import config_lock
 from qualibrate_config.core.migration.utils import make_migrations
 from qualibrate_config.models import QualibrateConfig
 from qualibrate_config.models.qualibrate import QualibrateTopLevelConfig
+from qualibrate_config.qulibrate_types import RawConfigType
 from qualibrate_config.vars import QUALIBRATE_CONFIG_KEY
 
-__all__ = ["run_migrations"]
+__all__ = [
+    "get_config_version",
+    "migrate_in_memory",
+    "persist_migrated_config",
+    "run_migrations",
+]
+
+logger = logging.getLogger(__name__)
+
+
+def get_config_version(config: RawConfigType) -> int | None:
+    qualibrate_config: dict[str, Any] = config.get(QUALIBRATE_CONFIG_KEY, {})
+    version = qualibrate_config.get("version") or qualibrate_config.get(
+        "config_version"
+    )
+    return None if version is None else int(version)
+
+
+def migrate_in_memory(
+    config: RawConfigType,
+    config_path: Path,
+    to_version: int = QualibrateConfig.version,
+) -> RawConfigType:
+    """
+    Migrate already parsed config (base config file content, without project
+    overrides) to `to_version`. Nothing is written to the config file; some
+    migration steps create project directories next to it.
+
+    Raises:
+        ValueError: The config version can't be resolved or it's greater
+            than supported.
+    """
+    from_version = get_config_version(config)
+    if from_version is None:
+        raise ValueError("Can't resolve current config version")
+    if from_version == to_version:
+        return config
+    if from_version > QualibrateConfig.version:
+        raise ValueError(
+            f"Config version ({from_version}) is greater than supported "
+            f"({QualibrateConfig.version})"
+        )
+    migrated = make_migrations(
+        config, from_version, to_version, config_path=config_path
+    )
+    if to_version == QualibrateConfig.version:
+        QualibrateTopLevelConfig(migrated)
+    return migrated
+
+
+def _write_migrated(
+    config_path: Path,
+    migrated: RawConfigType,
+    source_fingerprint: FileFingerprint,
+) -> bool:
+    with config_lock(config_path):
+        if file_fingerprint(config_path) != source_fingerprint:
+            # changed since it was read, the next load migrates it again
+            logger.info(f"Config {config_path} changed, migration not saved")
+            return False
+        with config_path.open("wb") as f_out:
+            tomli_w.dump(migrated, f_out)
+    return True
+
+
+def persist_migrated_config(
+    config_path: Path,
+    migrated: RawConfigType,
+    source_fingerprint: FileFingerprint,
+    *,
+    background: bool = True,
+) -> threading.Thread | None:
+    """
+    Write migrated config unless the file changed since it was read (by
+    `source_fingerprint`).
+
+    With `background` the write is done in a separate (non-daemon, so it
+    completes before interpreter exit) thread, which is returned.
+    """
+    if not background:
+        _write_migrated(config_path, migrated, source_fingerprint)
+        return None
+
+    def write() -> None:
+        try:
+            _write_migrated(config_path, migrated, source_fingerprint)
+        except Exception:
+            logger.exception(f"Can't save migrated config {config_path}")
+
+    thread = threading.Thread(
+        target=write, name="qualibrate-config-migration-write"
+    )
+    thread.start()
+    return thread
 
 
 def run_migrations(
     config_path: Path, to_version: int = QualibrateConfig.version
 ) -> None:
+    with config_lock(config_path):
+        _run_migrations(config_path, to_version)
+
+
+def _run_migrations(config_path: Path, to_version: int) -> None:
     common_config, config_file = get_config_file_content(config_path)
     if common_config == {}:
         click.secho("Config file wasn't found. Nothing to migrate", fg="yellow")
         return
-    qualibrate_config = common_config.get(QUALIBRATE_CONFIG_KEY, {})
-    from_version = qualibrate_config.get("version") or qualibrate_config.get(
-        "config_version"
-    )
+    from_version = get_config_version(common_config)
     if from_version is None:
         click.secho(
             "Can't resolve current config version from file. Please regenerate "
@@ -45,10 +146,6 @@ def run_migrations(
             fg="yellow",
         )
         return
-    migrated = make_migrations(
-        common_config, from_version, to_version, config_path=config_file
-    )
-    if to_version == QualibrateConfig.version:
-        QualibrateTopLevelConfig(migrated)
+    migrated = migrate_in_memory(common_config, config_file, to_version)
     with config_file.open("wb") as f_out:
         tomli_w.dump(migrated, f_out)
@@ -0,0 +1,133 @@
+import logging
+import os
+import sys
+from collections.abc import Mapping, Sequence
+from copy import deepcopy
+from functools import lru_cache
+from typing import Any
+
+from qualibrate_config.core.utils import recursive_update_dict
+from qualibrate_config.qulibrate_types import RawConfigType
+from qualibrate_config.vars import CONFIG_OVERRIDE_ENV_PREFIX
+
+if sys.version_info[:2] < (3, 11):
+    import tomli as tomllib  # type: ignore[unused-ignore,import-not-found]
+else:
+    import tomllib
+
+__all__ = [
+    "STRING_KEYS",
+    "EnvOverrideItems",
+    "apply_env_overrides",
+    "env_override_items",
+    "env_overrides",
+    "parse_env_value",
+]
+
+logger = logging.getLogger(__name__)
+
+KEY_SEPARATOR = "__"
+
+# sorted (variable name, value) pairs of the override variables
+EnvOverrideItems = tuple[tuple[str, str], ...]
+
+# keys of string (or path) values, which are never parsed as TOML values, so
+# e.g. project `123` isn't an integer; `*` matches any key
+STRING_KEYS: tuple[tuple[str, ...], ...] = (
+    ("qualibrate", "project"),
+    ("qualibrate", "password"),
+    ("qualibrate", "log_folder"),
+    ("qualibrate", "calibration_library", "folder"),
+    ("qualibrate", "database", "*"),
+    ("*", "storage", "location"),
+    ("quam", "state_path"),
+)
+
+
+def parse_env_value(value: str) -> Any:
+    """
+    Value of an override variable parsed as a TOML value (`42`, `true`,
+    `[1, 2]`, `"text"`, ...). Values that aren't valid TOML are strings.
+    """
+    try:
+        return tomllib.loads(f"value = {value}")["value"]
+    except tomllib.TOMLDecodeError:
+        return value
+
+
+def _is_string_key(keys: Sequence[str]) -> bool:
+    return any(
+        len(keys) == len(pattern)
+        and all(p in ("*", key) for p, key in zip(pattern, keys, strict=True))
+        for pattern in STRING_KEYS
+    )
+
+
+def env_override_items(
+    environ: Mapping[str, str] | None = None,
+) -> EnvOverrideItems:
+    """Override variables of the environment. Can be used as a cache key."""
+    if environ is None:
+        environ = os.environ
+    return tuple(
+        sorted(
+            (name, value)
+            for name, value in environ.items()
+            if name.startswith(CONFIG_OVERRIDE_ENV_PREFIX)
+        )
+    )
+
+
+@lru_cache(maxsize=16)
+def _parse_overrides(items: EnvOverrideItems) -> RawConfigType:
+    overrides: RawConfigType = {}
+    for name, value in items:
+        parts = (
+            name[len(CONFIG_OVERRIDE_ENV_PREFIX) :].lower().split(KEY_SEPARATOR)
+        )
+        if not all(parts):
+            logger.warning(f"Config override {name} is ignored: invalid name")
+            continue
+        table: Any = overrides
+        for part in parts[:-1]:
+            table = table.setdefault(part, {})
+            if not isinstance(table, dict):
+                break
+        if not isinstance(table, dict) or isinstance(
+            table.get(parts[-1]), dict
+        ):
+            logger.warning(
+                f"Config override {name} is ignored: it conflicts with "
+                "another override"
+            )
+            continue
+        table[parts[-1]] = (
+            value if _is_string_key(parts) else parse_env_value(value)
+        )
+    return overrides
+
+
+def env_overrides(items: EnvOverrideItems | None = None) -> RawConfigType:
+    """
+    Config values set by environment variables, e.g.
+    `QUALIBRATE__QUALIBRATE__STORAGE__LOCATION=/data` is
+    `{"qualibrate": {"storage": {"location": "/data"}}}`. Names are
+    lowercased and split by `__` into keys. Values are parsed by
+    `parse_env_value`, except values of `STRING_KEYS` which are kept as is.
+
+    Parsed values are cached per process, so the returned config is shared
+    and must not be modified.
+    """
+    if items is None:
+        items = env_override_items()
+    return _parse_overrides(items)
+
+
+def apply_env_overrides(
+    config: RawConfigType, items: EnvOverrideItems | None = None
+) -> RawConfigType:
+    """Merge override variables into config (in place)."""
+    overrides = env_overrides(items)
+    if not overrides:
+        return config
+    return recursive_update_dict(config, deepcopy(overrides))
@@ -0,0 +1,343 @@
+import logging
+import sys
+from collections.abc import Callable, Mapping
+from functools import partial
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import tomli_w
+
+from qualibrate_config.core.content import get_config_file_content
+from qualibrate_config.core.layered import OverlayBuilder
+from qualibrate_config.core.lock import config_lock
+from qualibrate_config.core.project.common import (
+    get_project_from_common_config,
+)
+from qualibrate_config.core.project.create import (
+    after_create_project,
+    config_for_project_from_args,
+    rollback_project_creation,
+)
+from qualibrate_config.core.project.delete import (
+    move_project_to_trash,
+    remove_in_background,
+)
+from qualibrate_config.core.project.p_list import list_projects
+from qualibrate_config.core.project.path import (
+    PROJECTS_TRASH_DIRNAME,
+    get_project_config_path,
+    get_project_path,
+)
+from qualibrate_config.core.project.switch import switch_project
+from qualibrate_config.core.toml_edit import atomic_write, patch_config_values
+from qualibrate_config.qulibrate_types import RawConfigType
+from qualibrate_config.validation import validate_version_and_migrate_if_needed
+
+if sys.version_info[:2] < (3, 11):
+    import tomli as tomllib  # type: ignore[unused-ignore,import-not-found]
+else:
+    import tomllib
+
+__all__ = [
+    "MANIFEST_ACTIONS",
+    "ProjectOperation",
+    "ProjectsManifest",
+    "apply_projects",
+    "parse_manifest",
+    "read_manifest",
+]
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_ACTIONS = ("create", "update", "delete")
+_PATH_FIELDS = (
+    "storage_location",
+    "calibration_library_folder",
+    "quam_state_path",
+)
+
+
+class ProjectOperation(NamedTuple):
+    action: str
+    name: str
+    storage_location: Path | None = None
+    calibration_library_folder: Path | None = None
+    quam_state_path: Path | None = None
+
+
+class ProjectsManifest(NamedTuple):
+    """Project operations applied in order, then switch to `switch`."""
+
+    operations: tuple[ProjectOperation, ...] = ()
+    switch: str | None = None
+
+
+def _manifest_path(value: Any, field: str, base_dir: Path | None) -> Path:
+    if not isinstance(value, str) or not value:
+        raise ValueError(f"'{field}' should be a non-empty string.")
+    path = Path(value).expanduser()
+    if base_dir is not None and not path.is_absolute():
+        path = base_dir / path
+    return path.absolute()
+
+
+def _parse_operation(
+    item: Any, index: int, base_dir: Path | None
+) -> ProjectOperation:
+    if not isinstance(item, Mapping):
+        raise ValueError(f"Manifest project #{index} should be a table.")
+    name = item.get("name")
+    if not isinstance(name, str) or not name:
+        raise ValueError(f"Manifest project #{index} has no name.")
+    action = item.get("action", "create")
+    if action not in MANIFEST_ACTIONS:
+        raise ValueError(
+            f"Unknown action '{action}' of project '{name}'. "
+            f"Allowed actions: {', '.join(MANIFEST_ACTIONS)}."
+        )
+    unknown = set(item) - {"name", "action", *_PATH_FIELDS}
+    if unknown:
+        raise ValueError(
+            f"Unknown fields of project '{name}': {', '.join(sorted(unknown))}."
+        )
+    paths = {
+        field: _manifest_path(item[field], field, base_dir)
+        for field in _PATH_FIELDS
+        if field in item
+    }
+    if action == "delete" and paths:
+        raise ValueError(f"Paths can't be specified to delete '{name}'.")
+    return ProjectOperation(action=action, name=name, **paths)
+
+
+def parse_manifest(
+    data: Mapping[str, Any], base_dir: Path | None = None
+) -> ProjectsManifest:
+    """
+    Projects manifest from parsed TOML:
+
+        switch = "lab_b"
+
+        [[project]]
+        name = "lab_a"
+        storage_location = "/data/lab_a"
+
+        [[project]]
+        name = "lab_b"
+        action = "update"
+        quam_state_path = "quam_state/lab_b"
+
+    Action is `create` if not specified. Relative paths are resolved
+    against `base_dir` (or the current dir if it isn't passed).
+    """
+    unknown = set(data) - {"project", "switch"}
+    if unknown:
+        raise ValueError(
+            f"Unknown manifest fields: {', '.join(sorted(unknown))}."
+        )
+    items = data.get("project", [])
+    if not isinstance(items, list):
+        raise ValueError("'project' should be an array of tables.")
+    switch = data.get("switch")
+    if switch is not None and (not isinstance(switch, str) or not switch):
+        raise ValueError("'switch' should be a project name.")
+    return ProjectsManifest(
+        operations=tuple(
+            _parse_operation(item, i, base_dir)
+            for i, item in enumerate(items, start=1)
+        ),
+        switch=switch,
+    )
+
+
+def read_manifest(manifest_path: Path) -> ProjectsManifest:
+    try:
+        with manifest_path.open("rb") as fin:
+            data = tomllib.load(fin)
+    except (OSError, tomllib.TOMLDecodeError) as ex:
+        raise ValueError(f"Can't read manifest {manifest_path}. {ex}") from ex
+    return parse_manifest(data, manifest_path.absolute().parent)
+
+
+def _check_operations(
+    manifest: ProjectsManifest,
+    projects: set[str],
+    current_project: str | None,
+) -> None:
+    """Check the whole manifest against the listing before changes."""
+    projects = set(projects)
+    for operation in manifest.operations:
+        name = operation.name
+        if operation.action == "create":
+            if name == PROJECTS_TRASH_DIRNAME:
+                raise ValueError(f"Project name '{name}' is reserved.")
+            if name in projects:
+                raise ValueError(f"Project '{name}' already exists.")
+            projects.add(name)
+        elif name not in projects:
+            raise ValueError(f"Project '{name}' does not exist.")
+        elif operation.action == "delete":
+            projects.remove(name)
+    if manifest.switch is not None and manifest.switch not in projects:
+        raise ValueError(
+            f"Can't switch project to '{manifest.switch}'. "
+            "There is no such project."
+        )
+    final_project = manifest.switch or current_project
+    deleted = {
+        operation.name
+        for operation in manifest.operations
+        if operation.action == "delete"
+    }
+    if final_project in deleted and final_project not in projects:
+        raise ValueError("Can't delete current project.")
+
+
+def _project_overlay(
+    base_config: RawConfigType, operation: ProjectOperation
+) -> RawConfigType:
+    """Values of the operation which differ from the base config."""
+    overlay_builder = OverlayBuilder(base_config)
+    config_for_project_from_args(
+        overlay_builder,
+        operation.storage_location,
+        operation.calibration_library_folder,
+        operation.quam_state_path,
+        None,
+        None,
+        None,
+    )
+    return overlay_builder.overlay()
+
+
+class _Transaction:
+    """Applied changes of a manifest which can be undone."""
+
+    def __init__(self, qualibrate_path: Path) -> None:
+        self.qualibrate_path = qualibrate_path
+        self._undo: list[Callable[[], object]] = []
+        self._trashed: list[Path] = []
+
+    def create(
+        self, operation: ProjectOperation, overlay: RawConfigType
+    ) -> None:
+        # directories which existed before aren't removed by the rollback
+        storage_location, quam_state_path = (
+            path if path is not None and not path.exists() else None
+            for path in (operation.storage_location, operation.quam_state_path)
+        )
+        config_path = get_project_config_path(
+            self.qualibrate_path, operation.name
+        )
+        config_path.parent.mkdir(parents=True)
+        self._undo.append(
+            partial(
+                rollback_project_creation,
+                self.qualibrate_path,
+                operation.name,
+                storage_location,
+                quam_state_path,
+            )
+        )
+        atomic_write(config_path, tomli_w.dumps(overlay))
+        after_create_project(
+            operation.storage_location, operation.quam_state_path
+        )
+
+    def update(
+        self, operation: ProjectOperation, overlay: RawConfigType
+    ) -> None:
+        config_path = get_project_config_path(
+            self.qualibrate_path, operation.name
+        )
+        if config_path.is_file():
+            self._undo.append(
+                partial(atomic_write, config_path, config_path.read_text())
+            )
+        else:
+            self._undo.append(partial(config_path.unlink, missing_ok=True))
+        # only changed values are rewritten if possible, like `update_project`
+        if not patch_config_values(config_path, overlay):
+            atomic_write(config_path, tomli_w.dumps(overlay))
+        after_create_project(
+            operation.storage_location, operation.quam_state_path
+        )
+
+    def delete(self, operation: ProjectOperation) -> None:
+        # project dir is moved to the trash and removed only on commit
+        trashed_path = move_project_to_trash(
+            self.qualibrate_path, operation.name
+        )
+        self._trashed.append(trashed_path)
+        self._undo.append(
+            partial(
+                trashed_path.rename,
+                get_project_path(self.qualibrate_path, operation.name),
+            )
+        )
+
+    def commit(self, detach: bool = False) -> None:
+        """Remove dirs of deleted projects (call it without the lock)."""
+        for trashed_path in self._trashed:
+            remove_in_background(trashed_path, detach)
+
+    def rollback(self) -> None:
+        while self._undo:
+            undo = self._undo.pop()
+            try:
+                undo()
+            except Exception:
+                logger.warning("Can't undo project change", exc_info=True)
+
+
+def apply_projects(
+    config_path: Path, manifest: ProjectsManifest, *, detach: bool = False
+) -> None:
+    """
+    Apply manifest operations in one go under the config lock.
+
+    The base config is read and validated once, and the whole manifest is
+    checked against one projects listing before anything is changed.
+    Overlays are written atomically. If any operation fails, all applied
+    operations are rolled back. Dirs of deleted projects are moved to the
+    trash and removed in background after the lock is released (in a
+    separate process if `detach`, see `remove_in_background`).
+
+    Raises:
+        ValueError: The manifest can't be applied.
+    """
+    qualibrate_path = config_path.parent
+    with config_lock(config_path):
+        try:
+            projects = set(list_projects(qualibrate_path))
+        except NotADirectoryError:
+            projects = set()
+        base_config, config_file = get_config_file_content(config_path)
+        base_config, _ = validate_version_and_migrate_if_needed(
+            base_config, config_file
+        )
+        _check_operations(
+            manifest, projects, get_project_from_common_config(base_config)
+        )
+        transaction = _Transaction(qualibrate_path)
+        try:
+            for operation in manifest.operations:
+                if operation.action == "delete":
+                    transaction.delete(operation)
+                    continue
+                overlay = _project_overlay(base_config, operation)
+                if operation.action == "create":
+                    transaction.create(operation, overlay)
+                else:
+                    transaction.update(operation, overlay)
+            if manifest.switch is not None:
+                switch_project(
+                    config_path, manifest.switch, raise_if_error=True
+                )
+        except Exception as exc:
+            logger.error("Applying projects manifest failed", exc_info=True)
+            transaction.rollback()
+            raise ValueError(
+                f"Applying projects manifest failed. {exc}"
+            ) from exc
+    transaction.commit(detach)
@@ -0,0 +1,357 @@
+import errno
+import logging
+import os
+import shutil
+import sys
+from collections.abc import Mapping
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from copy import deepcopy
+from pathlib import Path
+from typing import Any, NoReturn
+
+from qualibrate_config.core.lock import config_lock
+from qualibrate_config.core.project.common import read_project_config_file
+from qualibrate_config.core.project.create import (
+    create_project_config_file,
+    fill_project_quam_state_path,
+    fill_project_storage_location,
+    rollback_project_creation,
+)
+from qualibrate_config.core.project.p_list import list_projects
+from qualibrate_config.core.project.path import PROJECTS_TRASH_DIRNAME
+from qualibrate_config.file import project_config_view, read_config_file
+from qualibrate_config.qulibrate_types import RawConfigType
+from qualibrate_config.references.resolvers import (
+    TEMPLATE_START,
+    resolve_single_item,
+)
+from qualibrate_config.vars import (
+    QUALIBRATE_CONFIG_KEY,
+    QUAM_CONFIG_KEY,
+    QUAM_STATE_PATH_CONFIG_KEY,
+)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment,unused-ignore]
+
+__all__ = [
+    "CLONE_MODES",
+    "DEFAULT_CLONE_JOBS",
+    "clone_project",
+    "clone_tree",
+]
+
+logger = logging.getLogger(__name__)
+
+# auto: reflink if supported, else hardlink, else copy
+CLONE_MODES = ("auto", "reflink", "hardlink", "copy")
+# dirs of one tree cloned concurrently by `clone_tree`
+DEFAULT_CLONE_JOBS = 8
+# linux/fs.h: _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+# errors meaning that the way of cloning isn't supported for the files
+_UNSUPPORTED_ERRNOS = frozenset(
+    {
+        errno.EXDEV,
+        errno.EOPNOTSUPP,
+        errno.ENOTTY,
+        errno.EINVAL,
+        errno.EPERM,
+        errno.ENOSYS,
+    }
+)
+
+
+def _reflink(src: str, dst: str) -> None:
+    """Copy-on-write clone of the file (Linux, e.g. btrfs or xfs)."""
+    assert fcntl is not None
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        except OSError:
+            os.close(dst_fd)
+            os.unlink(dst)
+            raise
+        os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    shutil.copystat(src, dst)
+
+
+class _FileCloner:
+    """
+    Clones files in the way allowed by the mode, falling back to the next
+    one. A way which failed as unsupported isn't tried again.
+    """
+
+    def __init__(self, mode: str) -> None:
+        if mode not in CLONE_MODES:
+            raise ValueError(
+                f"Unknown clone mode '{mode}'. "
+                f"Allowed modes: {', '.join(CLONE_MODES)}."
+            )
+        self.reflink = (
+            mode in ("auto", "reflink")
+            and fcntl is not None
+            and sys.platform == "linux"
+        )
+        self.hardlink = mode in ("auto", "hardlink")
+
+    def clone(self, src: str, dst: str) -> None:
+        if self.reflink:
+            try:
+                _reflink(src, dst)
+                return
+            except OSError as ex:
+                if ex.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                self.reflink = False
+        if self.hardlink:
+            try:
+                os.link(src, dst)
+                return
+            except OSError as ex:
+                if ex.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                self.hardlink = False
+        shutil.copy2(src, dst)
+
+
+def _clone_dir(
+    cloner: _FileCloner, src: str, dst: str
+) -> list[tuple[str, str]]:
+    """Clone entries of one dir. Returns (src, dst) of created subdirs."""
+    subdirs = []
+    with os.scandir(src) as entries:
+        for entry in entries:
+            dst_path = os.path.join(dst, entry.name)
+            if entry.is_symlink():
+                os.symlink(os.readlink(entry.path), dst_path)
+            elif entry.is_dir():
+                os.mkdir(dst_path)
+                subdirs.append((entry.path, dst_path))
+            else:
+                cloner.clone(entry.path, dst_path)
+    return subdirs
+
+
+def clone_tree(
+    src: Path, dst: Path, mode: str = "auto", jobs: int | None = None
+) -> None:
+    """
+    Clone the dir tree `src` to `dst` (which should be empty if exists).
+
+    Files are cloned with copy-on-write reflinks (`FICLONE`) or hardlinks
+    if the mode allows it and the filesystem supports it, and copied
+    otherwise. Hardlinked files share the content, so modifying a file of
+    one tree in place modifies it in the other one too. Dirs are walked
+    concurrently by `jobs` threads (`DEFAULT_CLONE_JOBS` if not passed).
+    Stat of dirs (e.g. modification time) is copied.
+    """
+    cloner = _FileCloner(mode)
+    dst.mkdir(parents=True, exist_ok=True)
+    dirs = [(os.fspath(src), os.fspath(dst))]
+    with ThreadPoolExecutor(
+        max_workers=jobs or DEFAULT_CLONE_JOBS,
+        thread_name_prefix="qualibrate-clone",
+    ) as executor:
+        pending: set[Future[list[tuple[str, str]]]] = {
+            executor.submit(_clone_dir, cloner, *dirs[0])
+        }
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subdirs = future.result()
+                    dirs.extend(subdirs)
+                    pending.update(
+                        executor.submit(_clone_dir, cloner, *subdir)
+                        for subdir in subdirs
+                    )
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+        # after all entries are created, so mtime isn't changed again
+        for _ in executor.map(lambda paths: shutil.copystat(*paths), dirs):
+            pass
+
+
+def _config_path(config: Mapping[str, Any], *keys: str) -> Path | None:
+    """Path value of the config with solved references."""
+    value: Any = config
+    for key in keys:
+        if not isinstance(value, Mapping) or key not in value:
+            return None
+        value = value[key]
+    if isinstance(value, str) and TEMPLATE_START in value:
+        value = resolve_single_item(config, value)
+    if not isinstance(value, str) or not value:
+        return None
+    return Path(value).expanduser().absolute()
+
+
+def _target_path(
+    source_path: Path | None,
+    solved_path: Path | None,
+    source: str,
+    target: str,
+) -> Path | None:
+    """Path for the target project derived from the path of the source."""
+    if source_path is None or (
+        solved_path is not None and solved_path != source_path
+    ):
+        return solved_path
+    parts = source_path.parts
+    if source in parts:
+        i = len(parts) - 1 - parts[::-1].index(source)
+        return Path(*parts[:i], target, *parts[i + 1 :])
+    raise ValueError(
+        f"Can't derive path for project '{target}' from '{source_path}'. "
+        "Please specify it explicitly."
+    )
+
+
+def _project_paths(
+    config: Mapping[str, Any],
+) -> tuple[Path | None, Path | None]:
+    return (
+        _config_path(config, QUALIBRATE_CONFIG_KEY, "storage", "location"),
+        _config_path(config, QUAM_CONFIG_KEY, QUAM_STATE_PATH_CONFIG_KEY),
+    )
+
+
+def _clone_failed(
+    exc: Exception,
+    config_path: Path,
+    source: str,
+    target: str,
+    target_storage: Path | None,
+    target_quam_state: Path | None,
+) -> NoReturn:
+    logger.error(
+        f"Project cloning failed from '{source}' to '{target}'",
+        exc_info=True,
+    )
+    with config_lock(config_path):
+        rollback_project_creation(
+            config_path.parent, target, target_storage, target_quam_state
+        )
+    raise ValueError(f"Project cloning failed. {exc}") from exc
+
+
+def clone_project(
+    config_path: Path,
+    source: str,
+    target: str,
+    storage_location: Path | None = None,
+    quam_state_path: Path | None = None,
+    *,
+    mode: str = "auto",
+    jobs: int | None = None,
+) -> None:
+    """
+    Create project `target` as a copy of project `source`.
+
+    The overlay of the source is copied with storage location and quam
+    state path pointing to the new dirs. They're `storage_location` and
+    `quam_state_path` if passed; otherwise the config values are solved for
+    the target project (e.g. `${#/qualibrate/project}` templates) or, if
+    they don't depend on the project, the source project name in the source
+    paths is replaced with the target one.
+
+    Storage is cloned by `clone_tree` with `mode`. Files of the quam state
+    are modified in place, so they're never hardlinked. The project and its
+    empty dirs are created under the config lock, and trees are cloned after
+    the lock is released, so config reads aren't blocked by a long copy.
+    Everything created is removed if cloning fails.
+
+    Raises:
+        ValueError: The project can't be cloned.
+    """
+    qualibrate_path = config_path.parent
+    if target == PROJECTS_TRASH_DIRNAME:
+        raise ValueError(f"Project name '{target}' is reserved.")
+    with config_lock(config_path):
+        try:
+            projects = list_projects(qualibrate_path)
+        except NotADirectoryError:
+            projects = []
+        if source not in projects:
+            raise ValueError(f"Project '{source}' does not exist.")
+        if target in projects:
+            raise ValueError(f"Project '{target}' already exists.")
+        base_config = read_config_file(
+            config_path, solve_references=False, apply_project=False
+        )
+        source_overlay = read_project_config_file(config_path, source)
+        source_storage, source_quam_state = _project_paths(
+            project_config_view(
+                base_config, config_path, source, source_overlay
+            )
+        )
+        solved_storage, solved_quam_state = _project_paths(
+            project_config_view(
+                base_config, config_path, target, source_overlay
+            )
+        )
+        target_storage = storage_location or _target_path(
+            source_storage, solved_storage, source, target
+        )
+        target_quam_state = quam_state_path or _target_path(
+            source_quam_state, solved_quam_state, source, target
+        )
+        for path in (target_storage, target_quam_state):
+            if path is not None and path.exists():
+                raise ValueError(f"Path '{path}' already exists.")
+        target_overlay: RawConfigType = deepcopy(source_overlay)
+        # overlay keeps templates which are solved to the new paths
+        if target_storage != solved_storage:
+            fill_project_storage_location(target_overlay, target_storage)
+        if target_quam_state != solved_quam_state:
+            fill_project_quam_state_path(target_overlay, target_quam_state)
+        try:
+            create_project_config_file(qualibrate_path, target, target_overlay)
+            # target dirs are created under the lock, so they can't be taken
+            # by other project while the tree is cloned
+            for target_path in (target_storage, target_quam_state):
+                if target_path is not None:
+                    target_path.mkdir(parents=True)
+        except Exception as exc:
+            _clone_failed(
+                exc,
+                config_path,
+                source,
+                target,
+                target_storage,
+                target_quam_state,
+            )
+    # storage can be big, so it's cloned without holding the config lock
+    try:
+        for source_path, target_path, path_mode in (
+            (source_storage, target_storage, mode),
+            (
+                source_quam_state,
+                target_quam_state,
+                "copy" if mode == "copy" else "reflink",
+            ),
+        ):
+            if (
+                target_path is not None
+                and source_path is not None
+                and source_path.is_dir()
+            ):
+                clone_tree(source_path, target_path, path_mode, jobs)
+    except Exception as exc:
+        _clone_failed(
+            exc, config_path, source, target, target_storage, target_quam_state
+        )
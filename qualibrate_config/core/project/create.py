@@ -1,6 +1,5 @@
 import shutil
-from collections.abc import Iterable, Mapping
-from copy import deepcopy
+from collections.abc import Iterable, Mapping, MutableMapping
 from pathlib import Path
 from typing import Any
 
@@ -10,8 +9,11 @@ from click import Context
 
 from qualibrate_config.core.content import get_config_file_content
 from qualibrate_config.core.from_sources import qualibrate_config_from_sources
+from qualibrate_config.core.layered import OverlayBuilder, to_plain_dict
+from qualibrate_config.core.lock import config_lock
 from qualibrate_config.core.project.p_list import list_projects
 from qualibrate_config.core.project.path import (
+    PROJECTS_TRASH_DIRNAME,
     get_project_config_path,
     get_project_path,
 )
@@ -51,7 +53,10 @@ def jsonpatch_to_dict(patch: jsonpatch.JsonPatch) -> dict[str, Any]:
 
 
 def _fill_path(
-    config: dict[str, Any], path: Iterable[str], key: str, value: Path | None
+    config: MutableMapping[str, Any],
+    path: Iterable[str],
+    key: str,
+    value: Path | None,
 ) -> None:
     if value is None:
         return
@@ -62,7 +67,7 @@ def _fill_path(
 
 
 def fill_project_quam_state_path(
-    common_config: dict[str, Any], quam_state_path: Path | None
+    common_config: MutableMapping[str, Any], quam_state_path: Path | None
 ) -> None:
     _fill_path(
         common_config,
@@ -73,7 +78,7 @@ def fill_project_quam_state_path(
 
 
 def fill_project_storage_location(
-    common_config: dict[str, Any], storage_location: Path | None
+    common_config: MutableMapping[str, Any], storage_location: Path | None
 ) -> None:
     _fill_path(
         common_config,
@@ -84,7 +89,8 @@ def fill_project_storage_location(
 
 
 def fill_project_calibration_library_folder(
-    common_config: dict[str, Any], calibration_library_folder: Path | None
+    common_config: MutableMapping[str, Any],
+    calibration_library_folder: Path | None,
 ) -> None:
     _fill_path(
         common_config,
@@ -131,17 +137,18 @@ def rollback_project_creation(
 
 
 def config_for_project_from_context(
-    common_config: dict[str, Any],
+    common_config: MutableMapping[str, Any],
     storage_location: Path | None,
     calibration_library_folder: Path | None,
     quam_state_path: Path | None,
     database: DBConfig | None,
     database_state: DatabaseStateConfig | None,
     context: Context | None,
-) -> dict[str, Any]:
+) -> MutableMapping[str, Any]:
     if context is None:
         raise ValueError("Context isn't passed.")
-    q_config = common_config.get(QUALIBRATE_CONFIG_KEY, {})
+    # whole section is replaced by the serialized one below
+    q_config = to_plain_dict(common_config.get(QUALIBRATE_CONFIG_KEY, {}))
     required_subconfigs = ("storage",)
     optional_subconfigs = (
         ("calibration_library",)
@@ -173,7 +180,7 @@ def config_for_project_from_context(
 
 
 def fill_project_database(
-    common_config: dict[str, Any], database: DBConfig | None
+    common_config: MutableMapping[str, Any], database: DBConfig | None
 ) -> None:
     if database is None:
         return
@@ -188,7 +195,8 @@ def fill_project_database(
 
 
 def fill_project_database_state(
-    common_config: dict[str, Any], database_state: DatabaseStateConfig | None
+    common_config: MutableMapping[str, Any],
+    database_state: DatabaseStateConfig | None,
 ) -> None:
     if database_state is None:
         return
@@ -199,14 +207,14 @@ def fill_project_database_state(
 
 
 def config_for_project_from_args(
-    common_config: dict[str, Any],
+    common_config: MutableMapping[str, Any],
     storage_location: Path | None,
     calibration_library_folder: Path | None,
     quam_state_path: Path | None,
     database: DBConfig | None,
     database_state: DatabaseStateConfig | None,
     context: Context | None,
-) -> dict[str, Any]:
+) -> MutableMapping[str, Any]:
     if context is not None:
         raise ValueError("Context is passed.")
     fill_project_storage_location(common_config, storage_location)
@@ -230,37 +238,41 @@ def create_project(
     ctx: Context | None = None,
 ) -> None:
     qualibrate_path = config_path.parent
-    try:
-        projects = list_projects(qualibrate_path)
-    except NotADirectoryError:
-        pass
-    else:
-        if name in projects:
-            raise ValueError(f"Project '{name}' already exists.")
-    common_config, config_file = get_config_file_content(config_path)
-    common_config, config_file = validate_version_and_migrate_if_needed(
-        common_config, config_file
-    )
-    old_config = deepcopy(common_config)
-    config_for_project = (
-        config_for_project_from_context if ctx else config_for_project_from_args
-    )
-    common_config = config_for_project(
-        common_config,
-        storage_location,
-        calibration_library_folder,
-        quam_state_path,
-        database,
-        database_state,
-        ctx,
-    )
-    patches = jsonpatch.make_patch(old_config, common_config)
-    project_config = jsonpatch_to_dict(patches)
-    try:
-        create_project_config_file(qualibrate_path, name, project_config)
-        after_create_project(storage_location, quam_state_path)
-    except Exception as exc:
-        rollback_project_creation(
-            qualibrate_path, name, storage_location, quam_state_path
+    if name == PROJECTS_TRASH_DIRNAME:
+        raise ValueError(f"Project name '{name}' is reserved.")
+    with config_lock(config_path):
+        try:
+            projects = list_projects(qualibrate_path)
+        except NotADirectoryError:
+            pass
+        else:
+            if name in projects:
+                raise ValueError(f"Project '{name}' already exists.")
+        common_config, config_file = get_config_file_content(config_path)
+        common_config, config_file = validate_version_and_migrate_if_needed(
+            common_config, config_file
+        )
+        config_for_project = (
+            config_for_project_from_context
+            if ctx
+            else config_for_project_from_args
+        )
+        overlay_builder = OverlayBuilder(common_config)
+        config_for_project(
+            overlay_builder,
+            storage_location,
+            calibration_library_folder,
+            quam_state_path,
+            database,
+            database_state,
+            ctx,
         )
-        raise ValueError(f"Project creation failed. {exc}") from exc
+        project_config = overlay_builder.overlay()
+        try:
+            create_project_config_file(qualibrate_path, name, project_config)
+            after_create_project(storage_location, quam_state_path)
+        except Exception as exc:
+            rollback_project_creation(
+                qualibrate_path, name, storage_location, quam_state_path
+            )
+            raise ValueError(f"Project creation failed. {exc}") from exc
@@ -1,26 +1,149 @@
 import shutil
+import subprocess
+import sys
+import threading
+from datetime import datetime
 from pathlib import Path
 
 from qualibrate_config.core.content import get_config_file_content
+from qualibrate_config.core.lock import config_lock
 from qualibrate_config.core.project.common import get_project_from_common_config
 from qualibrate_config.core.project.p_list import list_projects
-from qualibrate_config.core.project.path import get_project_path
+from qualibrate_config.core.project.path import (
+    get_project_path,
+    get_projects_trash_path,
+)
 
+__all__ = [
+    "delete_project",
+    "move_project_to_trash",
+    "purge_trash",
+    "remove_in_background",
+]
 
-def delete_project(config_path: Path, project: str) -> None:
+
+def move_project_to_trash(qualibrate_path: Path, project: str) -> Path:
+    """
+    Move the project dir to `projects/.trash/<name>-<timestamp>` with one
+    rename, so the project disappears from the listing immediately.
+    Returns the new path of the dir.
+    """
+    trash_path = get_projects_trash_path(qualibrate_path)
+    trash_path.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    trashed_path = trash_path / f"{project}-{timestamp}"
+    get_project_path(qualibrate_path, project).rename(trashed_path)
+    return trashed_path
+
+
+def remove_in_background(path: Path, detach: bool = False) -> None:
+    """
+    Remove the dir without waiting for it. The removal is done in a thread
+    or, if `detach`, in a separate process which outlives the current one
+    (for short-lived processes like CLI). Leftovers of interrupted removals
+    are cleaned by `purge_trash`.
+    """
+    if not detach:
+        threading.Thread(
+            target=shutil.rmtree,
+            args=(path,),
+            kwargs={"ignore_errors": True},
+            name="qualibrate-project-remove",
+            daemon=True,
+        ).start()
+        return
+    command = [
+        sys.executable,
+        "-c",
+        "import shutil, sys; shutil.rmtree(sys.argv[1], ignore_errors=True)",
+        str(path),
+    ]
+    if sys.platform == "win32":
+        subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=(
+                subprocess.DETACHED_PROCESS
+                | subprocess.CREATE_NEW_PROCESS_GROUP
+            ),
+        )
+    else:
+        subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+
+def purge_trash(config_path: Path) -> tuple[int, list[Path]]:
+    """
+    Remove everything left in the projects trash. Returns number of removed
+    entries and paths which couldn't be removed.
+    """
+    trash_path = get_projects_trash_path(config_path.parent)
+    removed = 0
+    failed: list[Path] = []
+    with config_lock(config_path):
+        if not trash_path.is_dir():
+            return 0, []
+        paths = list(trash_path.iterdir())
+    for path in paths:
+        if path.is_dir() and not path.is_symlink():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
+        if path.exists() or path.is_symlink():
+            failed.append(path)
+        else:
+            removed += 1
+    return removed, failed
+
+
+def delete_project(
+    config_path: Path,
+    project: str,
+    *,
+    background: bool = False,
+    detach: bool = False,
+) -> None:
+    """
+    Remove the project dir.
+
+    Args:
+        config_path: Path to the base config file.
+        project: Name of the project.
+        background: Move the project dir to the trash and remove it in
+            background (see `remove_in_background`) instead of waiting for
+            the removal.
+        detach: Remove the dir in a separate process if `background`.
+    """
     qualibrate_path = config_path.parent
-    try:
-        projects = list_projects(qualibrate_path)
-    except NotADirectoryError as e:
-        # there is no any project
-        raise RuntimeError("Projects dir doesn't exist.") from e
-    if project not in projects:
-        raise RuntimeError(f"Project '{project}' does not exist")
-    common_config, config_file = get_config_file_content(config_path)
-    current_project = get_project_from_common_config(common_config)
-    if current_project and current_project == project:
-        raise RuntimeError("Can't delete current project.")
-    project_path = get_project_path(qualibrate_path, project)
-    if project_path is None:
-        raise RuntimeError(f"Can't resolve project '{project}' directory")
-    shutil.rmtree(project_path)
+    with config_lock(config_path):
+        try:
+            projects = list_projects(qualibrate_path)
+        except NotADirectoryError as e:
+            # there is no any project
+            raise RuntimeError("Projects dir doesn't exist.") from e
+        if project not in projects:
+            raise RuntimeError(f"Project '{project}' does not exist")
+        common_config, config_file = get_config_file_content(config_path)
+        current_project = get_project_from_common_config(common_config)
+        if current_project and current_project == project:
+            raise RuntimeError("Can't delete current project.")
+        project_path = get_project_path(qualibrate_path, project)
+        if project_path is None:
+            raise RuntimeError(f"Can't resolve project '{project}' directory")
+        if not background:
+            shutil.rmtree(project_path)
+            return
+        try:
+            trashed_path = move_project_to_trash(qualibrate_path, project)
+        except OSError as e:
+            raise RuntimeError(
+                f"Can't move project '{project}' to trash. {e}"
+            ) from e
+    remove_in_background(trashed_path, detach)
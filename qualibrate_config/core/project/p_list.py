@@ -1,81 +1,82 @@
 import datetime
-import sys
-from os import stat_result
+import heapq
+import json
+import os
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from pathlib import Path
+from typing import Any, TypeVar
 
 import click
 
 from qualibrate_config.core.project.common import read_project_config_file
 from qualibrate_config.core.project.model import Project
 from qualibrate_config.core.project.path import (
+    PROJECTS_TRASH_DIRNAME,
     get_project_path,
     get_projects_path,
 )
-from qualibrate_config.file import read_config_file
+from qualibrate_config.core.project.storage import (
+    STATS_INDEX_FILENAME,
+    is_dir_entry,
+    scan_storage,
+    stat_ctime,
+)
+from qualibrate_config.file import project_config_view, read_config_file
+from qualibrate_config.qulibrate_types import RawConfigType
+from qualibrate_config.references.resolvers import (
+    TEMPLATE_START,
+    resolve_references,
+    resolve_single_item,
+)
 from qualibrate_config.vars import QUALIBRATE_CONFIG_KEY
 
+# projects stat'ed concurrently by `verbose_list_projects`
+DEFAULT_PROJECT_STAT_JOBS = 8
+PROJECT_LIST_FORMATS = ("text", "json", "ndjson")
 
-def _dt_from_ts(ts: float) -> datetime.datetime:
-    return datetime.datetime.fromtimestamp(round(ts))
-
-
-def _stat_ctime(storage_stat: stat_result) -> float:
-    if sys.version_info >= (3, 12) and sys.platform == "win32":
-        return storage_stat.st_birthtime
-    return storage_stat.st_ctime
-
+T = TypeVar("T")
 
-def _file_stat_ctime(p: Path) -> float:
-    return _stat_ctime(p.stat())
+# sort key: (key of a project, whether larger values go first)
+_SORT_KEYS: dict[str, tuple[Callable[[Project], Any], bool]] = {
+    "name": (lambda project: project.name, False),
+    "last-modified": (lambda project: project.last_modified_at, True),
+    "nodes": (lambda project: project.nodes_number, True),
+}
+PROJECT_SORT_KEYS = tuple(_SORT_KEYS)
 
 
-def _file_stat_mtime(p: Path) -> float:
-    return p.stat().st_mtime
-
-
-def _created_at_from_storage(
-    storage_path: Path, storage_stat: stat_result
-) -> datetime.datetime:
-    first_create_p = min(
-        (p for p in storage_path.glob("*/#*") if p.is_dir()),
-        key=_file_stat_ctime,
-        default=None,
-    )
-    if first_create_p is None:
-        return _dt_from_ts(_stat_ctime(storage_stat))
-    return _dt_from_ts(
-        min(_stat_ctime(storage_stat), _file_stat_ctime(first_create_p))
-    )
-
-
-def _last_modified_at_from_storage(
-    storage_path: Path, storage_stat: stat_result
-) -> datetime.datetime:
-    first_create_p = max(
-        (p for p in storage_path.glob("*/#*") if p.is_dir()),
-        key=_file_stat_mtime,
-        default=None,
-    )
-    if first_create_p is None:
-        return _dt_from_ts(storage_stat.st_mtime)
-    return _dt_from_ts(
-        max(storage_stat.st_mtime, _file_stat_mtime(first_create_p))
-    )
+def _dt_from_ts(ts: float) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(round(ts))
 
 
 def _storage_stat(
     storage_path: Path,
+    index_path: Path | None = None,
+    scan_jobs: int | None = None,
 ) -> tuple[int, datetime.datetime, datetime.datetime]:
-    nodes_number = sum(
-        (1 for p in storage_path.glob("*/#*") if p.is_dir()),
-        start=0,
+    nodes_number, nodes_ctime, nodes_mtime = scan_storage(
+        storage_path, index_path, scan_jobs
     )
     storage_stat = storage_path.stat()
-    created_at = _created_at_from_storage(storage_path, storage_stat)
-    last_modified_at = _last_modified_at_from_storage(
-        storage_path, storage_stat
-    )
-    return nodes_number, created_at, last_modified_at
+    created_at = stat_ctime(storage_stat)
+    if nodes_ctime is not None:
+        created_at = min(created_at, nodes_ctime)
+    last_modified_at = storage_stat.st_mtime
+    if nodes_mtime is not None:
+        last_modified_at = max(last_modified_at, nodes_mtime)
+    return nodes_number, _dt_from_ts(created_at), _dt_from_ts(last_modified_at)
+
+
+def _storage_location(config: Mapping[str, Any]) -> Any:
+    """Storage location with solved references (only the ones it needs)."""
+    qualibrate = config.get(QUALIBRATE_CONFIG_KEY, {})
+    storage = qualibrate.get("storage", {})
+    location = storage.get("location") if isinstance(storage, Mapping) else None
+    if not isinstance(location, str) or TEMPLATE_START not in location:
+        return location
+    return resolve_single_item(config, location)
 
 
 def _project_stat_dir(
@@ -90,21 +91,43 @@ def project_stat(
     project: str,
     config_path: Path,
     with_config: bool = False,
+    base_config: RawConfigType | None = None,
+    use_index: bool = True,
+    scan_jobs: int | None = None,
 ) -> Project:
+    """
+    Project info. Pass already parsed `base_config` (base config file
+    content without overlay and not resolved) to not parse it again for
+    each project; it isn't modified. Only references of the storage location
+    are solved unless the whole config is requested (`with_config`).
+    If `use_index`, storage stats are
+    kept in the project `.stats` index and only changed date dirs of the
+    storage are scanned again. Date dirs are scanned by `scan_jobs` threads
+    (see `scan_storage`).
+    """
     project_path = get_project_path(qualibrate_path, project)
-
-    config_dict = read_config_file(config_path, override_project=project)
+    if base_config is None:
+        base_config = read_config_file(
+            config_path, solve_references=False, apply_project=False
+        )
     project_config = read_project_config_file(config_path, project)
-    storage_location = (
-        config_dict.get(QUALIBRATE_CONFIG_KEY, {})
-        .get("storage", {})
-        .get("location")
+    config_view = project_config_view(
+        base_config,
+        config_path,
+        override_project=project,
+        project_config=project_config,
     )
+    storage_location = _storage_location(config_view)
     if storage_location:
         storage_path = Path(storage_location)
         if storage_path.is_dir():
+            index_path = (
+                project_path / STATS_INDEX_FILENAME
+                if use_index and project_path.is_dir()
+                else None
+            )
             nodes_number, created_at, last_modified_at = _storage_stat(
-                storage_path
+                storage_path, index_path, scan_jobs
             )
         else:
             nodes_number, created_at, last_modified_at = _project_stat_dir(
@@ -120,34 +143,197 @@ def project_stat(
         created_at=created_at.astimezone(),
         last_modified_at=last_modified_at.astimezone(),
         updates=project_config,
-        config=config_dict if with_config else None,
+        config=(
+            resolve_references(config_view.materialize())
+            if with_config
+            else None
+        ),
     )
 
 
-def list_projects(qualibrate_path: Path) -> list[str]:
+def _iter_project_dirs(projects_path: Path) -> Iterator[str]:
+    with os.scandir(projects_path) as entries:
+        for entry in entries:
+            if entry.name != PROJECTS_TRASH_DIRNAME and is_dir_entry(entry):
+                yield entry.name
+
+
+def iter_projects(qualibrate_path: Path) -> Iterator[str]:
+    """Names of projects in directory order (no stat call per entry)."""
     projects_path = get_projects_path(qualibrate_path)
     if not projects_path.is_dir():
         raise NotADirectoryError(
             f"Projects path '{projects_path}' is not a directory"
         )
-    return list(
-        map(
-            lambda p: p.name,
-            filter(Path.is_dir, projects_path.iterdir()),
-        )
+    return _iter_project_dirs(projects_path)
+
+
+def list_projects(qualibrate_path: Path) -> list[str]:
+    return list(iter_projects(qualibrate_path))
+
+
+def _project_stat_func(
+    config_path: Path, scan_jobs: int | None, with_config: bool = True
+) -> Callable[[str], Project]:
+    """`project_stat` with config of the project for each project name. The
+    base config file is parsed once."""
+    qualibrate_path = config_path.parent
+    base_config = read_config_file(
+        config_path, solve_references=False, apply_project=False
     )
 
+    def stat(p_name: str) -> Project:
+        return project_stat(
+            qualibrate_path,
+            p_name,
+            config_path,
+            with_config=with_config,
+            base_config=base_config,
+            scan_jobs=scan_jobs,
+        )
+
+    return stat
+
 
 def verbose_list_projects(
     config_path: Path,
+    jobs: int | None = None,
+    scan_jobs: int | None = None,
 ) -> dict[str, Project]:
-    qualibrate_path = config_path.parent
-    return {
-        p_name: project_stat(
-            qualibrate_path, p_name, config_path, with_config=True
+    """
+    Info of all projects. Projects are stat'ed (overlay read, storage
+    scanned) concurrently by `jobs` threads (`DEFAULT_PROJECT_STAT_JOBS` if
+    not passed); the result is ordered like `list_projects`. Storage of
+    each project is scanned by `scan_jobs` threads (see `scan_storage`).
+    """
+    stat = _project_stat_func(config_path, scan_jobs)
+    projects = list_projects(config_path.parent)
+    jobs = min(jobs or DEFAULT_PROJECT_STAT_JOBS, len(projects))
+    if jobs < 2:
+        return {p_name: stat(p_name) for p_name in projects}
+    with ThreadPoolExecutor(
+        max_workers=jobs, thread_name_prefix="qualibrate-project-stat"
+    ) as executor:
+        return dict(zip(projects, executor.map(stat, projects), strict=True))
+
+
+def iter_verbose_projects(
+    config_path: Path,
+    jobs: int | None = None,
+    scan_jobs: int | None = None,
+    with_config: bool = True,
+) -> Iterator[Project]:
+    """
+    Info of all projects as soon as each of them is ready (in completion
+    order), see `verbose_list_projects`. Closing the iterator cancels
+    projects which aren't stat'ed yet.
+    """
+    stat = _project_stat_func(config_path, scan_jobs, with_config)
+    projects = list_projects(config_path.parent)
+    jobs = min(jobs or DEFAULT_PROJECT_STAT_JOBS, len(projects))
+    if jobs < 2:
+        yield from map(stat, projects)
+        return
+    with ThreadPoolExecutor(
+        max_workers=jobs, thread_name_prefix="qualibrate-project-stat"
+    ) as executor:
+        futures = [executor.submit(stat, p_name) for p_name in projects]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _select(
+    items: Iterable[T],
+    key: Callable[[T], Any] | None,
+    reverse: bool,
+    limit: int | None,
+) -> Iterator[T]:
+    """Items sorted by `key` (if passed) and limited. Top `limit` items are
+    selected with a heap, unsorted items are streamed."""
+    if key is None:
+        return iter(items) if limit is None else islice(items, limit)
+    if limit is None:
+        return iter(sorted(items, key=key, reverse=reverse))
+    select = heapq.nlargest if reverse else heapq.nsmallest
+    return iter(select(limit, items, key=key))
+
+
+def _echo_projects(
+    records: Iterable[Project | str], output_format: str
+) -> None:
+    if output_format == "json":
+        # stream the array item by item
+        separator = "["
+        for record in records:
+            click.echo(separator, nl=False)
+            click.echo(_project_json(record), nl=False)
+            separator = ",\n"
+        click.echo("[]" if separator == "[" else "]")
+        return
+    for record in records:
+        if output_format == "ndjson":
+            click.echo(_project_json(record))
+        elif isinstance(record, Project):
+            click.echo(record.verbose_str())
+        else:
+            click.echo(record)
+
+
+def _project_json(record: Project | str) -> str:
+    if isinstance(record, Project):
+        return record.model_dump_json()
+    return json.dumps({"name": record})
+
+
+def print_projects_list(
+    config_path: Path,
+    verbose: bool = False,
+    *,
+    sort: str | None = None,
+    limit: int | None = None,
+    output_format: str = "text",
+    jobs: int | None = None,
+    scan_jobs: int | None = None,
+) -> None:
+    """
+    Print projects as soon as each of them is ready.
+
+    Args:
+        config_path: Path to the config file.
+        verbose: Print project info, not only names.
+        sort: One of `PROJECT_SORT_KEYS` (`name` ascending, `last-modified`
+            and `nodes` descending). Unsorted projects are printed in
+            completion order. Sorted projects are printed when all of them
+            are ready.
+        limit: Max number of printed projects.
+        output_format: One of `PROJECT_LIST_FORMATS`.
+        jobs: Number of projects stat'ed concurrently.
+        scan_jobs: Number of storage dirs of a project scanned concurrently.
+    """
+    if sort is not None and sort not in _SORT_KEYS:
+        raise ValueError(f"Unknown projects sort key {sort!r}")
+    if output_format not in PROJECT_LIST_FORMATS:
+        raise ValueError(f"Unknown projects list format {output_format!r}")
+    records: Iterable[Project | str]
+    if verbose or sort not in (None, "name"):
+        key, reverse = _SORT_KEYS[sort] if sort is not None else (None, False)
+        projects = _select(
+            iter_verbose_projects(
+                config_path, jobs, scan_jobs, with_config=verbose
+            ),
+            key,
+            reverse,
+            limit,
         )
-        for p_name in list_projects(qualibrate_path)
-    }
+        records = projects if verbose else (p.name for p in projects)
+    else:
+        names = iter_projects(config_path.parent)
+        records = _select(names, None if sort is None else str, False, limit)
+    _echo_projects(records, output_format)
 
 
 def print_simple_projects_list(
@@ -158,6 +344,9 @@ def print_simple_projects_list(
 
 def print_verbose_projects_list(
     config_path: Path,
+    jobs: int | None = None,
+    scan_jobs: int | None = None,
 ) -> None:
-    for p_stat in verbose_list_projects(config_path).values():
+    projects = verbose_list_projects(config_path, jobs, scan_jobs)
+    for p_stat in projects.values():
         click.echo(p_stat.verbose_str())
@@ -2,6 +2,9 @@ from pathlib import Path
 
 from qualibrate_config.vars import DEFAULT_CONFIG_FILENAME
 
+# deleted projects are moved here before they're removed
+PROJECTS_TRASH_DIRNAME = ".trash"
+
 
 def get_projects_path(qualibrate_path: Path) -> Path:
     return qualibrate_path / "projects"
@@ -19,3 +22,7 @@ def get_project_config_path(
     return get_project_path(qualibrate_path, project_name).joinpath(
         config_filename
     )
+
+
+def get_projects_trash_path(qualibrate_path: Path) -> Path:
+    return get_projects_path(qualibrate_path) / PROJECTS_TRASH_DIRNAME
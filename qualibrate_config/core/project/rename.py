@@ -1,6 +1,7 @@
 import logging
 from pathlib import Path
 
+from qualibrate_config.core.lock import config_lock
 from qualibrate_config.core.project.path import (
     get_project_path,
 )
@@ -15,27 +16,28 @@ def rename_project(
 ) -> None:
     qualibrate_path = config_path.parent
 
-    project_path = get_project_path(qualibrate_path, old_name)
-    if not project_path.exists():
-        raise ValueError(f"Project '{old_name}' does not exist.")
-
-    new_project_path = get_project_path(qualibrate_path, new_name)
-    if new_project_path.exists():
-        raise ValueError(f"Project '{new_name}' already exists.")
-
-    try:
-        project_path.rename(new_project_path)
-        logger.info(
-            f"Successfully renamed project '{old_name}' to '{new_name}'"
-        )
-
-    except Exception as exc:
-        # Log the full exception details
-        logger.error(
-            f"Project rename failed from '{old_name}' to '{new_name}'",
-            exc_info=True,
-        )
-
-        raise ValueError(
-            f"Project rename failed from '{old_name}' to '{new_name}'"
-        ) from exc
+    with config_lock(config_path):
+        project_path = get_project_path(qualibrate_path, old_name)
+        if not project_path.exists():
+            raise ValueError(f"Project '{old_name}' does not exist.")
+
+        new_project_path = get_project_path(qualibrate_path, new_name)
+        if new_project_path.exists():
+            raise ValueError(f"Project '{new_name}' already exists.")
+
+        try:
+            project_path.rename(new_project_path)
+            logger.info(
+                f"Successfully renamed project '{old_name}' to '{new_name}'"
+            )
+
+        except Exception as exc:
+            # Log the full exception details
+            logger.error(
+                f"Project rename failed from '{old_name}' to '{new_name}'",
+                exc_info=True,
+            )
+
+            raise ValueError(
+                f"Project rename failed from '{old_name}' to '{new_name}'"
+            ) from exc
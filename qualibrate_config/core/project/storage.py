@@ -0,0 +1,208 @@
+import contextlib
+import json
+import os
+import sys
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from os import stat_result
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from qualibrate_config.core.toml_edit import atomic_write
+
+__all__ = [
+    "DEFAULT_SCAN_JOBS",
+    "STATS_INDEX_FILENAME",
+    "StorageStat",
+    "is_dir_entry",
+    "scan_storage",
+    "stat_ctime",
+]
+
+STATS_INDEX_FILENAME = ".stats"
+STATS_INDEX_VERSION = 1
+# dirs modified this recently may still change within the same mtime tick,
+# so they aren't trusted on the next scan
+_RACY_INTERVAL_NS = 2_000_000_000
+# nodes of date dirs modified this recently may still be written to
+_ACTIVE_INTERVAL_NS = 24 * 3600 * 1_000_000_000
+# date dirs of one storage scanned concurrently by `scan_storage`
+DEFAULT_SCAN_JOBS = 4
+
+
+class StorageStat(NamedTuple):
+    """Number of nodes with min creation and max modification time of them
+    (None if there are no nodes)."""
+
+    nodes_number: int = 0
+    min_ctime: float | None = None
+    max_mtime: float | None = None
+
+
+class _DirStat(NamedTuple):
+    mtime_ns: int
+    stat: StorageStat
+
+
+def stat_ctime(file_stat: stat_result) -> float:
+    if sys.version_info >= (3, 12) and sys.platform == "win32":
+        return file_stat.st_birthtime
+    return file_stat.st_ctime
+
+
+def is_dir_entry(entry: os.DirEntry[str]) -> bool:
+    # uses d_type from the directory listing, no stat call for most entries
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _merge(stats: Iterable[StorageStat]) -> StorageStat:
+    nodes_number = 0
+    ctimes: list[float] = []
+    mtimes: list[float] = []
+    for stat in stats:
+        nodes_number += stat.nodes_number
+        if stat.min_ctime is not None:
+            ctimes.append(stat.min_ctime)
+        if stat.max_mtime is not None:
+            mtimes.append(stat.max_mtime)
+    return StorageStat(
+        nodes_number,
+        min(ctimes, default=None),
+        max(mtimes, default=None),
+    )
+
+
+def _scan_dir(path: str) -> StorageStat:
+    """Stat of node dirs (`#*`) of one storage subdir (e.g. a date dir)."""
+    nodes_number = 0
+    min_ctime: float | None = None
+    max_mtime: float | None = None
+    try:
+        entries = os.scandir(path)
+    except OSError:
+        return StorageStat()
+    with entries:
+        for entry in entries:
+            if not entry.name.startswith("#") or not is_dir_entry(entry):
+                continue
+            try:
+                entry_stat = entry.stat()
+            except OSError:
+                continue
+            nodes_number += 1
+            ctime = stat_ctime(entry_stat)
+            if min_ctime is None or ctime < min_ctime:
+                min_ctime = ctime
+            if max_mtime is None or entry_stat.st_mtime > max_mtime:
+                max_mtime = entry_stat.st_mtime
+    return StorageStat(nodes_number, min_ctime, max_mtime)
+
+
+def _read_index(index_path: Path, storage_path: Path) -> dict[str, _DirStat]:
+    try:
+        index: Any = json.loads(index_path.read_text())
+        if index["version"] != STATS_INDEX_VERSION:
+            return {}
+        if index["storage"] != os.fspath(storage_path):
+            # storage location of the project was changed
+            return {}
+        return {
+            name: _DirStat(mtime_ns, StorageStat(*stat))
+            for name, (mtime_ns, *stat) in index["dirs"].items()
+        }
+    except (OSError, ValueError, TypeError, KeyError):
+        return {}
+
+
+def _write_index(
+    index_path: Path, storage_path: Path, dirs: dict[str, _DirStat]
+) -> None:
+    index = {
+        "version": STATS_INDEX_VERSION,
+        "storage": os.fspath(storage_path),
+        "dirs": {
+            name: [dir_stat.mtime_ns, *dir_stat.stat]
+            for name, dir_stat in dirs.items()
+        },
+    }
+    # index is only an optimization (e.g. project dir may be read-only)
+    with contextlib.suppress(OSError):
+        atomic_write(index_path, json.dumps(index, separators=(",", ":")))
+
+
+def _list_subdirs(storage_path: Path) -> list[tuple[str, str, int]]:
+    """(name, path, mtime_ns) of subdirs of the storage."""
+    subdirs = []
+    with os.scandir(storage_path) as entries:
+        for entry in entries:
+            if not is_dir_entry(entry):
+                continue
+            try:
+                mtime_ns = entry.stat().st_mtime_ns
+            except OSError:
+                continue
+            subdirs.append((entry.name, entry.path, mtime_ns))
+    return subdirs
+
+
+def scan_storage(
+    storage_path: Path,
+    index_path: Path | None = None,
+    jobs: int | None = None,
+) -> StorageStat:
+    """
+    Stat of node dirs of the storage (`<storage>/<date>/#<id>_<name>`) in
+    one pass. Date dirs are scanned concurrently by `jobs` threads
+    (`DEFAULT_SCAN_JOBS` if not passed), which hides stat latency of network
+    filesystems.
+
+    If `index_path` is passed, the stat of every date dir is saved there
+    with the dir mtime, and only date dirs with changed mtime (nodes added,
+    removed or renamed) are scanned next time. Writing into node dirs
+    doesn't change the mtime of date dirs, so the latest date dir and
+    date dirs modified within the last day, which nodes are usually still
+    written to, are always scanned. Changes inside nodes of older date dirs
+    aren't noticed until nodes of the date dir change.
+    """
+    storage_path = storage_path.absolute()
+    index = {} if index_path is None else _read_index(index_path, storage_path)
+    now = time.time_ns()
+    racy_after = now - _RACY_INTERVAL_NS
+    active_after = now - _ACTIVE_INTERVAL_NS
+    subdirs = _list_subdirs(storage_path)
+    latest = max(
+        subdirs, key=lambda subdir: (subdir[2], subdir[0]), default=None
+    )
+    dirs: dict[str, _DirStat] = {}
+    to_scan: list[tuple[str, str, int]] = []
+    for subdir in subdirs:
+        name, path, mtime_ns = subdir
+        cached = index.get(name)
+        if (
+            cached is not None
+            and cached.mtime_ns == mtime_ns
+            and mtime_ns < active_after
+            and subdir is not latest
+        ):
+            dirs[name] = cached
+        else:
+            to_scan.append((name, path, mtime_ns))
+    jobs = min(jobs or DEFAULT_SCAN_JOBS, len(to_scan))
+    paths = [path for _, path, _ in to_scan]
+    if jobs < 2:
+        scanned = list(map(_scan_dir, paths))
+    else:
+        with ThreadPoolExecutor(
+            max_workers=jobs, thread_name_prefix="qualibrate-storage-scan"
+        ) as executor:
+            scanned = list(executor.map(_scan_dir, paths))
+    for (name, _, mtime_ns), stat in zip(to_scan, scanned, strict=True):
+        # -1 makes the dir rescanned next time
+        dirs[name] = _DirStat(mtime_ns if mtime_ns < racy_after else -1, stat)
+    if index_path is not None and dirs != index:
+        _write_index(index_path, storage_path, dirs)
+    return _merge(dir_stat.stat for dir_stat in dirs.values())
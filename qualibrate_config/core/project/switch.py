@@ -3,24 +3,34 @@ from pathlib import Path
 import click
 
 from qualibrate_config.core.content import get_config_file_content, simple_write
+from qualibrate_config.core.lock import config_lock
 from qualibrate_config.core.project.path import get_project_path
+from qualibrate_config.core.toml_edit import patch_config_file
 from qualibrate_config.vars import QUALIBRATE_CONFIG_KEY
 
 
 def switch_project(
     config_path: Path, project: str, *, raise_if_error: bool = False
 ) -> bool:
-    project_path = get_project_path(config_path.parent, project)
-    if not project_path.exists():
-        error_msg = (
-            f"Can't switch project to '{project}'. "
-            f"There is no specified project in {project_path.parent}."
-        )
-        if raise_if_error:
-            raise ValueError(error_msg)
-        click.secho(error_msg, fg="red")
-        return False
-    common_config, config_file = get_config_file_content(config_path)
-    common_config[QUALIBRATE_CONFIG_KEY]["project"] = project
-    simple_write(config_file, common_config)
-    return True
+    with config_lock(config_path):
+        project_path = get_project_path(config_path.parent, project)
+        if not project_path.exists():
+            error_msg = (
+                f"Can't switch project to '{project}'. "
+                f"There is no specified project in {project_path.parent}."
+            )
+            if raise_if_error:
+                raise ValueError(error_msg)
+            click.secho(error_msg, fg="red")
+            return False
+        common_config, config_file = get_config_file_content(config_path)
+        common_config[QUALIBRATE_CONFIG_KEY]["project"] = project
+        # only the project value is rewritten if possible, whole file if not
+        if not patch_config_file(
+            config_file,
+            (QUALIBRATE_CONFIG_KEY, "project"),
+            project,
+            common_config,
+        ):
+            simple_write(config_file, common_config)
+        return True
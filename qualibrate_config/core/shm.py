@@ -0,0 +1,268 @@
+import hashlib
+import mmap
+import os
+import struct
+import time
+import zlib
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, cast
+
+from qualibrate_config.core.daemon import (
+    ProtocolError,
+    decode_message,
+    encode_message,
+)
+from qualibrate_config.core.snapshot import ConfigSnapshot
+from qualibrate_config.vars import CONFIG_SHM_ENV_NAME
+
+# Readers open segments with `shm_open` of the private `_posixshmem` (used by
+# `SharedMemory` itself): `SharedMemory` maps segments read/write and
+# registers them with the resource tracker, which unlinks them when the
+# reader process exits, so the publisher's segment would be removed.
+try:
+    import _posixshmem  # type: ignore[import-not-found,unused-ignore]
+except ImportError:  # pragma: no cover - not available on Windows
+    _posixshmem = None  # type: ignore[assignment,unused-ignore]
+
+__all__ = [
+    "SharedConfigReader",
+    "SharedConfigSegment",
+    "get_shared_config_name",
+]
+
+# Segment layout: header followed by the encoded snapshot (daemon frame).
+# magic | seq (odd while written) | payload length | payload crc32 | closed |
+# pid of the publisher
+_HEADER = struct.Struct("<8sQQIIQ")
+_MAGIC = b"QCFGSHM1"
+_SEQ_OFFSET = 8
+_MIN_CAPACITY = 64 * 1024
+_READ_ATTEMPTS = 100
+
+
+def get_shared_config_name(config_path: Path) -> str:
+    """Name of the shared config segment. Can be set by env variable."""
+    env_name = os.environ.get(CONFIG_SHM_ENV_NAME)
+    if env_name:
+        return env_name
+    digest = hashlib.blake2b(
+        os.fsencode(config_path.absolute()), digest_size=8
+    ).hexdigest()
+    return f"qualibrate_config_{digest}"
+
+
+def _shm_buf(shm: shared_memory.SharedMemory) -> memoryview:
+    return cast(memoryview, shm.buf)
+
+
+def _map_segment(name: str) -> Any:
+    """Read-only map of the segment (`SharedMemory` on Windows)."""
+    if _posixshmem is None:  # pragma: no cover - Windows
+        return shared_memory.SharedMemory(name)
+    # read-only and not registered, see the import above
+    fd = _posixshmem.shm_open(f"/{name}", os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        return mmap.mmap(fd, size, flags=mmap.MAP_SHARED, prot=mmap.PROT_READ)
+    finally:
+        os.close(fd)
+
+
+def _process_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # process of another user
+        return True
+    return True
+
+
+def _is_stale(name: str) -> bool:
+    """
+    Whether the existing segment is left by a publisher which closed it or
+    isn't running anymore, so it can be removed.
+    """
+    if _posixshmem is None:  # pragma: no cover - Windows
+        # segments are removed with the last handle, so the publisher is alive
+        return False
+    try:
+        map_ = _map_segment(name)
+    except FileNotFoundError:
+        return True
+    except (OSError, ValueError):
+        # e.g. empty segment which is being created by another publisher
+        return False
+    try:
+        if len(map_) < _HEADER.size:
+            return False
+        magic, _, _, _, closed, pid = _HEADER.unpack_from(map_, 0)
+    finally:
+        map_.close()
+    return magic == _MAGIC and (bool(closed) or not _process_alive(pid))
+
+
+class SharedConfigSegment:
+    """
+    Writable shared memory segment with a config snapshot (publisher side).
+
+    Writes are guarded by a seqlock: the sequence number is odd while the
+    payload is written, so readers retry instead of reading a torn payload.
+    If a snapshot doesn't fit, the segment is marked closed, unlinked and
+    created again (with the same name) bigger; readers reopen it. A segment
+    with the same name is replaced only if it's stale (closed or left by a
+    process which isn't running); otherwise `RuntimeError` is raised.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._shm: shared_memory.SharedMemory | None = None
+        self._seq = 0
+
+    @property
+    def capacity(self) -> int:
+        if self._shm is None:
+            return 0
+        return self._shm.size - _HEADER.size
+
+    def _create(self, payload_size: int) -> shared_memory.SharedMemory:
+        capacity = max(_MIN_CAPACITY, 2 * payload_size)
+        try:
+            shm = shared_memory.SharedMemory(
+                self.name, create=True, size=_HEADER.size + capacity
+            )
+        except FileExistsError:
+            if not _is_stale(self.name):
+                raise RuntimeError(
+                    f"Shared config segment '{self.name}' is used by "
+                    "another publisher."
+                ) from None
+            # left by a publisher which wasn't closed properly
+            stale = shared_memory.SharedMemory(self.name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(
+                self.name, create=True, size=_HEADER.size + capacity
+            )
+        _HEADER.pack_into(_shm_buf(shm), 0, _MAGIC, 0, 0, 0, 0, os.getpid())
+        return shm
+
+    def write(self, snapshot: ConfigSnapshot) -> None:
+        payload = encode_message(snapshot.to_wire())
+        if self._shm is None or len(payload) > self.capacity:
+            self._close(unlink=True)
+            self._shm = self._create(len(payload))
+        buf = _shm_buf(self._shm)
+        self._seq += 1
+        struct.pack_into("<Q", buf, _SEQ_OFFSET, self._seq)
+        buf[_HEADER.size : _HEADER.size + len(payload)] = payload
+        self._seq += 1
+        _HEADER.pack_into(
+            buf,
+            0,
+            _MAGIC,
+            self._seq,
+            len(payload),
+            zlib.crc32(payload),
+            0,
+            os.getpid(),
+        )
+
+    def _close(self, unlink: bool) -> None:
+        shm, self._shm = self._shm, None
+        if shm is None:
+            return
+        # readers which keep the segment mapped reopen it by name
+        _HEADER.pack_into(
+            _shm_buf(shm), 0, _MAGIC, self._seq, 0, 0, 1, os.getpid()
+        )
+        shm.close()
+        if unlink:
+            shm.unlink()
+
+    def close(self) -> None:
+        """Mark the segment closed and remove it."""
+        self._close(unlink=True)
+
+
+class SharedConfigReader:
+    """
+    Read-only view of a shared config segment.
+
+    The segment is mapped once and the snapshot is decoded only when the
+    publisher has written a new one; otherwise only the header is read.
+    `read` returns None if there's no (complete) snapshot.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._map: Any = None
+        self._seq = -1
+        self._snapshot: ConfigSnapshot | None = None
+
+    def _open(self) -> bool:
+        try:
+            self._map = _map_segment(self.name)
+        except (OSError, ValueError):
+            self._map = None
+            return False
+        self._seq = -1
+        return True
+
+    @property
+    def _buf(self) -> Any:
+        return self._map.buf if hasattr(self._map, "buf") else self._map
+
+    def _read_payload(self) -> tuple[int, bytes | None] | None:
+        """(seq, payload) of a consistent state. Payload is None if seq is
+        unchanged since the last decoded snapshot."""
+        buf = self._buf
+        for _ in range(_READ_ATTEMPTS):
+            magic, seq, length, crc, closed, _ = _HEADER.unpack_from(buf, 0)
+            if magic != _MAGIC or closed or seq == 0:
+                return None
+            if seq % 2:
+                time.sleep(0)
+                continue
+            if seq == self._seq:
+                return seq, None
+            payload = bytes(buf[_HEADER.size : _HEADER.size + length])
+            if _HEADER.unpack_from(buf, 0)[1] == seq and (
+                zlib.crc32(payload) == crc
+            ):
+                return seq, payload
+        return None
+
+    def read(self) -> ConfigSnapshot | None:
+        if self._map is None and not self._open():
+            return None
+        state = self._read_payload()
+        if state is None:
+            # maybe the segment was recreated by the publisher
+            self.close()
+            if not self._open():
+                return None
+            state = self._read_payload()
+            if state is None:
+                return None
+        seq, payload = state
+        if payload is None:
+            return self._snapshot
+        try:
+            message = decode_message(payload[4:])
+            snapshot = ConfigSnapshot.from_wire(message)
+        except (ProtocolError, KeyError, TypeError, ValueError):
+            return None
+        self._seq, self._snapshot = seq, snapshot
+        return snapshot
+
+    def close(self) -> None:
+        map_, self._map = self._map, None
+        self._seq = -1
+        self._snapshot = None
+        if map_ is not None:
+            map_.close()
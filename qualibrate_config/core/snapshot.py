@@ -0,0 +1,77 @@
+import base64
+import binascii
+import zlib
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from qualibrate_config.core import wire
+from qualibrate_config.core.fingerprint import (
+    FileFingerprint,
+    files_fingerprint,
+)
+from qualibrate_config.qulibrate_types import RawConfigType
+
+__all__ = ["ConfigSnapshot", "MAX_ENV_SNAPSHOT_SIZE", "SnapshotFiles"]
+
+# Linux limits a single environment string to 128 KiB
+MAX_ENV_SNAPSHOT_SIZE = 96 * 1024
+
+SnapshotFiles = tuple[tuple[Path, FileFingerprint], ...]
+
+
+def _fingerprint_from_wire(value: list[int] | None) -> FileFingerprint:
+    if value is None:
+        return None
+    ino, size, mtime_ns, ctime_ns = value
+    return ino, size, mtime_ns, ctime_ns
+
+
+class ConfigSnapshot(NamedTuple):
+    """
+    Config (with the project overlay applied) shared with other processes
+    together with fingerprints of the files it was built from.
+    """
+
+    version: int
+    config_path: Path
+    files: SnapshotFiles
+    data: RawConfigType
+
+    def is_current(self) -> bool:
+        """Whether files the snapshot was built from are unchanged."""
+        paths = [path for path, _ in self.files]
+        return files_fingerprint(paths) == tuple(fp for _, fp in self.files)
+
+    def to_wire(self) -> dict[str, Any]:
+        return {
+            "version": self.version,
+            "config_path": str(self.config_path),
+            "files": [(str(path), fp) for path, fp in self.files],
+            "data": self.data,
+        }
+
+    @classmethod
+    def from_wire(cls, message: dict[str, Any]) -> "ConfigSnapshot":
+        return cls(
+            version=message["version"],
+            config_path=Path(message["config_path"]),
+            files=tuple(
+                (Path(path), _fingerprint_from_wire(fp))
+                for path, fp in message["files"]
+            ),
+            data=message["data"],
+        )
+
+    def to_env(self) -> str:
+        """Compact ASCII form (compressed `core.wire` JSON) for env vars."""
+        payload = zlib.compress(wire.dumps(self.to_wire()), 6)
+        return base64.urlsafe_b64encode(payload).decode("ascii")
+
+    @classmethod
+    def from_env(cls, value: str) -> "ConfigSnapshot":
+        """Raises ValueError for invalid value."""
+        try:
+            payload = zlib.decompress(base64.urlsafe_b64decode(value))
+            return cls.from_wire(wire.loads(payload))
+        except (binascii.Error, zlib.error, KeyError, TypeError) as ex:
+            raise ValueError(f"Invalid config snapshot: {ex}") from ex
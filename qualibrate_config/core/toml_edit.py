@@ -0,0 +1,251 @@
+import os
+import re
+import sys
+import tempfile
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import Any
+
+import tomli_w
+
+from qualibrate_config.core.lock import config_lock
+from qualibrate_config.core.toml_tables import (
+    find_table_headers,
+    parse_header_keys,
+)
+from qualibrate_config.qulibrate_types import RawConfigType
+
+if sys.version_info[:2] < (3, 11):
+    import tomli as tomllib  # type: ignore[unused-ignore,import-not-found]
+else:
+    import tomllib
+
+__all__ = [
+    "set_value_in_document",
+    "patch_config_file",
+    "patch_config_values",
+    "atomic_write",
+]
+
+_SCALAR_TYPES = (str, bool, int, float, datetime, date, time)
+_MISSING = object()
+_BARE_KEY_RE = re.compile(r"[A-Za-z0-9_-]+")
+# single-line scalar value followed by optional comment
+_VALUE_RE = re.compile(
+    r"""
+    (?P<value>
+        "(?!"")(?:[^"\\\n]|\\.)*"
+        | '(?!'')[^'\n]*'
+        | [^\s\#,\[\]{}"']+
+    )
+    [ \t]*(?:\#.*)?$
+    """,
+    re.MULTILINE | re.VERBOSE,
+)
+
+
+def _format_key(key: str) -> str:
+    if _BARE_KEY_RE.fullmatch(key):
+        return key
+    return tomli_w.dumps({key: 0}).rsplit(" = ", 1)[0]
+
+
+def _format_scalar(value: Any) -> str | None:
+    if not isinstance(value, _SCALAR_TYPES):
+        return None
+    line = tomli_w.dumps({"v": value})
+    if line.count("\n") != 1:
+        return None
+    return line[len("v = ") : -1]
+
+
+def _key_re(key: str) -> re.Pattern[str]:
+    names = [re.escape(key), re.escape(_format_key(key))]
+    return re.compile(
+        rf"^[ \t]*(?:{'|'.join(dict.fromkeys(names))})[ \t]*=[ \t]*",
+        re.MULTILINE,
+    )
+
+
+def _table_body(data: str, table: Sequence[str]) -> tuple[int, int] | None:
+    """Offsets of the body of the standard table `table` (root if empty)."""
+    headers = find_table_headers(data)
+    if headers is None:
+        return None
+    if not table:
+        return 0, headers[0].start if headers else len(data)
+    for i, header in enumerate(headers):
+        if header.key != table[0]:
+            continue
+        line = data[header.start : header.end]
+        if line.lstrip().startswith("[["):
+            continue
+        if parse_header_keys(line) != list(table):
+            continue
+        end = headers[i + 1].start if i + 1 < len(headers) else len(data)
+        return header.end, end
+    return None
+
+
+def set_value_in_document(
+    data: str, keys: Sequence[str], value: Any
+) -> str | None:
+    """
+    Set scalar value of `keys` in TOML text, keeping everything else as is.
+
+    Only the value is replaced if the key is defined in the table; the key
+    is appended to the table otherwise. Returns None if it can't be done
+    textually (no such table, non-scalar value, multiline value, etc.).
+    The result isn't verified here, see `patch_config_file`.
+    """
+    if not keys:
+        return None
+    formatted = _format_scalar(value)
+    if formatted is None:
+        return None
+    *table, key = keys
+    body = _table_body(data, table)
+    if body is None:
+        return None
+    start, end = body
+    key_match = _key_re(key).search(data, start, end)
+    if key_match is not None:
+        value_match = _VALUE_RE.match(data, key_match.end(), end)
+        if value_match is None:
+            return None
+        value_start, value_end = value_match.span("value")
+        return data[:value_start] + formatted + data[value_end:]
+    # append after the last non-blank line of the table
+    insert_at = start + len(data[start:end].rstrip())
+    line = f"{_format_key(key)} = {formatted}\n"
+    if insert_at == 0:
+        return line + data
+    newline = data.find("\n", insert_at)
+    if newline == -1 or newline >= end:
+        return data[:insert_at] + "\n" + line + data[insert_at:]
+    return data[: newline + 1] + line + data[newline + 1 :]
+
+
+def atomic_write(path: Path, data: str) -> None:
+    """Write file through a temporary file and rename."""
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f_out:
+            f_out.write(data)
+            f_out.flush()
+            os.fsync(f_out.fileno())
+        if path.exists():
+            os.chmod(tmp_path, path.stat().st_mode & 0o7777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _changed_values(
+    current: Mapping[str, Any],
+    expected: Mapping[str, Any],
+    prefix: tuple[str, ...] = (),
+) -> list[tuple[tuple[str, ...], Any]] | None:
+    """
+    (keys, value) of values of `expected` which differ from `current`.
+    None if the change isn't only setting values of existing tables (keys or
+    tables are removed, tables are added or replaced).
+    """
+    if any(key not in expected for key in current):
+        return None
+    changes: list[tuple[tuple[str, ...], Any]] = []
+    for key, value in expected.items():
+        keys = (*prefix, key)
+        current_value = current.get(key, _MISSING)
+        if isinstance(value, Mapping) or isinstance(current_value, Mapping):
+            if not (
+                isinstance(value, Mapping)
+                and isinstance(current_value, Mapping)
+            ):
+                return None
+            nested = _changed_values(current_value, value, keys)
+            if nested is None:
+                return None
+            changes.extend(nested)
+        # 1 and True (or 1 and 1.0) are different values in a config file
+        elif type(value) is not type(current_value) or value != current_value:
+            changes.append((keys, value))
+    return changes
+
+
+def _patch_document(
+    data: str,
+    changes: Sequence[tuple[Sequence[str], Any]],
+    expected: RawConfigType,
+) -> str | None:
+    """Document with `changes` set if it's parsed back to `expected`."""
+    for keys, value in changes:
+        patched = set_value_in_document(data, keys, value)
+        if patched is None:
+            return None
+        data = patched
+    try:
+        if tomllib.loads(data) != expected:
+            return None
+    except tomllib.TOMLDecodeError:
+        return None
+    return data
+
+
+def patch_config_file(
+    config_file: Path,
+    keys: Sequence[str],
+    value: Any,
+    expected: RawConfigType,
+) -> bool:
+    """
+    Set value of `keys` in the config file in place.
+
+    `expected` is the whole config after the change. The patched text is
+    parsed back and written (atomically) only if it matches; otherwise
+    nothing is written and False is returned, so the caller can fall back
+    to dumping `expected`.
+    """
+    with config_lock(config_file):
+        if not config_file.is_file():
+            return False
+        data = config_file.read_text(encoding="utf-8")
+        patched = _patch_document(data, [(keys, value)], expected)
+        if patched is None:
+            return False
+        atomic_write(config_file, patched)
+    return True
+
+
+def patch_config_values(config_file: Path, expected: RawConfigType) -> bool:
+    """
+    Make the config file content equal to `expected` by setting only the
+    changed values in place, like `patch_config_file` does for one value.
+
+    Returns False (and writes nothing) if it can't be done this way, e.g.
+    keys or tables are removed or tables are added; the caller falls back
+    to dumping `expected` then. Nothing is written if nothing is changed.
+    """
+    with config_lock(config_file):
+        if not config_file.is_file():
+            return False
+        data = config_file.read_text(encoding="utf-8")
+        try:
+            current = tomllib.loads(data)
+        except tomllib.TOMLDecodeError:
+            return False
+        changes = _changed_values(current, expected)
+        if changes is None:
+            return False
+        if not changes:
+            return True
+        patched = _patch_document(data, changes, expected)
+        if patched is None:
+            return False
+        atomic_write(config_file, patched)
+    return True
@@ -0,0 +1,255 @@
+import re
+import sys
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from qualibrate_config.qulibrate_types import RawConfigType
+
+if sys.version_info[:2] < (3, 11):
+    import tomli as tomllib  # type: ignore[unused-ignore,import-not-found]
+else:
+    import tomllib
+
+__all__ = [
+    "TableHeader",
+    "TomlTables",
+    "find_table_headers",
+    "split_top_level_tables",
+    "loads_tables",
+    "parse_header_keys",
+]
+
+_BARE_KEY_RE = re.compile(r"[A-Za-z0-9_-]+")
+_BASIC_STRING_TAIL_RE = re.compile(r'(?:[^"\\]|\\.)*"')
+_MULTILINE_END_RE = {
+    '"""': re.compile(r'\\[\s\S]|"""'),
+    "'''": re.compile("'''"),
+}
+
+# Fast path: lines that can't start a table or hide a line starting with
+# `[` (plain scalars, one-line strings, arrays of those up to two levels
+# deep, even spanning lines) are consumed in bulk by the regex engine.
+_STRING = r"""(?:"(?!"")(?:[^"\\\n]|\\.)*"|'(?!'')[^'\n]*')"""
+_ARRAY_ITEM = rf"""(?:[^\[\]"'\#]|{_STRING}|\#.*)"""
+_FLAT_ARRAY = rf"\[{_ARRAY_ITEM}*\]"
+_ARRAY = rf"\[(?:{_ARRAY_ITEM}|{_FLAT_ARRAY})*\]"
+_PLAIN_LINE = (
+    rf"""(?![ \t]*\[)(?:[^\n"'\#\[\]]|{_STRING}|{_ARRAY})*(?:\#.*)?\n"""
+)
+_PLAIN_LINES_RE = re.compile(f"(?:{_PLAIN_LINE})*")
+_BARE_HEADER_LINE_RE = re.compile(
+    r"[ \t]*\[\[?[ \t]*(?P<key>[A-Za-z0-9_-]+)[ \t]*[.\]].*"
+)
+# Slow path, token by token, for everything else
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<newline>\n)
+    | ^[ \t]*(?P<header>\[)
+    | (?P<multiline>"{3}|'{3})
+    | "(?:[^"\\\n]|\\.)*"
+    | '[^'\n]*'
+    | \#[^\n]*
+    | (?P<open>\[)
+    | (?P<close>\])
+    | (?P<unterminated>["'])
+    """,
+    re.MULTILINE | re.VERBOSE,
+)
+
+
+class TableHeader(NamedTuple):
+    """
+    Table header line: first key of the header, offsets of the line start
+    and of the line end (without the newline).
+    """
+
+    key: str
+    start: int
+    end: int
+
+
+class TomlTables(NamedTuple):
+    """
+    TOML document split by top-level keys.
+
+    `prelude` is everything before the first table header (root key/value
+    pairs). `tables` maps each top-level key to its sections (header line
+    and body) in document order.
+    """
+
+    prelude: str
+    tables: dict[str, list[str]]
+
+
+def _skip_basic_string(line: str, i: int) -> int:
+    """Index after closing quote of basic string opened at `i - 1`."""
+    match = _BASIC_STRING_TAIL_RE.match(line, i)
+    if match is None:
+        raise ValueError("Unterminated string")
+    return match.end()
+
+
+def parse_header_keys(header: str) -> list[str] | None:
+    """
+    Keys of a table header line (`[a.b]` or `[[a."b.c"]]`). Returns None if
+    the line isn't a header.
+    """
+    text = header.strip()
+    if not text.startswith("["):
+        return None
+    i = 2 if text.startswith("[[") else 1
+    keys: list[str] = []
+    n = len(text)
+    while True:
+        while i < n and text[i] in " \t":
+            i += 1
+        if i >= n:
+            return None
+        if text[i] == '"':
+            try:
+                end = _skip_basic_string(text, i + 1)
+            except ValueError:
+                return None
+            raw = text[i:end]
+            keys.append(next(iter(tomllib.loads(f"{raw} = 0"))))
+            i = end
+        elif text[i] == "'":
+            end = text.find("'", i + 1)
+            if end == -1:
+                return None
+            keys.append(text[i + 1 : end])
+            i = end + 1
+        else:
+            match = _BARE_KEY_RE.match(text, i)
+            if match is None:
+                return None
+            keys.append(match.group())
+            i = match.end()
+        while i < n and text[i] in " \t":
+            i += 1
+        if i < n and text[i] == ".":
+            i += 1
+            continue
+        if i < n and text[i] == "]":
+            return keys
+        return None
+
+
+def _multiline_string_end(data: str, delimiter: str, start: int) -> int:
+    """Index after the multiline string closed by `delimiter`."""
+    end_re = _MULTILINE_END_RE[delimiter]
+    while True:
+        match = end_re.search(data, start)
+        if match is None:
+            raise ValueError("Unterminated multiline string")
+        start = match.end()
+        if match.group()[0] != "\\":
+            break
+    # up to two quotes adjacent to the delimiter are content
+    for _ in range(2):
+        if data.startswith(delimiter[0], start):
+            start += 1
+    return start
+
+
+def find_table_headers(data: str) -> list[TableHeader] | None:
+    """
+    Find table header lines of a TOML document without parsing values.
+
+    Returns None if the document can't be scanned reliably (it's invalid or
+    uses constructs the scanner doesn't track).
+    """
+    headers: list[TableHeader] = []
+    depth = 0
+    pos = 0
+    n = len(data)
+    try:
+        while pos < n:
+            plain = _PLAIN_LINES_RE.match(data, pos)
+            assert plain is not None  # matches empty string at least
+            pos = plain.end()
+            header = _BARE_HEADER_LINE_RE.match(data, pos)
+            if header is not None:
+                headers.append(
+                    TableHeader(header.group("key"), pos, header.end())
+                )
+                pos = header.end()
+                continue
+            while (match := _TOKEN_RE.search(data, pos)) is not None:
+                pos = match.end()
+                kind = match.lastgroup
+                if kind == "newline":
+                    if depth == 0:
+                        break
+                elif kind == "header" and depth == 0:
+                    line_end = data.find("\n", pos)
+                    if line_end == -1:
+                        line_end = n
+                    keys = parse_header_keys(data[match.start() : line_end])
+                    if keys is None:
+                        return None
+                    headers.append(
+                        TableHeader(keys[0], match.start(), line_end)
+                    )
+                    pos = line_end
+                elif kind == "multiline":
+                    pos = _multiline_string_end(data, match.group(), pos)
+                elif kind in ("header", "open"):
+                    depth += 1
+                elif kind == "close":
+                    depth -= 1
+                    if depth < 0:
+                        return None
+                elif kind == "unterminated":
+                    return None
+            else:
+                break
+    except ValueError:
+        return None
+    if depth:
+        return None
+    return headers
+
+
+def split_top_level_tables(data: str) -> TomlTables | None:
+    """
+    Split a TOML document on table headers without parsing values.
+
+    Returns None if the document can't be split reliably; callers should
+    parse it as a whole then.
+    """
+    headers = find_table_headers(data)
+    if headers is None:
+        return None
+    tables: dict[str, list[str]] = {}
+    bounds = [header.start for header in headers[1:]] + [len(data)]
+    for header, end in zip(headers, bounds, strict=True):
+        tables.setdefault(header.key, []).append(data[header.start : end])
+    prelude = data[: headers[0].start] if headers else data
+    return TomlTables(prelude, tables)
+
+
+def _join(parts: Iterable[str]) -> str:
+    result: list[str] = []
+    for part in parts:
+        if result and not result[-1].endswith("\n"):
+            result.append("\n")
+        result.append(part)
+    return "".join(result)
+
+
+def loads_tables(tables: TomlTables, keys: Iterable[str]) -> RawConfigType:
+    """Parse root key/value pairs and the sections of the given keys."""
+    config: RawConfigType = tomllib.loads(
+        _join(
+            [
+                tables.prelude,
+                *(
+                    chunk
+                    for key in dict.fromkeys(keys)
+                    for chunk in tables.tables.get(key, ())
+                ),
+            ]
+        )
+    )
+    return config
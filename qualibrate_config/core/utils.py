@@ -1,3 +1,5 @@
+import sys
+import types
 from collections.abc import Callable, Iterable, Mapping
 from typing import Any, Protocol, TypeVar, overload
 
@@ -99,3 +101,37 @@ def _minmax(
     elif k > max_key:
         max_elem, max_key = elem, k
     return min_key, max_key, min_elem, max_elem
+
+
+# shared by all configs, not owned by them
+_NOT_COUNTED = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+)
+
+
+def approximate_size(value: Any) -> int:
+    """
+    Approximate memory size of an object graph in bytes: `sys.getsizeof` of
+    the object, items of containers and attributes of objects (shared and
+    recursive objects are counted once).
+    """
+    seen: set[int] = set()
+    total = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _NOT_COUNTED):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, Mapping):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, list | tuple | set | frozenset):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            stack.append(vars(obj))
+    return total
@@ -0,0 +1,42 @@
+import datetime
+import json
+from typing import Any
+
+__all__ = ["dumps", "loads"]
+
+# Compact JSON. TOML date/time values are stored as
+# {"$t": <type>, "v": <iso string>}.
+_TAG_KEY = "$t"
+_TIME_TYPES: dict[str, Any] = {
+    "datetime": datetime.datetime,
+    "date": datetime.date,
+    "time": datetime.time,
+}
+
+
+def _encode_special(value: Any) -> dict[str, str]:
+    # datetime is checked before date as it's a subclass
+    for name in ("datetime", "date", "time"):
+        if isinstance(value, _TIME_TYPES[name]):
+            return {_TAG_KEY: name, "v": value.isoformat()}
+    raise TypeError(f"Can't encode {type(value).__name__}")
+
+
+def _decode_special(obj: dict[str, Any]) -> Any:
+    if len(obj) == 2 and obj.get(_TAG_KEY) in _TIME_TYPES and "v" in obj:
+        return _TIME_TYPES[obj[_TAG_KEY]].fromisoformat(obj["v"])
+    return obj
+
+
+def dumps(value: Any) -> bytes:
+    return json.dumps(
+        value,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_encode_special,
+    ).encode()
+
+
+def loads(data: bytes | str) -> Any:
+    """Raises ValueError for invalid data."""
+    return json.loads(data, object_hook=_decode_special)
@@ -1,13 +1,31 @@
 import sys
+from collections.abc import Iterable
 from pathlib import Path
 
+import jsonpointer
+
+from qualibrate_config.core.layered import LayeredConfig
+from qualibrate_config.core.lock import config_lock
+from qualibrate_config.core.overrides import (
+    EnvOverrideItems,
+    apply_env_overrides,
+    env_override_items,
+    env_overrides,
+)
 from qualibrate_config.core.project.common import (
     get_project_from_common_config,
     read_project_config_file,
 )
+from qualibrate_config.core.toml_tables import (
+    loads_tables,
+    split_top_level_tables,
+)
 from qualibrate_config.core.utils import recursive_update_dict
 from qualibrate_config.qulibrate_types import RawConfigType
-from qualibrate_config.references.resolvers import resolve_references
+from qualibrate_config.references.resolvers import (
+    find_all_references,
+    resolve_references,
+)
 from qualibrate_config.vars import (
     DEFAULT_CONFIG_FILENAME,
     QUALIBRATE_CONFIG_KEY,
@@ -57,20 +75,123 @@ def get_config_file(
     return config_path_
 
 
+def _active_project(
+    config: RawConfigType,
+    overrides: RawConfigType,
+    override_project: str | None,
+) -> str | None:
+    return (
+        override_project
+        or get_project_from_common_config(overrides)
+        or get_project_from_common_config(config)
+    )
+
+
+def apply_project_config(
+    config: RawConfigType,
+    config_file: Path,
+    override_project: str | None = None,
+    override_items: EnvOverrideItems | None = None,
+) -> RawConfigType:
+    """
+    Merge overlay of the active (or overridden) project into config and then
+    values set by `QUALIBRATE__*` environment variables (see
+    `core.overrides`). The project can be set by environment too.
+    `override_items` are used instead of variables of the environment if
+    passed (empty to merge only the files).
+    """
+    items = env_override_items() if override_items is None else override_items
+    project = _active_project(config, env_overrides(items), override_project)
+    if project:
+        project_config = read_project_config_file(config_file, project)
+        config = recursive_update_dict(config, project_config)
+    config = apply_env_overrides(config, items)
+    if project:
+        config.setdefault(QUALIBRATE_CONFIG_KEY, {})["project"] = project
+    return config
+
+
+def project_config_view(
+    config: RawConfigType,
+    config_file: Path,
+    override_project: str | None = None,
+    project_config: RawConfigType | None = None,
+) -> LayeredConfig:
+    """
+    Config with overlay of the active (or overridden) project and
+    environment overrides merged as `apply_project_config` does, but without
+    modifying or copying `config`, so one parsed base config can be shared
+    by many projects. Pass already read `project_config` (overlay of the
+    project) to not read it again; it isn't modified either.
+    """
+    overrides = env_overrides()
+    project = _active_project(config, overrides, override_project)
+    if not project:
+        return LayeredConfig(overrides, config)
+    if project_config is None:
+        project_config = read_project_config_file(config_file, project)
+    return LayeredConfig(
+        {QUALIBRATE_CONFIG_KEY: {"project": project}},
+        overrides,
+        project_config,
+        config,
+    )
+
+
 def read_config_file(
     config_file: Path,
     solve_references: bool = True,
     override_project: str | None = None,
+    apply_project: bool = True,
 ) -> RawConfigType:
     # TODO: second location of tomllib.loads
-    with config_file.open("rb") as fin:
-        config: RawConfigType = tomllib.load(fin)  # typing for mypy tomli
-    if project := (override_project or get_project_from_common_config(config)):
-        project_config = read_project_config_file(config_file, project)
-        project_config.setdefault(QUALIBRATE_CONFIG_KEY, {})["project"] = (
-            project
-        )
-        config = recursive_update_dict(config, project_config)
+    with config_lock(config_file, shared=True):
+        with config_file.open("rb") as fin:
+            config: RawConfigType = tomllib.load(fin)  # typing for mypy tomli
+        if apply_project:
+            config = apply_project_config(config, config_file, override_project)
     if not solve_references:
         return config
     return resolve_references(config)
+
+
+def _referenced_top_level_keys(config: RawConfigType) -> set[str]:
+    return {
+        jsonpointer.JsonPointer(ref.reference_path).parts[0]
+        for ref in find_all_references(config)
+        if ref.reference_path.startswith("/") and ref.reference_path != "/"
+    }
+
+
+def read_config_tables(
+    config_file: Path,
+    keys: Iterable[str],
+    override_project: str | None = None,
+) -> RawConfigType:
+    """
+    Read only some top-level tables of the config file (with the project
+    overlay applied, references not solved).
+
+    Table boundaries are found in the raw text and only root key/values,
+    the requested tables, the `qualibrate` table (needed to find the active
+    project) and tables referenced from them are parsed. Sections that
+    aren't loaded aren't validated. Falls back to a full parse if the
+    document can't be split reliably.
+    """
+    with config_lock(config_file, shared=True):
+        data = config_file.read_text()
+        tables = split_top_level_tables(data)
+        if tables is None:
+            config: RawConfigType = tomllib.loads(data)
+            return apply_project_config(config, config_file, override_project)
+        wanted = {*keys, QUALIBRATE_CONFIG_KEY}
+        while True:
+            config = apply_project_config(
+                loads_tables(tables, sorted(wanted)),
+                config_file,
+                override_project,
+            )
+            referenced = _referenced_top_level_keys(config) & set(tables.tables)
+            if referenced <= wanted:
+                return config
+            wanted |= referenced
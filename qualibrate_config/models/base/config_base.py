@@ -52,7 +52,9 @@ class BaseConfig:
         self._data: RawConfigType = {}
         self._annotations = self.get_config_annotations()
         self._raw_dict: RawConfigType = {}
-        self.__class__._root = root or self
+        # per instance, so several live configs don't share references root
+        self._root_config: BaseConfig = root or self
+        self.__class__._root = self._root_config
 
         for key, value_type_default in self._annotations.items():
             value_type = (
@@ -95,11 +97,8 @@ class BaseConfig:
             raise ValueError(f"Attribute {attr_name} has no reference")
         return resolve_single_item(self._get_root()._data, reference)
 
-    @classmethod
-    def _get_root(cls) -> "BaseConfig":
-        if cls._root is None:
-            raise RuntimeError("Root can't be None")
-        return cls._root
+    def _get_root(self) -> "BaseConfig":
+        return self._root_config
 
     def _parse_type_origin(
         self, key: str, value: Any, expected_type: type
@@ -264,8 +263,6 @@ class BaseConfig:
             )
         value = data[name]
         if self._is_reference(value):
-            if self.__class__._root is None:
-                raise ValueError("Root shouldn't be None")
             raw_dict = self._get_root()._raw_dict
             return resolve_single_item(raw_dict, value)
         annotation_with_default = annotations[name]
@@ -327,4 +324,5 @@ ConfigBaseDir = (
     "_data",
     "_annotations",
     "_raw_dict",
+    "_root_config",
 )
@@ -0,0 +1,133 @@
+import logging
+from collections.abc import Callable
+from pathlib import Path
+from types import TracebackType
+
+from qualibrate_config.core.shm import (
+    SharedConfigSegment,
+    get_shared_config_name,
+)
+from qualibrate_config.models import QualibrateConfig
+from qualibrate_config.resolvers import (
+    get_qualibrate_config_path,
+    read_config_snapshot,
+)
+from qualibrate_config.watcher import ConfigWatcher
+
+__all__ = ["SharedConfigPublisher"]
+
+logger = logging.getLogger(__name__)
+
+
+class SharedConfigPublisher:
+    """
+    Publishes the config (with the project overlay applied) into a shared
+    memory segment.
+
+    Processes on the host (e.g. workers of a process pool started by the
+    publishing process) get the config in `get_qualibrate_config` from the
+    segment instead of reading and parsing the files. Readers check the
+    fingerprints of the files the snapshot was built from and read the files
+    themselves if it's outdated or there's no snapshot.
+
+    Args:
+        config_path: Path to the config file. Resolved like
+            `get_qualibrate_config` does if not passed.
+        name: Segment name. Derived from the config path if not passed (or
+            the name from `QUALIBRATE_CONFIG_SHM`).
+        watch: Republish on config changes (see `ConfigWatcher`).
+        debounce: Passed to `ConfigWatcher`.
+        poll_interval: Passed to `ConfigWatcher`.
+        use_inotify: Passed to `ConfigWatcher`.
+    """
+
+    def __init__(
+        self,
+        config_path: Path | None = None,
+        name: str | None = None,
+        *,
+        watch: bool = True,
+        debounce: float = 0.2,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True,
+    ) -> None:
+        self._config_path = (
+            config_path or get_qualibrate_config_path()
+        ).absolute()
+        self._segment = SharedConfigSegment(
+            name or get_shared_config_name(self._config_path)
+        )
+        self._watcher = (
+            ConfigWatcher(
+                self._config_path,
+                debounce=debounce,
+                poll_interval=poll_interval,
+                use_inotify=use_inotify,
+            )
+            if watch
+            else None
+        )
+        self._unsubscribe: Callable[[], None] | None = None
+        self._version = 0
+
+    @property
+    def name(self) -> str:
+        return self._segment.name
+
+    @property
+    def config_path(self) -> Path:
+        return self._config_path
+
+    @property
+    def version(self) -> int:
+        """Version of the last published snapshot."""
+        return self._version
+
+    def publish(self) -> bool:
+        """
+        Publish the current config. If it can't be published (e.g. it's
+        invalid) the segment is removed, so readers use the files.
+
+        Raises:
+            RuntimeError: The segment is used by another publisher.
+        """
+        try:
+            snapshot = read_config_snapshot(
+                self._config_path, self._version + 1
+            )
+        except Exception as ex:
+            logger.warning(f"Can't publish config {self._config_path}: {ex}")
+            self._segment.close()
+            return False
+        self._segment.write(snapshot)
+        self._version = snapshot.version
+        return True
+
+    def _on_reload(self, _: QualibrateConfig) -> None:
+        self.publish()
+
+    def start(self) -> "SharedConfigPublisher":
+        if self._watcher is not None and self._unsubscribe is None:
+            self._watcher.start()
+            self._unsubscribe = self._watcher.subscribe(self._on_reload)
+        self.publish()
+        return self
+
+    def stop(self) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._watcher is not None:
+            self._watcher.stop()
+        self._segment.close()
+
+    def __enter__(self) -> "SharedConfigPublisher":
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.stop()
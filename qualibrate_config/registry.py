@@ -0,0 +1,169 @@
+from collections.abc import Hashable
+from functools import partial
+from pathlib import Path
+from typing import NamedTuple
+
+from qualibrate_config.core.cache import ConfigCache
+from qualibrate_config.core.overrides import env_override_items
+from qualibrate_config.core.project.path import get_project_config_path
+from qualibrate_config.core.utils import approximate_size
+from qualibrate_config.models import QualibrateConfig
+from qualibrate_config.qulibrate_types import RawConfigType
+from qualibrate_config.resolvers import load_qualibrate_config
+
+__all__ = ["ConfigRegistry", "RegistryStats"]
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_MEMORY = 64 * 1024 * 1024
+
+
+class RegistryStats(NamedTuple):
+    entries: int
+    memory: int
+    hits: int
+    misses: int
+    evictions: int
+    max_entries: int | None
+    max_memory: int | None
+
+
+def _config_size(config: QualibrateConfig) -> int:
+    # the whole model tree is reachable from the root config
+    return approximate_size(config._get_root())
+
+
+class ConfigRegistry:
+    """
+    Bounded set of loaded configs of many config files (e.g. of different
+    users) in one process.
+
+    Configs are keyed by resolved config file path, project (None for the
+    active one), environment overrides and `auto_migrate`. A config is
+    reloaded when the config file or the project overlay changes. Least
+    recently used configs are evicted when there're more than `max_entries`
+    of them or their approximate memory size is above `max_memory`. Unlike
+    `get_qualibrate_config`, neither configs nor parsed base config files
+    (shared by projects of one file) are put into module level caches; base
+    config files are kept by the registry too, at most `max_entries` of
+    them.
+
+    Args:
+        max_entries: Max number of configs. None means unlimited.
+        max_memory: Approximate memory budget in bytes. None means
+            unlimited.
+        ttl: Max age of a config in seconds. None means configs are
+            reloaded only when files change.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = DEFAULT_MAX_ENTRIES,
+        max_memory: int | None = DEFAULT_MAX_MEMORY,
+        ttl: float | None = None,
+    ) -> None:
+        self._cache: ConfigCache[QualibrateConfig] = ConfigCache(
+            ttl=ttl,
+            max_entries=max_entries,
+            max_size=max_memory,
+            sizeof=_config_size,
+        )
+        self._base_configs: ConfigCache[RawConfigType] = ConfigCache(
+            ttl=ttl, max_entries=max_entries
+        )
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __contains__(self, key: tuple[Path, str | None]) -> bool:
+        """Whether the config is registered as `get` loads it by default."""
+        path, project = key
+        return self._key(path.resolve(), project, True) in self._cache
+
+    @staticmethod
+    def _key(path: Path, project: str | None, auto_migrate: bool) -> Hashable:
+        # configs migrated in memory aren't returned without auto migration
+        return path, project, env_override_items(), auto_migrate
+
+    @property
+    def stats(self) -> RegistryStats:
+        stats = self._cache.stats
+        return RegistryStats(
+            entries=stats.entries,
+            memory=stats.size,
+            hits=stats.hits,
+            misses=stats.misses,
+            evictions=stats.evictions,
+            max_entries=self._cache.max_entries,
+            max_memory=self._cache.max_size,
+        )
+
+    def get(
+        self,
+        config_path: Path,
+        project: str | None = None,
+        *,
+        auto_migrate: bool = True,
+        persist_migration: bool = True,
+        refresh: bool = False,
+    ) -> QualibrateConfig:
+        """
+        Config of the file (and the project, the active one by default).
+
+        Args:
+            config_path: Path to the config file.
+            project: Project name. The active project if not passed.
+            auto_migrate: Automatically apply migrations to config.
+            persist_migration: Save automatically migrated config to file.
+            refresh: Load even if the registered config is fresh.
+
+        Raises:
+            RuntimeError: If the configuration file cannot be read or if the
+                configuration state is invalid.
+        """
+        path = config_path.resolve()
+        load = partial(
+            load_qualibrate_config,
+            path,
+            project,
+            auto_migrate=auto_migrate,
+            persist_migration=persist_migration,
+            base_config_cache=self._base_configs,
+        )
+        return self._cache.get_or_load(
+            self._key(path, project, auto_migrate),
+            load,
+            lambda loaded: (
+                path,
+                get_project_config_path(path.parent, loaded.project),
+            ),
+            known_paths=(path,),
+            refresh=refresh,
+        )
+
+    def invalidate(
+        self, config_path: Path | None = None, project: str | None = None
+    ) -> None:
+        """
+        Drop configs of the file (only of `project` if it's passed) or all
+        configs.
+        """
+        if config_path is None:
+            self._cache.invalidate()
+            self._base_configs.invalidate()
+            return
+        path = config_path.resolve()
+        if project is not None:
+            # keys (see `_key`) of the config loaded with any overrides and
+            # with or without auto migration
+            self._cache.invalidate_where(
+                lambda key: (
+                    isinstance(key, tuple) and key[:2] == (path, project)
+                )
+            )
+            return
+        self._base_configs.invalidate_where(
+            lambda key: isinstance(key, tuple) and key[0] == path
+        )
+        self._cache.invalidate_where(
+            lambda key: isinstance(key, tuple) and key[0] == path
+        )
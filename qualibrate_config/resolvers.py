@@ -1,17 +1,57 @@
 import logging
 import os
-from collections.abc import Callable
+import threading
+from collections.abc import Callable, Hashable, Mapping, MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
 from functools import partial
 from pathlib import Path
 from typing import TypeVar
 
 import jsonpointer
 
-from qualibrate_config.cli import migrate_command
-from qualibrate_config.file import get_config_file, read_config_file
+from qualibrate_config.core.cache import ConfigCache
+from qualibrate_config.core.daemon import (
+    ConfigDaemonClient,
+    DaemonRequestError,
+    DaemonUnavailableError,
+    get_config_socket_path,
+)
+from qualibrate_config.core.fingerprint import FileFingerprint, file_fingerprint
+from qualibrate_config.core.lock import config_lock
+from qualibrate_config.core.migration.migrate import (
+    migrate_in_memory,
+    persist_migrated_config,
+)
+from qualibrate_config.core.overrides import (
+    EnvOverrideItems,
+    apply_env_overrides,
+    env_override_items,
+    env_overrides,
+)
+from qualibrate_config.core.project.common import (
+    get_project_from_common_config,
+)
+from qualibrate_config.core.project.path import get_project_config_path
+from qualibrate_config.core.shm import (
+    SharedConfigReader,
+    get_shared_config_name,
+)
+from qualibrate_config.core.snapshot import (
+    MAX_ENV_SNAPSHOT_SIZE,
+    ConfigSnapshot,
+)
+from qualibrate_config.file import (
+    apply_project_config,
+    get_config_file,
+    project_config_view,
+    read_config_file,
+    read_config_tables,
+)
 from qualibrate_config.models import BaseConfig, QualibrateConfig
 from qualibrate_config.models.qualibrate import QualibrateTopLevelConfig
 from qualibrate_config.qulibrate_types import RawConfigType
+from qualibrate_config.references.resolvers import resolve_references
 from qualibrate_config.validation import (
     GreaterThanSupportedQualibrateConfigVersionError,
     InvalidQualibrateConfigVersionError,
@@ -21,6 +61,7 @@ from qualibrate_config.validation import (
 )
 from qualibrate_config.vars import (
     CONFIG_PATH_ENV_NAME,
+    CONFIG_SNAPSHOT_ENV_NAME,
     DEFAULT_CONFIG_FILENAME,
     QUALIBRATE_PATH,
 )
@@ -28,19 +69,57 @@ from qualibrate_config.vars import (
 __all__ = [
     "get_config_dict",
     "get_config_model",
+    "get_config_models",
+    "export_qualibrate_config",
     "get_qualibrate_config_path",
     "get_qualibrate_config",
+    "get_resolved_config",
+    "invalidate_config_cache",
+    "load_qualibrate_config",
+    "qualibrate_config_cache",
+    "qualibrate_project_config_cache",
+    "read_config_snapshot",
 ]
 
 ConfigClass = TypeVar("ConfigClass", bound=BaseConfig)
 
+# Configs returned by `get_qualibrate_config`, keyed as `_config_cache_key`
+# describes. Cached configs are shared by all callers.
+# Set `qualibrate_config_cache.ttl` to also expire entries by age.
+qualibrate_config_cache: ConfigCache[QualibrateConfig] = ConfigCache()
+# Configs of explicitly requested projects.
+qualibrate_project_config_cache: ConfigCache[QualibrateConfig] = ConfigCache(
+    max_entries=128
+)
+# Parsed (and migrated) base config files shared by project configs, keyed
+# by (file path, auto_migrate). Cached configs are never modified, overlays
+# are merged by `project_config_view`.
+_base_config_cache: ConfigCache[RawConfigType] = ConfigCache(max_entries=16)
+
+# Connections to config daemons, keyed by socket path. Not inherited by
+# forked processes as the socket can't be shared.
+_daemon_clients: dict[Path, ConfigDaemonClient] = {}
+_daemon_clients_lock = threading.Lock()
+os.register_at_fork(after_in_child=_daemon_clients.clear)
+# Mapped shared config segments (see `SharedConfigPublisher`), keyed by name.
+_shared_readers: dict[str, SharedConfigReader] = {}
+_shared_readers_lock = threading.Lock()
+# Decoded snapshot exported by the parent process, keyed by the env value.
+_inherited_snapshots: dict[str, ConfigSnapshot] = {}
+
 
 def get_qualibrate_config_path() -> Path:
     """
     Retrieve the qualibrate configuration file path. If an environment variable
     for the config path is set, it uses that; otherwise, it defaults to the
-    standard Qualibrate path.
+    standard Qualibrate path. The path of the config exported by the parent
+    process (see `export_qualibrate_config`) is used if the variable isn't
+    set.
     """
+    if CONFIG_PATH_ENV_NAME not in os.environ:
+        inherited = _inherited_snapshot()
+        if inherited is not None:
+            return inherited.config_path
     return get_config_file(
         os.environ.get(CONFIG_PATH_ENV_NAME, QUALIBRATE_PATH),
         DEFAULT_CONFIG_FILENAME,
@@ -53,8 +132,12 @@ def get_config_dict(
     config_key: str | None,
     config: RawConfigType | None = None,
 ) -> RawConfigType:
-    if config is None or config_key is None or config_key not in config:
-        config = read_config_file(config_path, solve_references=False)
+    if config is None or (config_key is not None and config_key not in config):
+        config = (
+            read_config_file(config_path, solve_references=False)
+            if config_key is None
+            else read_config_tables(config_path, (config_key,))
+        )
     if config is None:
         raise RuntimeError("Couldn't read config file")
     if config_key is None:
@@ -124,19 +207,350 @@ def get_config_model(
     return new_config
 
 
+def _build_config_model(
+    config: RawConfigType,
+    config_key: str,
+    config_class: type[ConfigClass],
+) -> ConfigClass:
+    new_config = get_config_model_or_print_error(
+        dict(config.get(config_key, {})), config_class, config_key
+    )
+    if new_config is None:
+        raise RuntimeError(f"Invalid config {config_class.__name__} state")
+    return new_config
+
+
+def get_config_models(
+    config_path: Path,
+    config_classes: Mapping[str, type[BaseConfig]],
+    config: RawConfigType | None = None,
+    raw_config_validators: list[Callable[[RawConfigType], None]] | None = None,
+    *,
+    parallel: bool = False,
+    max_workers: int | None = None,
+) -> dict[str, BaseConfig]:
+    """Retrieve several config sections from one read of the config file.
+
+    The requested top-level tables (and tables they reference) are parsed
+    once, the project overlay is applied once and raw validators run once
+    on the whole raw config. Each section is built as `get_config_model`
+    would build it.
+
+    Args:
+        config_path: Path to the configuration file.
+        config_classes: Config class for each top-level key.
+        config: Optional pre-loaded configuration data. The file isn't read
+            if passed; missing keys give models built from empty dicts.
+        raw_config_validators: Validators of the whole raw config.
+        parallel: Build sections on a thread pool.
+        max_workers: Max threads of the pool in parallel mode.
+
+    Returns:
+        Mapping of config key to the built model.
+
+    Raises:
+        RuntimeError: If any of the sections has invalid state.
+    """
+    if config is None:
+        config = read_config_tables(config_path, config_classes)
+    for validator in raw_config_validators or ():
+        validator(config)
+    if not parallel or len(config_classes) < 2:
+        return {
+            key: _build_config_model(config, key, config_class)
+            for key, config_class in config_classes.items()
+        }
+    with ThreadPoolExecutor(
+        max_workers=max_workers or len(config_classes),
+        thread_name_prefix="qualibrate-config-model",
+    ) as executor:
+        futures = {
+            key: executor.submit(_build_config_model, config, key, cls)
+            for key, cls in config_classes.items()
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+
+def invalidate_config_cache(config_path: Path | None = None) -> None:
+    """Drop cached configs of the file or all cached configs."""
+    if config_path is None:
+        qualibrate_config_cache.invalidate()
+        qualibrate_project_config_cache.invalidate()
+        _base_config_cache.invalidate()
+        return
+    path = config_path.absolute()
+
+    def of_file(key: Hashable) -> bool:
+        return isinstance(key, tuple) and key[0] == path
+
+    qualibrate_config_cache.invalidate_where(of_file)
+    _base_config_cache.invalidate_where(of_file)
+    qualibrate_project_config_cache.invalidate_where(of_file)
+
+
+def _config_cache_key(
+    path: Path,
+    project: str | None,
+    items: EnvOverrideItems,
+    auto_migrate: bool,
+) -> Hashable:
+    """
+    Key of `qualibrate_config_cache` (or `qualibrate_project_config_cache`
+    if project is passed). Configs with environment overrides are cached
+    separately from configs of the file itself, and configs loaded with
+    automatic migration (which may be migrated in memory only) separately
+    from configs loaded without it.
+    """
+    return path, project, items, auto_migrate
+
+
+def read_config_snapshot(config_path: Path, version: int = 0) -> ConfigSnapshot:
+    """
+    Config with the project overlay applied (references aren't solved) and
+    fingerprints of the files it's built from, to share it with other
+    processes. Environment overrides of this process aren't applied, readers
+    apply their own. The config is validated; configs which need migration
+    aren't accepted.
+
+    Raises:
+        RuntimeError: If the configuration file cannot be read or if the
+            configuration state is invalid.
+        InvalidQualibrateConfigVersionError: If the config isn't migrated.
+    """
+    path = config_path.absolute()
+    with config_lock(path, shared=True):
+        files: list[tuple[Path, FileFingerprint]] = [
+            (path, file_fingerprint(path))
+        ]
+        raw = read_config_file(
+            path, solve_references=False, apply_project=False
+        )
+        project = get_project_from_common_config(raw)
+        if project:
+            overlay = get_project_config_path(path.parent, project)
+            files.append((overlay, file_fingerprint(overlay)))
+        raw = apply_project_config(raw, path, override_items=())
+    _load_qualibrate_config(path, deepcopy(raw), auto_migrate=False)
+    return ConfigSnapshot(version, path, tuple(files), raw)
+
+
+def _config_from_daemon(
+    config_path: Path, resolved: bool
+) -> RawConfigType | None:
+    """
+    Config (with the project overlay) from `qualibrate-config serve` daemon
+    of the config file. None if the daemon isn't running or its snapshot
+    isn't built from the current files.
+    """
+    socket_path = get_config_socket_path(config_path)
+    if not socket_path.exists():
+        return None
+    with _daemon_clients_lock:
+        client = _daemon_clients.get(socket_path)
+        if client is None:
+            client = _daemon_clients[socket_path] = ConfigDaemonClient(
+                socket_path
+            )
+    try:
+        snapshot = client.get(resolved)
+    except (DaemonUnavailableError, DaemonRequestError) as ex:
+        logging.debug(f"Config daemon isn't used: {ex}")
+        return None
+    if (
+        snapshot.config_path != config_path.absolute()
+        or not snapshot.is_current()
+    ):
+        return None
+    # snapshot is kept by the client for `unchanged` responses
+    return deepcopy(snapshot.data)
+
+
+def _config_from_shared_memory(config_path: Path) -> RawConfigType | None:
+    """
+    Config (with the project overlay) published into shared memory by
+    `SharedConfigPublisher`. None if there's no snapshot of the config file
+    or it isn't built from the current files.
+    """
+    name = get_shared_config_name(config_path)
+    with _shared_readers_lock:
+        reader = _shared_readers.get(name)
+        if reader is None:
+            reader = _shared_readers[name] = SharedConfigReader(name)
+        snapshot = reader.read()
+    if (
+        snapshot is None
+        or snapshot.config_path != config_path.absolute()
+        or not snapshot.is_current()
+    ):
+        return None
+    # snapshot is kept by the reader until a new one is published
+    return deepcopy(snapshot.data)
+
+
+def _inherited_snapshot() -> ConfigSnapshot | None:
+    value = os.environ.get(CONFIG_SNAPSHOT_ENV_NAME)
+    if not value:
+        return None
+    snapshot = _inherited_snapshots.get(value)
+    if snapshot is None:
+        try:
+            snapshot = ConfigSnapshot.from_env(value)
+        except ValueError as ex:
+            logging.debug(f"Inherited config isn't used: {ex}")
+            return None
+        _inherited_snapshots.clear()
+        _inherited_snapshots[value] = snapshot
+    return snapshot
+
+
+def _config_from_env(config_path: Path) -> RawConfigType | None:
+    """
+    Config (with the project overlay) exported by the parent process. None
+    if it isn't exported for the config file or the files have changed.
+    """
+    snapshot = _inherited_snapshot()
+    if (
+        snapshot is None
+        or snapshot.config_path != config_path.absolute()
+        or not snapshot.is_current()
+    ):
+        return None
+    return deepcopy(snapshot.data)
+
+
+def export_qualibrate_config(
+    config_path: Path | None = None,
+    env: MutableMapping[str, str] | None = None,
+) -> MutableMapping[str, str]:
+    """
+    Export the validated config (with the project overlay applied) to
+    environment of child processes.
+
+    `get_qualibrate_config` in a child process with this environment uses
+    the exported config instead of reading the files, while the files it
+    was built from are unchanged (checked by stat fingerprints).
+
+    Args:
+        config_path: Path to the config file. Resolved like
+            `get_qualibrate_config` does if not passed.
+        env: Environment to update (e.g. `os.environ` to export the config
+            to all processes started later). A copy of `os.environ` is
+            updated if not passed.
+
+    Returns:
+        Updated environment.
+
+    Raises:
+        ValueError: The config is too big for an environment variable. Use
+            `SharedConfigPublisher` for such configs.
+    """
+    if config_path is None:
+        config_path = get_qualibrate_config_path()
+    value = read_config_snapshot(config_path).to_env()
+    if len(value) > MAX_ENV_SNAPSHOT_SIZE:
+        raise ValueError(
+            f"Config {config_path} is too big to be exported to environment "
+            f"({len(value)} bytes)"
+        )
+    if env is None:
+        env = dict(os.environ)
+    env[CONFIG_SNAPSHOT_ENV_NAME] = value
+    return env
+
+
+def _served_config(config_path: Path) -> RawConfigType | None:
+    """
+    Config exported by the parent process, from shared memory or daemon;
+    None if none of them serves it.
+    """
+    config = _config_from_env(config_path)
+    if config is None:
+        config = _config_from_shared_memory(config_path)
+    if config is None:
+        config = _config_from_daemon(config_path, resolved=False)
+    if config is None:
+        return None
+    return _apply_local_overrides(config, env_override_items())
+
+
+def _apply_local_overrides(
+    config: RawConfigType, items: EnvOverrideItems
+) -> RawConfigType | None:
+    """
+    Served config (built from files only) with overrides of this process.
+    None if they select another project, as the served config has overlay
+    of the project set in the file.
+    """
+    project = get_project_from_common_config(env_overrides(items))
+    if project and project != get_project_from_common_config(config):
+        return None
+    return apply_env_overrides(config, items)
+
+
+def get_resolved_config(
+    config_path: Path | None = None, use_served: bool = True
+) -> RawConfigType:
+    """
+    Whole config with the project overlay applied and references solved.
+
+    Exported by the parent process (`export_qualibrate_config`), served by
+    shared memory (`SharedConfigPublisher`) or the config daemon
+    (`qualibrate-config serve`) if any of them serves the config file,
+    otherwise the file is read directly.
+    """
+    if config_path is None:
+        config_path = get_qualibrate_config_path()
+    if use_served:
+        items = env_override_items()
+        shared = _config_from_env(config_path)
+        if shared is None:
+            shared = _config_from_shared_memory(config_path)
+        if shared is None and items:
+            # local overrides have to be applied before references solving
+            shared = _config_from_daemon(config_path, resolved=False)
+        if shared is not None:
+            shared = _apply_local_overrides(shared, items)
+        if shared is not None:
+            return resolve_references(shared)
+        if not items:
+            config = _config_from_daemon(config_path, resolved=True)
+            if config is not None:
+                return config
+    return read_config_file(config_path, solve_references=True)
+
+
 def get_qualibrate_config(
     config_path: Path | None = None,
     config: RawConfigType | None = None,
     auto_migrate: bool = True,
+    *,
+    use_cache: bool = True,
+    persist_migration: bool = True,
+    project: str | None = None,
 ) -> QualibrateConfig:
     """Retrieve the Qualibrate configuration.
 
+    Configs loaded from files are cached until the config file or the
+    active project config changes (see `qualibrate_config_cache`). The
+    returned instance is shared between callers and shouldn't be modified;
+    pass `use_cache=False` to get an own instance.
+    Values set by `QUALIBRATE__<TABLE>__<KEY>` environment variables
+    override values of the files in memory (see `core.overrides`).
+
     Args:
         config_path: Optional pre-loaded configuration data. If not provided, it
             will load and resolve references from the config file.
         config: Optional pre-loaded configuration data. If not provided, it
             will load and resolve references from the config file.
         auto_migrate: is it needed to automatically apply migrations to config
+        persist_migration: Save automatically migrated config to the file.
+            The config is migrated in memory and saved in background.
+        use_cache: Return cached config if it's still fresh. If False, the
+            config is loaded from files and isn't cached.
+        project: Load config of this project instead of the active one.
+            The base config file is parsed once for all projects and the
+            config of each project is cached until its overlay file changes
+            (see `qualibrate_project_config_cache`).
 
     Returns:
         An instance of QualibrateConfig with the loaded configuration.
@@ -147,27 +561,119 @@ def get_qualibrate_config(
     """
     if config_path is None:
         config_path = get_qualibrate_config_path()
+    if config is not None:
+        if project is not None:
+            config = apply_project_config(
+                deepcopy(config), config_path, override_project=project
+            )
+        return _load_qualibrate_config(config_path, config, auto_migrate)
+    if not use_cache:
+        return load_qualibrate_config(
+            config_path,
+            project,
+            auto_migrate=auto_migrate,
+            persist_migration=persist_migration,
+        )
+    path = config_path.absolute()
+    key = _config_cache_key(path, project, env_override_items(), auto_migrate)
+    if project is not None:
+        overlay_path = get_project_config_path(path.parent, project)
+        return qualibrate_project_config_cache.get_or_load(
+            key,
+            partial(
+                _load_project_qualibrate_config,
+                config_path,
+                project,
+                auto_migrate,
+                persist_migration,
+                _base_config_cache,
+            ),
+            lambda _: (path, overlay_path),
+            known_paths=(path, overlay_path),
+        )
+    return qualibrate_config_cache.get_or_load(
+        key,
+        partial(
+            _load_qualibrate_config,
+            config_path,
+            None,
+            auto_migrate,
+            persist_migration,
+        ),
+        lambda loaded: (
+            path,
+            get_project_config_path(path.parent, loaded.project),
+        ),
+        known_paths=(path,),
+    )
+
+
+def load_qualibrate_config(
+    config_path: Path,
+    project: str | None = None,
+    *,
+    auto_migrate: bool = True,
+    persist_migration: bool = True,
+    base_config_cache: ConfigCache[RawConfigType] | None = None,
+) -> QualibrateConfig:
+    """
+    Load config of the file (and the project, the active one by default)
+    without caches of `get_qualibrate_config`, e.g. to keep configs in own
+    caches.
 
-    get_config_model_part = partial(
-        get_config_model,
+    Args:
+        config_path: Path to the config file.
+        project: Project name. The active project if not passed.
+        auto_migrate: Automatically apply migrations to config.
+        persist_migration: Save automatically migrated config to file.
+        base_config_cache: Cache of parsed base config files shared by
+            configs of explicitly passed projects, keyed by (file path,
+            auto_migrate). Cached configs are never modified. The base
+            config is parsed every time if not passed.
+
+    Raises:
+        RuntimeError: If the configuration file cannot be read or if the
+            configuration state is invalid.
+    """
+    if project is None:
+        return _load_qualibrate_config(
+            config_path, None, auto_migrate, persist_migration
+        )
+    return _load_project_qualibrate_config(
         config_path,
-        config_key=None,
-        config_class=QualibrateTopLevelConfig,
-        config=config,
+        project,
+        auto_migrate,
+        persist_migration,
+        base_config_cache,
     )
-    common_error_msg = (
+
+
+def _common_error_msg(config_path: Path) -> str:
+    return (
         "QUAlibrate was unable to load the config. It is recommend to run "
         '"qualibrate config" to fix any file issues. If this problem persists, '
         f'please delete "{config_path}" and retry running '
         '"qualibrate config"'
     )
-    try:
-        model = get_config_model_part(
-            raw_config_validators=[
-                qualibrate_version_validator,
-                deprecated_subconfigs_validator,
-            ]
+
+
+def _read_base_config(
+    config_path: Path,
+) -> tuple[RawConfigType, FileFingerprint]:
+    with config_lock(config_path, shared=True):
+        fingerprint = file_fingerprint(config_path)
+        config = read_config_file(
+            config_path, solve_references=False, apply_project=False
         )
+    return config, fingerprint
+
+
+def _migrate_if_needed(
+    config_path: Path, raw: RawConfigType, auto_migrate: bool
+) -> tuple[RawConfigType, bool]:
+    """Validate config version. Returns (config, whether it was migrated)."""
+    try:
+        qualibrate_version_validator(raw)
     except GreaterThanSupportedQualibrateConfigVersionError as ex:
         error_msg = (
             f"QUAlibrate was unable to load the config. {str(ex)}. If this "
@@ -179,20 +685,88 @@ def get_qualibrate_config(
         if not auto_migrate:
             raise
         logging.info("Automatically migrate to new qualibrate config")
-        migrate_command(["--config-path", config_path], standalone_mode=False)
-    except (RuntimeError, ValueError) as ex:
-        raise RuntimeError(common_error_msg) from ex
-    else:
-        return model.qualibrate
-    # migrated
+        try:
+            return migrate_in_memory(raw, config_path), True
+        except (RuntimeError, ValueError, AssertionError) as ex:
+            raise RuntimeError(_common_error_msg(config_path)) from ex
+    return raw, False
+
+
+def _load_base_config(
+    config_path: Path, auto_migrate: bool, persist_migration: bool
+) -> RawConfigType:
+    """Base config file content (without overlay) of the latest version."""
     try:
-        model = get_config_model_part(
-            raw_config_validators=[deprecated_subconfigs_validator]
+        raw, source_fingerprint = _read_base_config(config_path)
+    except ValueError as ex:
+        raise RuntimeError(_common_error_msg(config_path)) from ex
+    raw, migrated = _migrate_if_needed(config_path, raw, auto_migrate)
+    if migrated and persist_migration:
+        # callers merge overlay into the returned config, so save a copy
+        persist_migrated_config(config_path, deepcopy(raw), source_fingerprint)
+    return raw
+
+
+def _build_qualibrate_config(
+    config_path: Path, raw: RawConfigType
+) -> QualibrateConfig:
+    try:
+        model = get_config_model(
+            config_path,
+            config_key=None,
+            config_class=QualibrateTopLevelConfig,
+            config=raw,
+            raw_config_validators=[deprecated_subconfigs_validator],
         )
     except (RuntimeError, ValueError) as ex:
-        raise RuntimeError(common_error_msg) from ex
+        raise RuntimeError(_common_error_msg(config_path)) from ex
     return model.qualibrate
 
 
+def _load_qualibrate_config(
+    config_path: Path,
+    config: RawConfigType | None,
+    auto_migrate: bool,
+    persist_migration: bool = True,
+) -> QualibrateConfig:
+    if config is not None:
+        raw, _ = _migrate_if_needed(config_path, config, auto_migrate)
+        return _build_qualibrate_config(config_path, raw)
+    # served config is already validated, migrated and merged with overlay
+    served = _served_config(config_path)
+    if served is not None:
+        return _build_qualibrate_config(config_path, served)
+    raw = _load_base_config(config_path, auto_migrate, persist_migration)
+    return _build_qualibrate_config(
+        config_path, apply_project_config(raw, config_path)
+    )
+
+
+def _load_project_qualibrate_config(
+    config_path: Path,
+    project: str,
+    auto_migrate: bool,
+    persist_migration: bool,
+    base_config_cache: ConfigCache[RawConfigType] | None,
+) -> QualibrateConfig:
+    load_base = partial(
+        _load_base_config, config_path, auto_migrate, persist_migration
+    )
+    if base_config_cache is None:
+        base = load_base()
+    else:
+        path = config_path.absolute()
+        base = base_config_cache.get_or_load(
+            (path, auto_migrate),
+            load_base,
+            lambda _: (path,),
+            known_paths=(path,),
+        )
+    raw = project_config_view(
+        base, config_path, override_project=project
+    ).materialize()
+    return _build_qualibrate_config(config_path, raw)
+
+
 if __name__ == "__main__":
     get_qualibrate_config(get_qualibrate_config_path())
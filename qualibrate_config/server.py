@@ -0,0 +1,346 @@
+import contextlib
+import logging
+import os
+import socket
+import socketserver
+import threading
+import uuid
+from pathlib import Path
+from types import TracebackType
+from typing import Any, NamedTuple
+
+import jsonpointer
+
+from qualibrate_config.core.daemon import (
+    ConfigDaemonClient,
+    ProtocolError,
+    encode_message,
+    get_config_socket_path,
+    recv_message,
+)
+from qualibrate_config.core.project.p_list import list_projects
+from qualibrate_config.core.snapshot import ConfigSnapshot
+from qualibrate_config.qulibrate_types import RawConfigType
+from qualibrate_config.references.resolvers import resolve_references
+from qualibrate_config.resolvers import (
+    get_qualibrate_config_path,
+    read_config_snapshot,
+)
+from qualibrate_config.watcher import ConfigWatcher
+
+__all__ = ["ConfigServer"]
+
+logger = logging.getLogger(__name__)
+
+
+class _Snapshot(NamedTuple):
+    version: int
+    config: ConfigSnapshot | None
+    resolved: RawConfigType | None
+    error: str | None
+    # encoded `get` responses: {resolved: frame}
+    frames: dict[bool, bytes]
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    server: "_UnixServer"
+
+    def setup(self) -> None:
+        with self.server.connections_lock:
+            self.server.connections.add(self.request)
+
+    def finish(self) -> None:
+        with self.server.connections_lock:
+            self.server.connections.discard(self.request)
+
+    def handle(self) -> None:
+        while True:
+            try:
+                request = recv_message(self.request)
+            except ProtocolError as ex:
+                self.request.sendall(encode_message(_error(str(ex))))
+                return
+            except OSError:
+                return
+            if request is None:
+                return
+            try:
+                self.request.sendall(self.server.config_server.handle(request))
+            except OSError:
+                return
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    config_server: "ConfigServer"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.connections: set[socket.socket] = set()
+        self.connections_lock = threading.Lock()
+
+    def server_close(self) -> None:
+        super().server_close()
+        # clients of the stopped daemon shouldn't be served anymore
+        with self.connections_lock:
+            for connection in self.connections:
+                with contextlib.suppress(OSError):
+                    connection.shutdown(socket.SHUT_RDWR)
+
+
+def _error(message: str) -> dict[str, Any]:
+    return {"ok": False, "error": message}
+
+
+class ConfigServer:
+    """
+    Local daemon serving the config over a Unix domain socket.
+
+    Holds the config (with the project overlay, both raw and with solved
+    references) and keeps it up to date with `ConfigWatcher`, so clients
+    on the host don't have to read, merge and resolve the files themselves.
+    Messages are length-prefixed compact JSON (see `core.daemon`).
+
+    Supported requests (`op`):
+        ping: Health check.
+        get: Whole config; `resolved` selects references solving. Data isn't
+            sent if snapshot `version` equals to passed `since` and
+            `instance` is the id of this daemon (versions start over when
+            the daemon is restarted).
+        get_pointer: Value by JSON `pointer`.
+        list_projects: Names of projects.
+
+    Args:
+        config_path: Path to the config file. Resolved like
+            `get_qualibrate_config` does if not passed.
+        socket_path: Socket path. `.config.sock` next to the config file if
+            not passed (or the path from `QUALIBRATE_CONFIG_SOCKET`).
+        debounce: Passed to `ConfigWatcher`.
+        poll_interval: Passed to `ConfigWatcher`.
+        use_inotify: Passed to `ConfigWatcher`.
+    """
+
+    def __init__(
+        self,
+        config_path: Path | None = None,
+        socket_path: Path | None = None,
+        *,
+        debounce: float = 0.2,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True,
+    ) -> None:
+        self._config_path = (
+            config_path or get_qualibrate_config_path()
+        ).absolute()
+        self._socket_path = socket_path or get_config_socket_path(
+            self._config_path
+        )
+        self._watcher = ConfigWatcher(
+            self._config_path,
+            debounce=debounce,
+            poll_interval=poll_interval,
+            use_inotify=use_inotify,
+        )
+        self._lock = threading.Lock()
+        self._snapshot: _Snapshot | None = None
+        self._version = 0
+        self._instance = uuid.uuid4().hex
+        self._server: _UnixServer | None = None
+        self._thread: threading.Thread | None = None
+        self._unsubscribe: Any = None
+
+    @property
+    def config_path(self) -> Path:
+        return self._config_path
+
+    @property
+    def socket_path(self) -> Path:
+        return self._socket_path
+
+    @property
+    def version(self) -> int:
+        """Version of the served snapshot. Increases on every refresh."""
+        snapshot = self._snapshot
+        return 0 if snapshot is None else snapshot.version
+
+    @property
+    def instance(self) -> str:
+        """Id of the daemon run, sent with versions."""
+        return self._instance
+
+    def refresh(self) -> None:
+        """Rebuild the served snapshot from the files."""
+        with self._lock:
+            self._version += 1
+            version = self._version
+        config: ConfigSnapshot | None = None
+        resolved: RawConfigType | None = None
+        error: str | None = None
+        try:
+            config = read_config_snapshot(self._config_path, version)
+            resolved = resolve_references(config.data)
+        except Exception as ex:
+            logger.warning(f"Can't serve config {self._config_path}: {ex}")
+            error = f"Config {self._config_path} can't be served: {ex}"
+        snapshot = _Snapshot(version, config, resolved, error, {})
+        if config is not None:
+            for is_resolved in (False, True):
+                snapshot.frames[is_resolved] = encode_message(
+                    self._get_response(snapshot, is_resolved)
+                )
+        with self._lock:
+            current = self._snapshot
+            if current is None or current.version < version:
+                self._snapshot = snapshot
+
+    def _get_response(
+        self, snapshot: _Snapshot, resolved: bool
+    ) -> dict[str, Any]:
+        assert snapshot.config is not None
+        response = {
+            "ok": True,
+            "instance": self._instance,
+            **snapshot.config.to_wire(),
+        }
+        if resolved:
+            response["data"] = snapshot.resolved
+        return response
+
+    def handle(self, request: Any) -> bytes:
+        """Encoded response to the decoded request."""
+        if not isinstance(request, dict):
+            return encode_message(_error("Request must be an object"))
+        op = request.get("op")
+        if op == "ping":
+            return encode_message(
+                {
+                    "ok": True,
+                    "instance": self._instance,
+                    "version": self.version,
+                }
+            )
+        if op == "list_projects":
+            try:
+                projects = list_projects(self._config_path.parent)
+            except OSError as ex:
+                return encode_message(_error(str(ex)))
+            return encode_message({"ok": True, "data": projects})
+        if op not in ("get", "get_pointer"):
+            return encode_message(_error(f"Unknown operation {op!r}"))
+        snapshot = self._snapshot
+        if snapshot is None:
+            return encode_message(_error("Config isn't loaded"))
+        if snapshot.error is not None:
+            return encode_message(_error(snapshot.error))
+        resolved = bool(request.get("resolved", True))
+        if op == "get":
+            if (
+                request.get("since") == snapshot.version
+                and request.get("instance") == self._instance
+            ):
+                return encode_message(
+                    {
+                        "ok": True,
+                        "instance": self._instance,
+                        "version": snapshot.version,
+                        "unchanged": True,
+                    }
+                )
+            return snapshot.frames[resolved]
+        assert snapshot.config is not None
+        data = snapshot.resolved if resolved else snapshot.config.data
+        try:
+            value = jsonpointer.resolve_pointer(data, request.get("pointer"))
+        except (jsonpointer.JsonPointerException, TypeError) as ex:
+            return encode_message(_error(f"Invalid pointer: {ex}"))
+        return encode_message(
+            {"ok": True, "version": snapshot.version, "data": value}
+        )
+
+    def _bind(self) -> _UnixServer:
+        if self._socket_path.exists():
+            with ConfigDaemonClient(self._socket_path, timeout=0.5) as client:
+                if client.ping():
+                    raise RuntimeError(
+                        f"Config daemon is already running on "
+                        f"{self._socket_path}"
+                    )
+            # left by a daemon which wasn't stopped properly
+            self._socket_path.unlink()
+        server = _UnixServer(
+            os.fspath(self._socket_path),
+            _RequestHandler,
+            bind_and_activate=False,
+        )
+        try:
+            server.server_bind()
+            os.chmod(self._socket_path, 0o600)
+            server.server_activate()
+        except OSError:
+            server.server_close()
+            raise
+        server.config_server = self
+        return server
+
+    def start(self) -> "ConfigServer":
+        """Load config, start watching and serve in a background thread."""
+        if self._thread is not None:
+            return self
+        self._watcher.start()
+        self._unsubscribe = self._watcher.subscribe(lambda _: self.refresh())
+        self.refresh()
+        try:
+            self._server = self._bind()
+        except Exception:
+            self._stop_watcher()
+            raise
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.2},
+            name="qualibrate-config-server",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the current thread until interrupted."""
+        self.start()
+        assert self._thread is not None
+        try:
+            while self._thread.is_alive():
+                self._thread.join(1.0)
+        finally:
+            self.stop()
+
+    def _stop_watcher(self) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        self._watcher.stop()
+
+    def stop(self) -> None:
+        server, self._server = self._server, None
+        thread, self._thread = self._thread, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            self._socket_path.unlink(missing_ok=True)
+        if thread is not None:
+            thread.join()
+        self._stop_watcher()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def __enter__(self) -> "ConfigServer":
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.stop()
@@ -7,8 +7,14 @@ from typing import (
 import click
 from pydantic import ValidationError
 
-from qualibrate_config.core.content import get_config_file_content
-from qualibrate_config.core.migration.migrate import run_migrations
+from qualibrate_config.core.content import (
+    get_config_file_content,
+    simple_write,
+)
+from qualibrate_config.core.migration.migrate import (
+    migrate_in_memory,
+    run_migrations,
+)
 from qualibrate_config.file import read_config_file
 from qualibrate_config.models import BaseConfig, QualibrateConfig
 from qualibrate_config.qulibrate_types import RawConfigType
@@ -185,7 +191,13 @@ def deprecated_subconfigs_validator(config: RawConfigType) -> None:
 def validate_version_and_migrate_if_needed(
     common_config: dict[str, Any],
     config_path: Path,
+    *,
+    persist: bool = True,
 ) -> tuple[dict[str, Any], Path]:
+    """
+    Check version of the config and migrate it if it's old. The migrated
+    config is written to `config_path` unless `persist` is False.
+    """
     try:
         qualibrate_version_validator(common_config, False)
     except GreaterThanSupportedQualibrateConfigVersionError as ex:
@@ -197,8 +209,17 @@ def validate_version_and_migrate_if_needed(
         raise RuntimeError(error_msg) from ex
     except InvalidQualibrateConfigVersionError:
         if common_config:
-            run_migrations(config_path)
-            return get_config_file_content(config_path)
+            try:
+                migrated = migrate_in_memory(common_config, config_path)
+            except ValueError:
+                if not persist:
+                    return common_config, config_path
+                # unknown version; let migration command report it
+                run_migrations(config_path)
+                return get_config_file_content(config_path)
+            if persist:
+                simple_write(config_path, migrated)
+            return migrated, config_path
     return common_config, config_path
 
 
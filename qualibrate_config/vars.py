@@ -2,7 +2,11 @@ import os
 from pathlib import Path
 
 __all__ = [
+    "CONFIG_OVERRIDE_ENV_PREFIX",
     "CONFIG_PATH_ENV_NAME",
+    "CONFIG_SHM_ENV_NAME",
+    "CONFIG_SNAPSHOT_ENV_NAME",
+    "CONFIG_SOCKET_ENV_NAME",
     "QUALIBRATE_CONFIG_KEY",
     "QUALIBRATE_PATH",
     "DEFAULT_CONFIG_FILENAME",
@@ -11,6 +15,11 @@ __all__ = [
     "QUAM_STATE_PATH_CONFIG_KEY",
 ]
 CONFIG_PATH_ENV_NAME = "QUALIBRATE_CONFIG_FILE"
+CONFIG_SOCKET_ENV_NAME = "QUALIBRATE_CONFIG_SOCKET"
+CONFIG_SHM_ENV_NAME = "QUALIBRATE_CONFIG_SHM"
+CONFIG_SNAPSHOT_ENV_NAME = "QUALIBRATE_CONFIG_SNAPSHOT"
+# QUALIBRATE__<TABLE>__<KEY>=<value> overrides config values in memory
+CONFIG_OVERRIDE_ENV_PREFIX = "QUALIBRATE__"
 
 QUALIBRATE_CONFIG_KEY = "qualibrate"
 QUAM_CONFIG_KEY = "quam"
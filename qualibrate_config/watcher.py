@@ -0,0 +1,366 @@
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from types import TracebackType
+
+from qualibrate_config.core.fingerprint import (
+    FileFingerprint,
+    files_digest,
+    files_fingerprint,
+)
+from qualibrate_config.core.project.path import get_project_config_path
+from qualibrate_config.models import QualibrateConfig
+from qualibrate_config.resolvers import (
+    get_qualibrate_config,
+    get_qualibrate_config_path,
+)
+
+__all__ = ["ConfigWatcher", "ConfigCallback"]
+
+logger = logging.getLogger(__name__)
+
+ConfigCallback = Callable[[QualibrateConfig], None]
+
+
+class _PollingBackend:
+    """Fallback backend: wakes up periodically, changes are found by stat."""
+
+    def set_paths(self, paths: Iterable[Path]) -> None:
+        pass
+
+    def wait(self, timeout: float) -> bool:
+        time.sleep(timeout)
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyBackend:
+    """Linux inotify via ctypes.
+
+    Parent directories are watched (not the files themselves) so atomic
+    replaces and editors that write a new file are noticed too. Events for
+    unrelated files in those directories are ignored.
+    """
+
+    _EVENT = struct.Struct("iIII")
+    _MASK = (
+        0x00000002  # IN_MODIFY
+        | 0x00000004  # IN_ATTRIB
+        | 0x00000008  # IN_CLOSE_WRITE
+        | 0x00000040  # IN_MOVED_FROM
+        | 0x00000080  # IN_MOVED_TO
+        | 0x00000100  # IN_CREATE
+        | 0x00000200  # IN_DELETE
+    )
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._libc = libc
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._fd: int = fd
+        self._watches: dict[int, Path] = {}
+        self._names: set[tuple[Path, str]] = set()
+        self._read_size = 64 * (self._EVENT.size + 256)
+
+    def set_paths(self, paths: Iterable[Path]) -> None:
+        names = {(p.parent.absolute(), p.name) for p in paths}
+        dirs = {d for d, _ in names}
+        for wd, watched in list(self._watches.items()):
+            if watched not in dirs:
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+        for directory in dirs - set(self._watches.values()):
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(directory), self._MASK
+            )
+            if wd >= 0:
+                self._watches[wd] = directory
+        self._names = names
+
+    def wait(self, timeout: float) -> bool:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+        return self._drain()
+
+    def _drain(self) -> bool:
+        relevant = False
+        while True:
+            try:
+                data = os.read(self._fd, self._read_size)
+            except BlockingIOError:
+                return relevant
+            offset = 0
+            while offset < len(data):
+                wd, _, _, name_len = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size
+                name = data[offset : offset + name_len].rstrip(b"\0")
+                offset += name_len
+                directory = self._watches.get(wd)
+                if (directory, os.fsdecode(name)) in self._names:
+                    relevant = True
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def _make_backend(use_inotify: bool) -> _PollingBackend | _InotifyBackend:
+    if use_inotify and sys.platform.startswith("linux"):
+        try:
+            return _InotifyBackend()
+        except (OSError, AttributeError) as ex:
+            logger.debug(f"inotify unavailable, falling back to polling: {ex}")
+    return _PollingBackend()
+
+
+class ConfigWatcher:
+    """
+    Keeps a cached `QualibrateConfig` up to date with the config files.
+
+    Watches the base config file and the overlay of the active project,
+    debounces bursts of writes, reloads once the files are stable and pushes
+    the new config to subscribers. Reads of `config` never touch the
+    filesystem.
+
+    Args:
+        config_path: Path to the config file. Resolved like
+            `get_qualibrate_config` does if not passed.
+        debounce: Seconds the files have to stay unchanged before reload.
+        poll_interval: Max seconds between checks. With inotify it's only a
+            safety net (e.g. for network filesystems); without it's the
+            polling period.
+        use_inotify: Use inotify on Linux. Polling is used otherwise.
+    """
+
+    def __init__(
+        self,
+        config_path: Path | None = None,
+        *,
+        debounce: float = 0.2,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True,
+    ) -> None:
+        self._config_path = config_path or get_qualibrate_config_path()
+        self._debounce = debounce
+        self._poll_interval = poll_interval
+        self._use_inotify = use_inotify
+        self._config: QualibrateConfig | None = None
+        self._watched: tuple[Path, ...] = (self._config_path,)
+        self._fingerprints: tuple[FileFingerprint, ...] = ()
+        self._digest = ""
+        self._callbacks: list[ConfigCallback] = []
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._backend: _PollingBackend | _InotifyBackend | None = None
+
+    @property
+    def config_path(self) -> Path:
+        return self._config_path
+
+    @property
+    def watched_paths(self) -> tuple[Path, ...]:
+        return self._watched
+
+    @property
+    def config(self) -> QualibrateConfig:
+        """Last successfully loaded config."""
+        config = self._config
+        if config is None:
+            with self._lock:
+                if self._config is None:
+                    self._load()
+                config = self._config
+            assert config is not None
+        return config
+
+    def subscribe(self, callback: ConfigCallback) -> Callable[[], None]:
+        """Register callback for reloads. Returns unsubscribe function."""
+        with self._lock:
+            self._callbacks.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+
+        return unsubscribe
+
+    def subscribe_queue(
+        self,
+        queue: "asyncio.Queue[QualibrateConfig]",
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> Callable[[], None]:
+        """
+        Push reloaded configs into an asyncio queue. Must be called from the
+        event loop owning the queue unless `loop` is passed.
+        """
+        loop = loop or asyncio.get_running_loop()
+
+        def put(config: QualibrateConfig) -> None:
+            loop.call_soon_threadsafe(queue.put_nowait, config)
+
+        return self.subscribe(put)
+
+    def reload(self) -> QualibrateConfig:
+        """Load config now (even if files are unchanged) and notify."""
+        with self._lock:
+            self._load(use_cache=False)
+            assert self._config is not None
+            config = self._config
+            callbacks = list(self._callbacks)
+        self._notify(config, callbacks)
+        return config
+
+    def _load(self, use_cache: bool = True) -> None:
+        # fingerprint first, so a write during load triggers another reload
+        fingerprints = files_fingerprint(self._watched)
+        digest = files_digest(self._watched)
+        config = get_qualibrate_config(self._config_path, use_cache=use_cache)
+        self._config = config
+        watched = (
+            self._config_path,
+            get_project_config_path(self._config_path.parent, config.project),
+        )
+        if watched != self._watched:
+            self._watched = watched
+            fingerprints = files_fingerprint(watched)
+            digest = files_digest(watched)
+            if self._backend is not None:
+                self._backend.set_paths(watched)
+        self._fingerprints = fingerprints
+        self._digest = digest
+
+    def _notify(
+        self, config: QualibrateConfig, callbacks: list[ConfigCallback]
+    ) -> None:
+        for callback in callbacks:
+            try:
+                callback(config)
+            except Exception:
+                logger.exception("Config watcher callback failed")
+
+    def check(self) -> bool:
+        """
+        Reload if the watched files really changed. Returns whether the
+        config was reloaded.
+        """
+        with self._lock:
+            fingerprints = files_fingerprint(self._watched)
+            if fingerprints == self._fingerprints:
+                return False
+            digest = files_digest(self._watched)
+            if digest == self._digest:
+                # touched or rewritten with the same content
+                self._fingerprints = fingerprints
+                return False
+            try:
+                self._load()
+            except Exception:
+                logger.exception(f"Can't reload config {self._config_path}")
+                self._fingerprints = fingerprints
+                self._digest = digest
+                return False
+            assert self._config is not None
+            config = self._config
+            callbacks = list(self._callbacks)
+        self._notify(config, callbacks)
+        return True
+
+    def _wait_until_stable(
+        self,
+        backend: _PollingBackend | _InotifyBackend,
+        stop: threading.Event,
+    ) -> None:
+        fingerprints = files_fingerprint(self._watched)
+        while not stop.is_set():
+            backend.wait(self._debounce)
+            current = files_fingerprint(self._watched)
+            if current == fingerprints:
+                return
+            fingerprints = current
+
+    def _run(
+        self,
+        backend: _PollingBackend | _InotifyBackend,
+        stop: threading.Event,
+    ) -> None:
+        try:
+            while not stop.is_set():
+                backend.wait(self._poll_interval)
+                if stop.is_set():
+                    break
+                if files_fingerprint(self._watched) == self._fingerprints:
+                    continue
+                self._wait_until_stable(backend, stop)
+                if not stop.is_set():
+                    self.check()
+        finally:
+            # the thread owns the backend: `stop` may return before the
+            # thread exits, and the thread mustn't wait on a closed fd
+            with self._lock:
+                if self._backend is backend:
+                    self._backend = None
+            backend.close()
+
+    def start(self) -> "ConfigWatcher":
+        if self._thread is not None:
+            return self
+        self.config  # noqa: B018 - initial load
+        # new event, so a thread of a previous run which hasn't exited yet
+        # isn't resumed
+        self._stop = threading.Event()
+        backend = _make_backend(self._use_inotify)
+        with self._lock:
+            self._backend = backend
+            backend.set_paths(self._watched)
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(backend, self._stop),
+            name="qualibrate-config-watcher",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop the watcher thread and wait for it at most `timeout` seconds.
+        The thread closes its backend when it exits.
+        """
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        with self._lock:
+            self._backend = None
+        self._stop.set()
+        thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def __enter__(self) -> "ConfigWatcher":
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.stop()
@@ -0,0 +1,141 @@
+import sys
+import threading
+
+import pytest
+import tomli_w
+from click.testing import CliRunner
+
+from qualibrate_config.cli.config import config_command
+from qualibrate_config.core.lock import config_lock
+from qualibrate_config.models import QualibrateConfig
+from qualibrate_config.vars import QUALIBRATE_CONFIG_KEY
+
+if sys.version_info[:2] < (3, 11):
+    import tomli as tomllib  # type: ignore[unused-ignore,import-not-found]
+else:
+    import tomllib
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="fcntl locks are POSIX only"
+)
+
+
+def _config_args(tmp_path, config_path):
+    return [
+        "--config-path",
+        str(config_path),
+        "--storage-location",
+        str(tmp_path / "storage"),
+        "--calibration-library-folder",
+        str(tmp_path / "calibrations"),
+        "--log-folder",
+        str(tmp_path / "logs"),
+    ]
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    config_path = tmp_path / "config.toml"
+    with config_path.open("wb") as f_out:
+        tomli_w.dump(
+            {
+                QUALIBRATE_CONFIG_KEY: {
+                    "version": QualibrateConfig.version,
+                    "project": "init",
+                    "storage": {"location": str(tmp_path / "old_storage")},
+                }
+            },
+            f_out,
+        )
+    return config_path
+
+
+def test_config_command_prompt_doesnt_hold_lock(tmp_path, config_path, mocker):
+    errors = []
+
+    def _read_while_prompting(*args, **kwargs):
+        def _read():
+            try:
+                with config_lock(config_path, shared=True, timeout=0.5):
+                    pass
+            except Exception as ex:
+                errors.append(ex)
+
+        thread = threading.Thread(target=_read)
+        thread.start()
+        thread.join()
+
+    mocker.patch(
+        "qualibrate_config.cli.config.print_and_confirm",
+        side_effect=_read_while_prompting,
+    )
+    result = CliRunner().invoke(
+        config_command, _config_args(tmp_path, config_path)
+    )
+
+    assert result.exit_code == 0, result.output
+    assert errors == []
+    with config_path.open("rb") as f_in:
+        config = tomllib.load(f_in)
+    assert config[QUALIBRATE_CONFIG_KEY]["storage"]["location"] == str(
+        tmp_path / "storage"
+    )
+
+
+def test_config_command_merges_changes_made_while_prompting(
+    tmp_path, config_path, mocker
+):
+    def _change_config(*args, **kwargs):
+        with config_path.open("rb") as f_in:
+            config = tomllib.load(f_in)
+        config[QUALIBRATE_CONFIG_KEY]["project"] = "other"
+        config["extra"] = {"value": 1}
+        with config_path.open("wb") as f_out:
+            tomli_w.dump(config, f_out)
+
+    mocker.patch(
+        "qualibrate_config.cli.config.print_and_confirm",
+        side_effect=_change_config,
+    )
+    result = CliRunner().invoke(
+        config_command, _config_args(tmp_path, config_path)
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Changes are merged." in result.output
+    with config_path.open("rb") as f_in:
+        config = tomllib.load(f_in)
+    assert config["extra"] == {"value": 1}
+    assert config[QUALIBRATE_CONFIG_KEY]["project"] == "other"
+    assert config[QUALIBRATE_CONFIG_KEY]["storage"]["location"] == str(
+        tmp_path / "storage"
+    )
+
+
+def test_config_command_declined_doesnt_write(tmp_path, config_path):
+    content = config_path.read_text()
+
+    result = CliRunner().invoke(
+        config_command, _config_args(tmp_path, config_path), input="n\n"
+    )
+
+    assert result.exit_code == 1
+    assert config_path.read_text() == content
+
+
+def test_config_command_single_value_keeps_comments(tmp_path, config_path):
+    args = [*_config_args(tmp_path, config_path), "--auto-accept"]
+    result = CliRunner().invoke(config_command, args)
+    assert result.exit_code == 0, result.output
+    content = "# lab config\n" + config_path.read_text().replace(
+        "[qualibrate.storage]\n", "[qualibrate.storage]  # data\n"
+    )
+    config_path.write_text(content)
+    args[args.index("--storage-location") + 1] = str(tmp_path / "new")
+
+    result = CliRunner().invoke(config_command, args)
+
+    assert result.exit_code == 0, result.output
+    assert config_path.read_text() == content.replace(
+        str(tmp_path / "storage"), str(tmp_path / "new")
+    )
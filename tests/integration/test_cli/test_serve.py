@@ -0,0 +1,21 @@
+from click.testing import CliRunner
+
+from qualibrate_config.cli.serve import serve_command
+
+
+def test_serve_command_missing_config_path(tmp_path):
+    result = CliRunner().invoke(
+        serve_command, ["--config-path", str(tmp_path / "missing")]
+    )
+
+    assert result.exit_code == 2
+    assert "does not exist" in result.output
+
+
+def test_serve_command_no_config_file_in_dir(tmp_path):
+    result = CliRunner().invoke(serve_command, ["--config-path", str(tmp_path)])
+
+    assert result.exit_code == 1
+    assert "Can't find config file." in result.output
+    # no traceback of an unhandled error
+    assert isinstance(result.exception, SystemExit)
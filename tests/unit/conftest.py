@@ -0,0 +1,33 @@
+import pytest
+import tomli_w
+
+from qualibrate_config.models import QualibrateConfig
+from qualibrate_config.vars import QUALIBRATE_CONFIG_KEY
+
+
+def _write_config(path, project, storage=None, **extra):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if storage is None:
+        storage = path.parent / "${#/qualibrate/project}"
+    with path.open("wb") as f_out:
+        tomli_w.dump(
+            {
+                QUALIBRATE_CONFIG_KEY: {
+                    "version": QualibrateConfig.version,
+                    "project": project,
+                    "storage": {"location": str(storage)},
+                    **extra,
+                }
+            },
+            f_out,
+        )
+
+
+@pytest.fixture
+def write_config():
+    """
+    Writes the base config of `project` to the path. Storage location is
+    a project dir next to the config if not passed; `extra` values are
+    added to the qualibrate section (e.g. `version` or `log_folder`).
+    """
+    return _write_config
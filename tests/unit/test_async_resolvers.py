@@ -0,0 +1,228 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import tomli_w
+
+from qualibrate_config import async_resolvers
+from qualibrate_config.models import QualibrateConfig, StorageConfig
+from qualibrate_config.resolvers import get_qualibrate_config
+from qualibrate_config.vars import QUALIBRATE_CONFIG_KEY
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.toml"
+    with path.open("wb") as f_out:
+        tomli_w.dump(
+            {
+                QUALIBRATE_CONFIG_KEY: {
+                    "version": QualibrateConfig.version,
+                    "project": "p1",
+                    "storage": {"location": str(tmp_path / "storage")},
+                }
+            },
+            f_out,
+        )
+    return path
+
+
+def _slow(mocker, target, delay=0.2):
+    original = getattr(async_resolvers, target)
+    calls = []
+
+    def slow(*args, **kwargs):
+        calls.append(threading.current_thread())
+        time.sleep(delay)
+        return original(*args, **kwargs)
+
+    mocker.patch.object(async_resolvers, target, side_effect=slow)
+    return calls
+
+
+def test_aget_qualibrate_config_same_as_sync(config_path):
+    config = asyncio.run(async_resolvers.aget_qualibrate_config(config_path))
+    expected = get_qualibrate_config(config_path)
+    assert config.serialize() == expected.serialize()
+
+
+def test_aget_qualibrate_config_runs_off_loop(config_path, mocker):
+    calls = _slow(mocker, "get_qualibrate_config")
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    async def main():
+        tick_task = asyncio.create_task(ticker())
+        await async_resolvers.aget_qualibrate_config(config_path)
+        tick_task.cancel()
+
+    asyncio.run(main())
+    assert calls[0] is not threading.main_thread()
+    assert ticks > 5
+
+
+def test_aget_qualibrate_config_coalesces_concurrent_calls(config_path, mocker):
+    calls = _slow(mocker, "get_qualibrate_config")
+
+    async def main():
+        return await asyncio.gather(
+            *(
+                async_resolvers.aget_qualibrate_config(config_path)
+                for _ in range(5)
+            )
+        )
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_aget_qualibrate_config_uncached_calls_not_coalesced(
+    config_path, mocker
+):
+    calls = _slow(mocker, "get_qualibrate_config")
+
+    async def main():
+        return await asyncio.gather(
+            *(
+                async_resolvers.aget_qualibrate_config(
+                    config_path, use_cache=False
+                )
+                for _ in range(3)
+            )
+        )
+
+    results = asyncio.run(main())
+    assert len(calls) == 3
+    assert len({id(result) for result in results}) == 3
+
+
+def test_aget_qualibrate_config_sequential_calls_reload(config_path, mocker):
+    calls = _slow(mocker, "get_qualibrate_config", delay=0)
+
+    async def main():
+        await async_resolvers.aget_qualibrate_config(config_path)
+        await async_resolvers.aget_qualibrate_config(config_path)
+
+    asyncio.run(main())
+    assert len(calls) == 2
+    assert async_resolvers._in_flight == {}
+
+
+def test_aget_qualibrate_config_different_paths_not_coalesced(
+    config_path, tmp_path, mocker
+):
+    other = tmp_path / "other" / "config.toml"
+    other.parent.mkdir()
+    other.write_bytes(config_path.read_bytes())
+    calls = _slow(mocker, "get_qualibrate_config")
+
+    async def main():
+        await asyncio.gather(
+            async_resolvers.aget_qualibrate_config(config_path),
+            async_resolvers.aget_qualibrate_config(other),
+        )
+
+    asyncio.run(main())
+    assert len(calls) == 2
+
+
+def test_aget_qualibrate_config_projects_not_coalesced(config_path, mocker):
+    calls = _slow(mocker, "get_qualibrate_config")
+
+    async def main():
+        return await asyncio.gather(
+            async_resolvers.aget_qualibrate_config(config_path),
+            async_resolvers.aget_qualibrate_config(config_path, project="p2"),
+            async_resolvers.aget_qualibrate_config(config_path, project="p2"),
+        )
+
+    active, p2, same_p2 = asyncio.run(main())
+    assert len(calls) == 2
+    assert (active.project, p2.project) == ("p1", "p2")
+    assert same_p2 is p2
+
+
+def test_aget_qualibrate_config_passes_persist_migration(config_path, mocker):
+    load = mocker.patch.object(async_resolvers, "get_qualibrate_config")
+    asyncio.run(
+        async_resolvers.aget_qualibrate_config(
+            config_path, persist_migration=False
+        )
+    )
+    load.assert_called_once_with(
+        config_path,
+        None,
+        True,
+        use_cache=True,
+        persist_migration=False,
+        project=None,
+    )
+
+
+def test_aget_qualibrate_config_error_propagates_to_all(tmp_path):
+    config_path = tmp_path / "config.toml"
+    config_path.write_text("[qualibrate")
+
+    async def main():
+        return await asyncio.gather(
+            async_resolvers.aget_qualibrate_config(config_path),
+            async_resolvers.aget_qualibrate_config(config_path),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, Exception) for r in results)
+
+
+def test_cancelled_waiter_doesnt_cancel_shared_load(config_path, mocker):
+    _slow(mocker, "get_qualibrate_config")
+
+    async def main():
+        first = asyncio.create_task(
+            async_resolvers.aget_qualibrate_config(config_path)
+        )
+        second = asyncio.create_task(
+            async_resolvers.aget_qualibrate_config(config_path)
+        )
+        await asyncio.sleep(0.05)
+        first.cancel()
+        return await second
+
+    assert isinstance(asyncio.run(main()), QualibrateConfig)
+
+
+def test_aget_config_model(config_path, tmp_path):
+    model = asyncio.run(
+        async_resolvers.aget_config_model(
+            config_path,
+            QUALIBRATE_CONFIG_KEY,
+            QualibrateConfig,
+        )
+    )
+    assert isinstance(model.storage, StorageConfig)
+    assert model.storage.location == tmp_path / "storage"
+
+
+def test_aget_config_model_with_config_not_coalesced(config_path, mocker):
+    calls = _slow(mocker, "get_config_model", delay=0)
+    raw = {"project": "p", "storage": {"location": "/tmp/x"}}
+
+    async def main():
+        return await asyncio.gather(
+            async_resolvers.aget_config_model(
+                config_path, "qualibrate", QualibrateConfig, {"qualibrate": raw}
+            ),
+            async_resolvers.aget_config_model(
+                config_path, "qualibrate", QualibrateConfig, {"qualibrate": raw}
+            ),
+        )
+
+    asyncio.run(main())
+    assert len(calls) == 2
@@ -0,0 +1,168 @@
+import pytest
+
+from qualibrate_config.core.cache import CacheStats, ConfigCache
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text("1")
+    return path
+
+
+def _loader(path):
+    calls = []
+
+    def load():
+        calls.append(path.read_text())
+        return int(path.read_text())
+
+    return load, calls
+
+
+def test_get_or_load_caches(source):
+    cache: ConfigCache[int] = ConfigCache()
+    load, calls = _loader(source)
+    for _ in range(3):
+        assert cache.get_or_load("k", load, lambda _: (source,)) == 1
+    assert len(calls) == 1
+    assert cache.get("k") == 1
+    assert "k" in cache
+
+
+def test_file_change_reloads(source):
+    cache: ConfigCache[int] = ConfigCache()
+    load, calls = _loader(source)
+    cache.get_or_load("k", load, lambda _: (source,))
+    source.write_text("22")
+    assert cache.get("k") is None
+    assert cache.get_or_load("k", load, lambda _: (source,)) == 22
+    assert len(calls) == 2
+
+
+def test_dependency_created_reloads(source, tmp_path):
+    cache: ConfigCache[int] = ConfigCache()
+    load, calls = _loader(source)
+    overlay = tmp_path / "overlay.toml"
+    cache.get_or_load("k", load, lambda _: (source, overlay))
+    overlay.write_text("")
+    cache.get_or_load("k", load, lambda _: (source, overlay))
+    assert len(calls) == 2
+
+
+def test_write_during_load_not_missed(source):
+    cache: ConfigCache[int] = ConfigCache()
+
+    def load():
+        value = int(source.read_text())
+        source.write_text("2")
+        return value
+
+    assert (
+        cache.get_or_load("k", load, lambda _: (source,), known_paths=(source,))
+        == 1
+    )
+    assert cache.get("k") is None
+
+
+def test_ttl(source, mocker):
+    now = mocker.patch(
+        "qualibrate_config.core.cache.time.monotonic", return_value=100.0
+    )
+    cache: ConfigCache[int] = ConfigCache(ttl=5)
+    load, calls = _loader(source)
+    cache.get_or_load("k", load, lambda _: (source,))
+    now.return_value = 104.0
+    assert cache.get("k") == 1
+    now.return_value = 106.0
+    assert cache.get("k") is None
+    cache.get_or_load("k", load, lambda _: (source,))
+    assert len(calls) == 2
+
+
+def test_refresh(source):
+    cache: ConfigCache[int] = ConfigCache()
+    load, calls = _loader(source)
+    cache.get_or_load("k", load, lambda _: (source,))
+    cache.get_or_load("k", load, lambda _: (source,), refresh=True)
+    assert len(calls) == 2
+    assert cache.get("k") == 1
+
+
+def test_invalidate(source):
+    cache: ConfigCache[int] = ConfigCache()
+    load, _ = _loader(source)
+    cache.get_or_load("a", load, lambda _: (source,))
+    cache.get_or_load("b", load, lambda _: (source,))
+    cache.invalidate("a")
+    assert "a" not in cache and "b" in cache
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_load_error_not_cached(source):
+    cache: ConfigCache[int] = ConfigCache()
+    source.write_text("x")
+    load, _ = _loader(source)
+    with pytest.raises(ValueError):
+        cache.get_or_load("k", load, lambda _: (source,))
+    assert "k" not in cache
+
+
+def test_max_entries_evicts_least_recently_used(source):
+    cache: ConfigCache[int] = ConfigCache(max_entries=2)
+    load, calls = _loader(source)
+    cache.get_or_load("a", load, lambda _: (source,))
+    cache.get_or_load("b", load, lambda _: (source,))
+    assert cache.get("a") == 1  # "b" is least recently used now
+    cache.get_or_load("c", load, lambda _: (source,))
+    assert len(cache) == 2
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+
+
+def test_invalidate_where(source):
+    cache: ConfigCache[int] = ConfigCache()
+    load, _ = _loader(source)
+    for key in (("a", 1), ("a", 2), ("b", 1)):
+        cache.get_or_load(key, load, lambda _: (source,))
+    cache.invalidate_where(lambda key: key[0] == "a")
+    assert len(cache) == 1
+    assert ("b", 1) in cache
+
+
+def test_max_size_evicts_least_recently_used(source):
+    cache: ConfigCache[int] = ConfigCache(max_size=25, sizeof=lambda _: 10)
+    load, _ = _loader(source)
+    for key in ("a", "b", "c"):
+        cache.get_or_load(key, load, lambda _: (source,))
+    assert "a" not in cache
+    assert cache.stats == CacheStats(
+        entries=2, size=20, hits=0, misses=3, evictions=1
+    )
+
+
+def test_max_size_keeps_last_loaded(source):
+    cache: ConfigCache[int] = ConfigCache(max_size=5, sizeof=lambda _: 10)
+    load, _ = _loader(source)
+    cache.get_or_load("a", load, lambda _: (source,))
+    cache.get_or_load("b", load, lambda _: (source,))
+    assert "a" not in cache and "b" in cache
+
+
+def test_max_size_requires_sizeof():
+    with pytest.raises(ValueError):
+        ConfigCache(max_size=10)
+
+
+def test_stats(source):
+    cache: ConfigCache[int] = ConfigCache(sizeof=lambda _: 3)
+    load, _ = _loader(source)
+    cache.get_or_load("a", load, lambda _: (source,))
+    cache.get_or_load("a", load, lambda _: (source,))
+    assert cache.get("a") == 1
+    assert cache.stats == CacheStats(
+        entries=1, size=3, hits=2, misses=1, evictions=0
+    )
+    cache.invalidate("a")
+    assert cache.stats.size == 0
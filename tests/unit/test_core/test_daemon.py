@@ -0,0 +1,78 @@
+import datetime
+import socket
+
+import pytest
+
+from qualibrate_config.core import daemon
+
+
+@pytest.mark.parametrize(
+    "message",
+    (
+        {"op": "get", "resolved": True},
+        {"a": [1, 2.5, "ü", None, True], "b": {"c": {}}},
+        {
+            "dt": datetime.datetime(2024, 1, 2, 3, 4, 5),
+            "tz": datetime.datetime(
+                2024, 1, 2, 3, 4, tzinfo=datetime.timezone.utc
+            ),
+            "d": datetime.date(2024, 1, 2),
+            "t": datetime.time(3, 4, 5),
+        },
+    ),
+)
+def test_message_roundtrip(message):
+    frame = daemon.encode_message(message)
+    assert int.from_bytes(frame[:4], "big") == len(frame) - 4
+    assert daemon.decode_message(frame[4:]) == message
+
+
+def test_encode_compact():
+    assert daemon.encode_message({"a": [1, 2]})[4:] == b'{"a":[1,2]}'
+
+
+def test_encode_unsupported_type():
+    with pytest.raises(TypeError):
+        daemon.encode_message({"a": object()})
+
+
+def test_decode_invalid():
+    with pytest.raises(daemon.ProtocolError):
+        daemon.decode_message(b"{")
+
+
+def test_send_recv_over_socket():
+    left, right = socket.socketpair()
+    with left, right:
+        daemon.send_message(left, {"op": "ping"})
+        daemon.send_message(left, [1, 2])
+        assert daemon.recv_message(right) == {"op": "ping"}
+        assert daemon.recv_message(right) == [1, 2]
+        left.shutdown(socket.SHUT_WR)
+        assert daemon.recv_message(right) is None
+
+
+def test_recv_truncated_message():
+    left, right = socket.socketpair()
+    with left, right:
+        left.sendall(daemon.encode_message({"a": 1})[:-2])
+        left.shutdown(socket.SHUT_WR)
+        with pytest.raises(daemon.ProtocolError):
+            daemon.recv_message(right)
+
+
+def test_get_config_socket_path(tmp_path, monkeypatch):
+    monkeypatch.delenv("QUALIBRATE_CONFIG_SOCKET", raising=False)
+    config_path = tmp_path / "config.toml"
+    assert daemon.get_config_socket_path(config_path) == (
+        tmp_path / ".config.sock"
+    )
+    monkeypatch.setenv("QUALIBRATE_CONFIG_SOCKET", "/run/q.sock")
+    assert str(daemon.get_config_socket_path(config_path)) == "/run/q.sock"
+
+
+def test_client_daemon_unavailable(tmp_path):
+    client = daemon.ConfigDaemonClient(tmp_path / ".config.sock")
+    with pytest.raises(daemon.DaemonUnavailableError):
+        client.get()
+    assert not client.ping()
@@ -0,0 +1,170 @@
+from copy import deepcopy
+
+import jsonpatch
+import pytest
+import tomli_w
+
+from qualibrate_config.core import layered as layered_m
+from qualibrate_config.core.layered import LayeredConfig, OverlayBuilder
+from qualibrate_config.core.project.create import jsonpatch_to_dict
+from qualibrate_config.core.utils import recursive_update_dict
+
+BASE = {
+    "qualibrate": {
+        "project": "p1",
+        "storage": {"location": "/data", "type": "local"},
+        "tags": ["a", "b"],
+    },
+    "quam": {"state_path": "/state"},
+    "scalar": 1,
+}
+
+
+@pytest.mark.parametrize(
+    "overlay",
+    (
+        {},
+        {"qualibrate": {"storage": {"location": "/other"}}},
+        {"qualibrate": {"project": "p2", "new": {"x": 1}}, "added": True},
+        {"scalar": {"now": "table"}},
+        {"quam": "replaced by scalar"},
+        {"qualibrate": {"tags": ["c"]}},
+    ),
+)
+def test_view_equals_recursive_update(overlay):
+    base = deepcopy(BASE)
+    view = LayeredConfig(overlay, base)
+    expected = recursive_update_dict(deepcopy(BASE), overlay)
+    assert view == expected
+    assert view.materialize() == expected
+    assert list(view) == list(expected)
+    assert base == BASE
+
+
+def test_three_layers():
+    view = LayeredConfig({"a": {"x": 3}}, {"a": 1}, {"a": {"y": 2}})
+    assert view.materialize() == {"a": {"x": 3}}
+
+
+def test_nested_write_doesnt_modify_layers():
+    base = deepcopy(BASE)
+    overlay = {"qualibrate": {"storage": {"location": "/other"}}}
+    view = LayeredConfig(overlay, base)
+    view["qualibrate"]["storage"]["location"] = "/new"
+    view["qualibrate"]["storage"]["extra"] = 1
+    view["quam"]["state_path"] = "/s"
+    assert view["qualibrate"]["storage"] == {
+        "location": "/new",
+        "type": "local",
+        "extra": 1,
+    }
+    assert view["quam"]["state_path"] == "/s"
+    assert base == BASE
+    assert overlay == {"qualibrate": {"storage": {"location": "/other"}}}
+
+
+def test_assigned_table_replaces_layers():
+    view = LayeredConfig(deepcopy(BASE))
+    view["qualibrate"] = {"project": "p3"}
+    assert view["qualibrate"] == {"project": "p3"}
+    assert view.materialize()["qualibrate"] == {"project": "p3"}
+
+
+def test_delete():
+    base = deepcopy(BASE)
+    view = LayeredConfig({"scalar": 2}, base)
+    del view["scalar"]
+    del view["qualibrate"]["storage"]["type"]
+    assert "scalar" not in view
+    assert "type" not in view["qualibrate"]["storage"]
+    assert len(view) == 2
+    with pytest.raises(KeyError):
+        view["scalar"]
+    with pytest.raises(KeyError):
+        del view["scalar"]
+    assert base == BASE
+
+
+def test_materialize_doesnt_share_objects():
+    base = deepcopy(BASE)
+    result = LayeredConfig(base).materialize()
+    result["qualibrate"]["tags"].append("c")
+    result["qualibrate"]["storage"]["location"] = "/x"
+    assert base == BASE
+
+
+def test_missing_key():
+    view = LayeredConfig({"a": 1})
+    assert "b" not in view
+    assert view.get("b") is None
+    with pytest.raises(KeyError):
+        view["b"]
+
+
+def _set_nested(config, *keys_value):
+    *keys, key, value = keys_value
+    for k in keys:
+        config = config.setdefault(k, {})
+    config[key] = value
+
+
+def _jsonpatch_overlay(changes):
+    config = deepcopy(BASE)
+    changes(config)
+    return jsonpatch_to_dict(jsonpatch.make_patch(BASE, config))
+
+
+@pytest.mark.parametrize(
+    "changes",
+    (
+        lambda c: None,
+        lambda c: _set_nested(c, "qualibrate", "storage", "location", "/x"),
+        lambda c: _set_nested(c, "qualibrate", "storage", "location", "/data"),
+        lambda c: _set_nested(c, "qualibrate", "calibration", "folder", "/c"),
+        lambda c: _set_nested(c, "quam", "state_path", "/other"),
+        lambda c: _set_nested(c, "new", "nested", "key", 1),
+        lambda c: _set_nested(c, "scalar", True),
+        lambda c: _set_nested(c, "scalar", 1.0),
+        lambda c: c["qualibrate"].update(
+            {"storage": {"location": "/data", "type": "s3"}, "db": {"a": 1}}
+        ),
+        lambda c: c.update(
+            {"qualibrate": {"project": "p2", "storage": {"location": "/x"}}}
+        ),
+        lambda c: (
+            _set_nested(c, "qualibrate", "database", {"host": "h", "port": 1}),
+            _set_nested(c, "quam", "state_path", "/s"),
+            _set_nested(c, "qualibrate", "storage", "location", "/y"),
+        ),
+    ),
+)
+def test_overlay_builder_same_as_jsonpatch_diff(changes):
+    base = deepcopy(BASE)
+    builder = OverlayBuilder(base)
+    changes(builder)
+
+    overlay = builder.overlay()
+
+    expected = _jsonpatch_overlay(changes)
+    assert overlay == expected
+    # same order of keys, so the same overlay file is written
+    assert tomli_w.dumps(overlay) == tomli_w.dumps(expected)
+    assert base == BASE
+
+
+def test_overlay_builder_doesnt_copy_base(mocker):
+    deepcopy_spy = mocker.spy(layered_m, "deepcopy")
+    builder = OverlayBuilder(BASE)
+    builder["qualibrate"]["storage"]["location"] = "/x"
+
+    assert builder.overlay() == {"qualibrate": {"storage": {"location": "/x"}}}
+    deepcopy_spy.assert_not_called()
+
+
+def test_overlay_builder_set_back_to_base_value():
+    builder = OverlayBuilder(BASE)
+    builder["quam"]["state_path"] = "/other"
+    builder["quam"]["state_path"] = "/state"
+    del builder["scalar"]
+
+    assert builder.overlay() == {}
@@ -0,0 +1,297 @@
+import multiprocessing
+import sys
+import threading
+
+import pytest
+import tomli_w
+
+if sys.version_info[:2] < (3, 11):
+    import tomli as tomllib  # type: ignore[unused-ignore,import-not-found]
+else:
+    import tomllib
+
+from qualibrate_config.cli.config import config_command
+from qualibrate_config.core import lock as lock_m
+from qualibrate_config.core.project.create import create_project
+from qualibrate_config.core.project.switch import switch_project
+from qualibrate_config.core.project.update import update_project
+from qualibrate_config.models import QualibrateConfig
+from qualibrate_config.vars import QUALIBRATE_CONFIG_KEY
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="fcntl locks are POSIX only"
+)
+
+_mp = multiprocessing.get_context("fork")
+
+
+def _hold_lock(config_path, shared, acquired, release):
+    with lock_m.config_lock(config_path, shared=shared):
+        acquired.set()
+        release.wait(10)
+
+
+def _increment_counter(config_path, iterations):
+    for _ in range(iterations):
+        with lock_m.config_lock(config_path):
+            with config_path.open("rb") as f_in:
+                data = tomllib.load(f_in)
+            data["counter"] += 1
+            with config_path.open("wb") as f_out:
+                tomli_w.dump(data, f_out)
+
+
+def _create_same_project(config_path, results):
+    try:
+        create_project(config_path, "shared", None, None, None)
+    except ValueError:
+        results.put(False)
+    else:
+        results.put(True)
+
+
+def _run_config_command(config_path, tmp_path, iterations):
+    for i in range(iterations):
+        config_command.main(
+            [
+                "--config-path",
+                str(config_path),
+                "--auto-accept",
+                "--storage-location",
+                str(tmp_path / "storage" / str(i)),
+                "--calibration-library-folder",
+                str(tmp_path / "calibrations"),
+                "--log-folder",
+                str(tmp_path / "logs"),
+            ],
+            standalone_mode=False,
+        )
+
+
+def _run_switch_project(config_path, iterations):
+    for i in range(iterations):
+        switch_project(config_path, f"p{i % 2}", raise_if_error=True)
+
+
+def _run_update_project(config_path, tmp_path, iterations):
+    for i in range(iterations):
+        update_project(
+            config_path, "p0", quam_state_path=tmp_path / "quam" / str(i)
+        )
+
+
+@pytest.fixture
+def held_lock(tmp_path):
+    processes = []
+
+    def _hold(shared: bool):
+        acquired, release = _mp.Event(), _mp.Event()
+        process = _mp.Process(
+            target=_hold_lock,
+            args=(tmp_path / "config.toml", shared, acquired, release),
+        )
+        process.start()
+        assert acquired.wait(10)
+        processes.append((process, release))
+
+    yield _hold
+    for process, release in processes:
+        release.set()
+        process.join(10)
+
+
+def test_get_config_lock_path_file(tmp_path):
+    assert (
+        lock_m.get_config_lock_path(tmp_path / "config.toml")
+        == tmp_path / lock_m.CONFIG_LOCK_FILENAME
+    )
+
+
+def test_get_config_lock_path_dir(tmp_path):
+    assert (
+        lock_m.get_config_lock_path(tmp_path)
+        == tmp_path / lock_m.CONFIG_LOCK_FILENAME
+    )
+
+
+def test_exclusive_lock_times_out_when_held(tmp_path, held_lock):
+    held_lock(shared=False)
+    with (
+        pytest.raises(lock_m.ConfigLockTimeoutError),
+        lock_m.config_lock(tmp_path / "config.toml", timeout=0.1),
+    ):
+        pass
+
+
+def test_shared_lock_times_out_when_exclusive_held(tmp_path, held_lock):
+    held_lock(shared=False)
+    with (
+        pytest.raises(lock_m.ConfigLockTimeoutError),
+        lock_m.config_lock(tmp_path / "config.toml", shared=True, timeout=0.1),
+    ):
+        pass
+
+
+def test_shared_locks_coexist(tmp_path, held_lock):
+    held_lock(shared=True)
+    with lock_m.config_lock(tmp_path / "config.toml", shared=True, timeout=0.1):
+        pass
+
+
+def test_exclusive_lock_blocked_by_shared(tmp_path, held_lock):
+    held_lock(shared=True)
+    with (
+        pytest.raises(lock_m.ConfigLockTimeoutError),
+        lock_m.config_lock(tmp_path / "config.toml", timeout=0.1),
+    ):
+        pass
+
+
+def test_lock_is_reentrant_within_thread(tmp_path):
+    config_path = tmp_path / "config.toml"
+    with (
+        lock_m.config_lock(config_path),
+        lock_m.config_lock(config_path),
+        lock_m.config_lock(config_path, shared=True),
+    ):
+        pass
+    # released: another thread can take it now
+    errors = []
+
+    def _take():
+        try:
+            with lock_m.config_lock(config_path, timeout=1):
+                pass
+        except Exception as ex:
+            errors.append(ex)
+
+    thread = threading.Thread(target=_take)
+    thread.start()
+    thread.join()
+    assert errors == []
+
+
+def test_lock_excludes_other_threads(tmp_path):
+    config_path = tmp_path / "config.toml"
+    errors = []
+
+    def _take():
+        try:
+            with lock_m.config_lock(config_path, timeout=0.1):
+                pass
+        except lock_m.ConfigLockTimeoutError as ex:
+            errors.append(ex)
+
+    with lock_m.config_lock(config_path):
+        thread = threading.Thread(target=_take)
+        thread.start()
+        thread.join()
+    assert len(errors) == 1
+
+
+def test_shared_lock_cant_be_upgraded(tmp_path):
+    config_path = tmp_path / "config.toml"
+    with (
+        lock_m.config_lock(config_path, shared=True),
+        pytest.raises(RuntimeError, match="upgrade"),
+        lock_m.config_lock(config_path),
+    ):
+        pass
+
+
+def test_shared_lock_in_missing_dir_is_noop(tmp_path):
+    config_path = tmp_path / "missing" / "config.toml"
+    with lock_m.config_lock(config_path, shared=True):
+        pass
+    assert not config_path.parent.exists()
+
+
+def test_no_lost_updates_under_contention(tmp_path):
+    config_path = tmp_path / "config.toml"
+    with config_path.open("wb") as f_out:
+        tomli_w.dump({"counter": 0}, f_out)
+    workers, iterations = 8, 25
+    processes = [
+        _mp.Process(target=_increment_counter, args=(config_path, iterations))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+    with config_path.open("rb") as f_in:
+        assert tomllib.load(f_in)["counter"] == workers * iterations
+
+
+def test_concurrent_create_same_project_only_one_succeeds(tmp_path):
+    config_path = tmp_path / "config.toml"
+    with config_path.open("wb") as f_out:
+        tomli_w.dump(
+            {
+                QUALIBRATE_CONFIG_KEY: {
+                    "version": QualibrateConfig.version,
+                    "project": "init",
+                    "storage": {"location": str(tmp_path / "storage")},
+                }
+            },
+            f_out,
+        )
+    (tmp_path / "projects").mkdir()
+    results = _mp.Queue()
+    processes = [
+        _mp.Process(target=_create_same_project, args=(config_path, results))
+        for _ in range(6)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get(timeout=60) for _ in processes]
+    for process in processes:
+        process.join(10)
+    assert outcomes.count(True) == 1
+
+
+def test_no_lost_updates_of_concurrent_mutators(tmp_path):
+    config_path = tmp_path / "config.toml"
+    with config_path.open("wb") as f_out:
+        tomli_w.dump(
+            {
+                QUALIBRATE_CONFIG_KEY: {
+                    "version": QualibrateConfig.version,
+                    "project": "p0",
+                    "storage": {"location": str(tmp_path / "storage")},
+                }
+            },
+            f_out,
+        )
+    for project in ("p0", "p1"):
+        create_project(config_path, project, None, None, None)
+    iterations = 20
+    processes = [
+        _mp.Process(
+            target=_run_config_command,
+            args=(config_path, tmp_path, iterations),
+        ),
+        _mp.Process(target=_run_switch_project, args=(config_path, iterations)),
+        _mp.Process(
+            target=_run_update_project,
+            args=(config_path, tmp_path, iterations),
+        ),
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+    with config_path.open("rb") as f_in:
+        config = tomllib.load(f_in)
+    # last value written by each mutator survives the others
+    assert config[QUALIBRATE_CONFIG_KEY]["project"] == "p1"
+    assert config[QUALIBRATE_CONFIG_KEY]["storage"]["location"] == str(
+        tmp_path / "storage" / str(iterations - 1)
+    )
+    with (tmp_path / "projects" / "p0" / "config.toml").open("rb") as f_in:
+        overlay = tomllib.load(f_in)
+    assert overlay["quam"]["state_path"] == str(
+        tmp_path / "quam" / str(iterations - 1)
+    )
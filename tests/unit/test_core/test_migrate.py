@@ -0,0 +1,113 @@
+from copy import deepcopy
+
+import pytest
+import tomli_w
+
+from qualibrate_config import resolvers, validation
+from qualibrate_config.core.migration import migrate
+from qualibrate_config.core.migration.migrations import v5_v6
+from qualibrate_config.file import read_config_file
+
+CONFIG_V5 = {
+    "qualibrate": {
+        "project": "p1",
+        "version": 5,
+        "storage": {"type": "local_storage", "location": "/data"},
+        "app": {"static_site_files": "/static"},
+    }
+}
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.toml"
+    with path.open("wb") as f_out:
+        tomli_w.dump(CONFIG_V5, f_out)
+    return path
+
+
+def test_migrate_in_memory(tmp_path):
+    migrated = migrate.migrate_in_memory(deepcopy(CONFIG_V5), tmp_path)
+    assert migrated == v5_v6.Migrate.forward(deepcopy(CONFIG_V5), tmp_path)
+
+
+def test_migrate_in_memory_latest_version_unchanged(tmp_path):
+    config = v5_v6.Migrate.forward(deepcopy(CONFIG_V5), tmp_path)
+    assert migrate.migrate_in_memory(config, tmp_path) is config
+
+
+@pytest.mark.parametrize(
+    "qualibrate", ({"project": "p"}, {"project": "p", "version": 100})
+)
+def test_migrate_in_memory_invalid_version(tmp_path, qualibrate):
+    with pytest.raises(ValueError):
+        migrate.migrate_in_memory({"qualibrate": qualibrate}, tmp_path)
+
+
+def test_run_migrations_uses_migrate_in_memory(config_path, mocker):
+    migrate_in_memory = mocker.spy(migrate, "migrate_in_memory")
+    migrate.run_migrations(config_path)
+    migrate_in_memory.assert_called_once()
+    assert read_config_file(
+        config_path, solve_references=False
+    ) == v5_v6.Migrate.forward(deepcopy(CONFIG_V5), config_path)
+
+
+def test_persist_migrated_config(config_path):
+    fingerprint = migrate.file_fingerprint(config_path)
+    migrated = migrate.migrate_in_memory(
+        read_config_file(config_path, solve_references=False), config_path
+    )
+    thread = migrate.persist_migrated_config(config_path, migrated, fingerprint)
+    assert thread is not None
+    thread.join()
+    assert read_config_file(config_path, solve_references=False) == migrated
+
+
+def test_persist_migrated_config_skipped_if_file_changed(config_path):
+    fingerprint = migrate.file_fingerprint(config_path)
+    config_path.write_text('[qualibrate]\nversion = 5\nproject = "other"\n')
+    content = config_path.read_text()
+    migrate.persist_migrated_config(
+        config_path, {"qualibrate": {}}, fingerprint, background=False
+    )
+    assert config_path.read_text() == content
+
+
+def test_get_qualibrate_config_migrates_with_single_parse(config_path, mocker):
+    read_spy = mocker.spy(resolvers, "read_config_file")
+    persist = mocker.patch.object(resolvers, "persist_migrated_config")
+    config = resolvers.get_qualibrate_config(config_path)
+    assert config.version == 6
+    assert config.composite.static_site_files.as_posix() == "/static"
+    assert read_spy.call_count == 1
+    persist.assert_called_once()
+    assert persist.call_args.args[1]["qualibrate"]["version"] == 6
+
+
+def test_get_qualibrate_config_persists_migration(config_path, mocker):
+    persist = mocker.spy(resolvers, "persist_migrated_config")
+    resolvers.get_qualibrate_config(config_path)
+    persist.spy_return.join()
+    saved = read_config_file(config_path, solve_references=False)
+    assert saved["qualibrate"]["version"] == 6
+
+
+def test_get_qualibrate_config_without_persist(config_path):
+    content = config_path.read_text()
+    config = resolvers.get_qualibrate_config(
+        config_path, persist_migration=False
+    )
+    assert config.version == 6
+    assert config_path.read_text() == content
+
+
+def test_validate_version_and_migrate_if_needed(config_path, mocker):
+    reread = mocker.spy(validation, "get_config_file_content")
+    config, path = validation.validate_version_and_migrate_if_needed(
+        deepcopy(CONFIG_V5), config_path
+    )
+    assert path == config_path
+    assert config["qualibrate"]["version"] == 6
+    assert read_config_file(config_path, solve_references=False) == config
+    reread.assert_not_called()
@@ -0,0 +1,108 @@
+import datetime
+
+import pytest
+
+from qualibrate_config.core.overrides import (
+    apply_env_overrides,
+    env_override_items,
+    env_overrides,
+    parse_env_value,
+)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    (
+        ("42", 42),
+        ("1.5", 1.5),
+        ("true", True),
+        ('"42"', "42"),
+        ("[1, 2]", [1, 2]),
+        ("{a = 1}", {"a": 1}),
+        ("2024-01-02", datetime.date(2024, 1, 2)),
+        ("/data/storage", "/data/storage"),
+        ("some text", "some text"),
+        ("", ""),
+    ),
+)
+def test_parse_env_value(value, expected):
+    assert parse_env_value(value) == expected
+
+
+def test_env_override_items():
+    environ = {
+        "QUALIBRATE__B": "2",
+        "QUALIBRATE__A": "1",
+        "QUALIBRATE_CONFIG_FILE": "/config.toml",
+        "HOME": "/home",
+    }
+    assert env_override_items(environ) == (
+        ("QUALIBRATE__A", "1"),
+        ("QUALIBRATE__B", "2"),
+    )
+
+
+def test_env_overrides_nested_keys():
+    items = env_override_items(
+        {
+            "QUALIBRATE__QUALIBRATE__STORAGE__LOCATION": "/data",
+            "QUALIBRATE__QUALIBRATE__PROJECT": "p2",
+            "QUALIBRATE__QUAM__STATE_PATH": "/state",
+        }
+    )
+    assert env_overrides(items) == {
+        "qualibrate": {"project": "p2", "storage": {"location": "/data"}},
+        "quam": {"state_path": "/state"},
+    }
+    # parsing is cached
+    assert env_overrides(items) is env_overrides(items)
+
+
+def test_env_overrides_string_keys_not_parsed():
+    items = env_override_items(
+        {
+            "QUALIBRATE__QUALIBRATE__PROJECT": "123",
+            "QUALIBRATE__QUALIBRATE__STORAGE__LOCATION": "2024-01-01",
+            "QUALIBRATE__QUALIBRATE__DATABASE__PASSWORD": "true",
+            "QUALIBRATE__QUAM__STATE_PATH": "nan",
+            "QUALIBRATE__QUALIBRATE__TIMEOUT": "123",
+        }
+    )
+    assert env_overrides(items) == {
+        "qualibrate": {
+            "project": "123",
+            "storage": {"location": "2024-01-01"},
+            "database": {"password": "true"},
+            "timeout": 123,
+        },
+        "quam": {"state_path": "nan"},
+    }
+
+
+def test_env_overrides_invalid_and_conflicting_ignored():
+    items = env_override_items(
+        {
+            "QUALIBRATE__A": "1",
+            "QUALIBRATE__A__B": "2",
+            "QUALIBRATE__C____D": "3",
+            "QUALIBRATE__E": "4",
+        }
+    )
+    assert env_overrides(items) == {"a": 1, "e": 4}
+
+
+def test_env_overrides_from_environ(monkeypatch):
+    monkeypatch.setenv("QUALIBRATE__X__Y", "5")
+    assert env_overrides()["x"] == {"y": 5}
+
+
+def test_apply_env_overrides():
+    items = (("QUALIBRATE__A__B", "2"),)
+    config = {"a": {"b": 1, "c": 3}, "d": 4}
+    assert apply_env_overrides(config, items) == {
+        "a": {"b": 2, "c": 3},
+        "d": 4,
+    }
+    # cached overrides aren't shared with the config
+    config["a"]["b"] = 10
+    assert env_overrides(items) == {"a": {"b": 2}}
@@ -0,0 +1,296 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+import tomli_w
+
+if sys.version_info[:2] < (3, 11):
+    import tomli as tomllib  # type: ignore[unused-ignore,import-not-found]
+else:
+    import tomllib
+
+from qualibrate_config.core.lock import config_lock
+from qualibrate_config.core.project import apply as apply_m
+from qualibrate_config.core.project.apply import (
+    ProjectOperation,
+    ProjectsManifest,
+    apply_projects,
+    parse_manifest,
+    read_manifest,
+)
+from qualibrate_config.core.project.create import create_project
+from qualibrate_config.core.project.p_list import list_projects
+from qualibrate_config.models import QualibrateConfig
+
+
+@pytest.fixture
+def config_path(tmp_path: Path) -> Path:
+    config_path = tmp_path / "config.toml"
+    config = {
+        "qualibrate": {
+            "version": QualibrateConfig.version,
+            "project": "alpha",
+            "storage": {"type": "local_storage", "location": "/data"},
+            "calibration_library": {"folder": "/calibrations"},
+        },
+        "quam": {"state_path": "/quam"},
+    }
+    config_path.write_text(tomli_w.dumps(config))
+    for project in ("alpha", "beta"):
+        project_path = tmp_path / "projects" / project
+        project_path.mkdir(parents=True)
+        (project_path / "config.toml").write_text('x = "old"\n')
+    return config_path
+
+
+def _projects(config_path: Path) -> set[str]:
+    return set(list_projects(config_path.parent))
+
+
+def _overlay(config_path: Path, name: str) -> dict:
+    overlay_path = config_path.parent / "projects" / name / "config.toml"
+    return tomllib.loads(overlay_path.read_text())
+
+
+def test_read_manifest_resolves_relative_paths(tmp_path):
+    manifest_path = tmp_path / "manifest.toml"
+    manifest_path.write_text(
+        'switch = "a"\n'
+        "[[project]]\n"
+        'name = "a"\n'
+        'storage_location = "storage/a"\n'
+        "[[project]]\n"
+        'name = "b"\n'
+        'action = "delete"\n'
+    )
+
+    assert read_manifest(manifest_path) == ProjectsManifest(
+        operations=(
+            ProjectOperation(
+                "create", "a", storage_location=tmp_path / "storage" / "a"
+            ),
+            ProjectOperation("delete", "b"),
+        ),
+        switch="a",
+    )
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"projects": []},
+        {"project": {"name": "a"}},
+        {"project": [{"action": "create"}]},
+        {"project": [{"name": "a", "action": "rename"}]},
+        {"project": [{"name": "a", "storage": "/x"}]},
+        {
+            "project": [
+                {"name": "a", "action": "delete", "quam_state_path": "x"}
+            ]
+        },
+        {"switch": 1},
+    ],
+)
+def test_parse_manifest_invalid(data):
+    with pytest.raises(ValueError):
+        parse_manifest(data)
+
+
+def test_apply_projects(mocker, config_path, tmp_path):
+    remove = mocker.patch.object(apply_m, "remove_in_background")
+    manifest = ProjectsManifest(
+        operations=(
+            ProjectOperation(
+                "create",
+                "gamma",
+                storage_location=tmp_path / "storage" / "gamma",
+                calibration_library_folder=Path("/calibrations"),
+            ),
+            ProjectOperation("create", "delta"),
+            ProjectOperation(
+                "update", "beta", quam_state_path=tmp_path / "quam" / "beta"
+            ),
+            ProjectOperation("delete", "alpha"),
+        ),
+        switch="gamma",
+    )
+
+    apply_projects(config_path, manifest)
+
+    assert _projects(config_path) == {"beta", "gamma", "delta"}
+    (trashed_path,) = (tmp_path / "projects" / ".trash").iterdir()
+    remove.assert_called_once_with(trashed_path, False)
+    # values equal to the base config aren't written
+    assert _overlay(config_path, "gamma") == {
+        "qualibrate": {
+            "storage": {"location": str(tmp_path / "storage" / "gamma")}
+        }
+    }
+    assert _overlay(config_path, "delta") == {}
+    assert _overlay(config_path, "beta") == {
+        "quam": {"state_path": str(tmp_path / "quam" / "beta")}
+    }
+    assert (tmp_path / "storage" / "gamma").is_dir()
+    assert (tmp_path / "quam" / "beta").is_dir()
+    config = tomllib.loads(config_path.read_text())
+    assert config["qualibrate"]["project"] == "gamma"
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="fcntl locks are POSIX only"
+)
+def test_apply_projects_removes_deleted_without_lock(mocker, config_path):
+    errors = []
+
+    def _remove(path, detach):
+        def _read():
+            try:
+                with config_lock(config_path, shared=True, timeout=0.5):
+                    pass
+            except Exception as ex:
+                errors.append(ex)
+
+        thread = threading.Thread(target=_read)
+        thread.start()
+        thread.join()
+
+    remove = mocker.patch.object(
+        apply_m, "remove_in_background", side_effect=_remove
+    )
+
+    apply_projects(
+        config_path,
+        ProjectsManifest((ProjectOperation("delete", "beta"),)),
+        detach=True,
+    )
+
+    remove.assert_called_once()
+    assert remove.call_args.args[1] is True
+    assert errors == []
+    assert _projects(config_path) == {"alpha"}
+
+
+def test_apply_projects_update_keeps_overlay_comments(config_path, tmp_path):
+    overlay_path = config_path.parent / "projects" / "beta" / "config.toml"
+    overlay_path.write_text(
+        "# beta overlay\n"
+        "[quam]\n"
+        f'state_path = "{tmp_path / "old"}"  # lab state\n'
+    )
+
+    apply_projects(
+        config_path,
+        ProjectsManifest(
+            (
+                ProjectOperation(
+                    "update", "beta", quam_state_path=tmp_path / "new"
+                ),
+            )
+        ),
+    )
+
+    assert overlay_path.read_text() == (
+        "# beta overlay\n"
+        "[quam]\n"
+        f'state_path = "{tmp_path / "new"}"  # lab state\n'
+    )
+
+
+def test_apply_projects_overlay_same_as_create_project(config_path, tmp_path):
+    storage_location = tmp_path / "storage" / "one"
+    create_project(config_path, "one", storage_location, None, None)
+
+    apply_projects(
+        config_path,
+        ProjectsManifest(
+            (ProjectOperation("create", "two", storage_location),)
+        ),
+    )
+
+    assert _overlay(config_path, "two") == _overlay(config_path, "one")
+
+
+def test_apply_projects_reads_base_and_lists_once(mocker, config_path):
+    list_spy = mocker.spy(apply_m, "list_projects")
+    content_spy = mocker.spy(apply_m, "get_config_file_content")
+    manifest = ProjectsManifest(
+        tuple(ProjectOperation("create", f"p{i}") for i in range(10))
+    )
+
+    apply_projects(config_path, manifest)
+
+    list_spy.assert_called_once_with(config_path.parent)
+    content_spy.assert_called_once_with(config_path)
+    assert _projects(config_path) == {"alpha", "beta"} | {
+        f"p{i}" for i in range(10)
+    }
+
+
+@pytest.mark.parametrize(
+    "operations, switch",
+    [
+        ((ProjectOperation("create", "beta"),), None),
+        ((ProjectOperation("update", "missing"),), None),
+        (
+            (
+                ProjectOperation("delete", "beta"),
+                ProjectOperation("update", "beta"),
+            ),
+            None,
+        ),
+        ((ProjectOperation("delete", "alpha"),), None),
+        ((ProjectOperation("delete", "beta"),), "beta"),
+        ((), "missing"),
+    ],
+)
+def test_apply_projects_invalid_manifest_changes_nothing(
+    config_path, operations, switch
+):
+    manifest = ProjectsManifest(
+        (ProjectOperation("create", "gamma"), *operations), switch
+    )
+
+    with pytest.raises(ValueError):
+        apply_projects(config_path, manifest)
+
+    assert _projects(config_path) == {"alpha", "beta"}
+
+
+def test_apply_projects_rolls_back_all(mocker, config_path, tmp_path):
+    existing_storage = tmp_path / "storage" / "existing"
+    existing_storage.mkdir(parents=True)
+    (existing_storage / "data").write_text("data")
+    manifest = ProjectsManifest(
+        operations=(
+            ProjectOperation(
+                "create",
+                "gamma",
+                storage_location=tmp_path / "storage" / "gamma",
+            ),
+            ProjectOperation(
+                "create", "delta", storage_location=existing_storage
+            ),
+            ProjectOperation(
+                "update", "beta", quam_state_path=tmp_path / "quam"
+            ),
+            ProjectOperation("delete", "beta"),
+        ),
+        switch="delta",
+    )
+    mocker.patch.object(
+        apply_m, "switch_project", side_effect=ValueError("fail")
+    )
+    rollback_spy = mocker.spy(apply_m, "rollback_project_creation")
+
+    with pytest.raises(ValueError, match="fail"):
+        apply_projects(config_path, manifest)
+
+    assert _projects(config_path) == {"alpha", "beta"}
+    assert _overlay(config_path, "beta") == {"x": "old"}
+    assert not (tmp_path / "storage" / "gamma").exists()
+    # existing storage isn't removed
+    assert (existing_storage / "data").read_text() == "data"
+    assert rollback_spy.call_count == 2
+    config = tomllib.loads(config_path.read_text())
+    assert config["qualibrate"]["project"] == "alpha"
@@ -0,0 +1,214 @@
+import errno
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+import tomli_w
+
+if sys.version_info[:2] < (3, 11):
+    import tomli as tomllib  # type: ignore[unused-ignore,import-not-found]
+else:
+    import tomllib
+
+from qualibrate_config.core.lock import config_lock
+from qualibrate_config.core.project import clone as clone_m
+from qualibrate_config.core.project.clone import clone_project, clone_tree
+from qualibrate_config.core.project.p_list import list_projects
+from qualibrate_config.models import QualibrateConfig
+
+
+def _make_tree(root: Path) -> None:
+    (root / "2024-01-01" / "#1_node").mkdir(parents=True)
+    (root / "2024-01-01" / "#1_node" / "data.json").write_text("{}")
+    (root / "2024-01-02").mkdir()
+    (root / "top.txt").write_text("top")
+    (root / "link").symlink_to("top.txt")
+
+
+def _tree(root: Path) -> dict[str, str | None]:
+    return {
+        p.relative_to(root).as_posix(): (p.read_text() if p.is_file() else None)
+        for p in root.rglob("*")
+    }
+
+
+@pytest.mark.parametrize("mode", clone_m.CLONE_MODES)
+def test_clone_tree(tmp_path, mode):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    _make_tree(src)
+    os.utime(src / "2024-01-01", (1_000_000, 1_000_000))
+
+    clone_tree(src, dst, mode, jobs=2)
+
+    assert _tree(dst) == _tree(src)
+    assert (dst / "link").is_symlink()
+    assert (dst / "2024-01-01").stat().st_mtime == 1_000_000
+    data = dst / "2024-01-01" / "#1_node" / "data.json"
+    if mode == "hardlink":
+        assert data.samefile(src / "2024-01-01" / "#1_node" / "data.json")
+    if mode == "copy":
+        assert data.stat().st_nlink == 1
+
+
+def test_clone_tree_falls_back_to_copy(mocker, tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    _make_tree(src)
+    mocker.patch.object(
+        clone_m, "_reflink", side_effect=OSError(errno.EOPNOTSUPP, "")
+    )
+    link = mocker.patch.object(
+        clone_m.os, "link", side_effect=OSError(errno.EXDEV, "")
+    )
+    copy2 = mocker.spy(clone_m.shutil, "copy2")
+
+    clone_tree(src, dst)
+
+    assert _tree(dst) == _tree(src)
+    # unsupported way isn't tried again
+    link.assert_called_once()
+    assert copy2.call_count == 2
+
+
+@pytest.fixture
+def config_path(tmp_path: Path) -> Path:
+    config_path = tmp_path / "config.toml"
+    config = {
+        "qualibrate": {
+            "version": QualibrateConfig.version,
+            "project": "src",
+            "storage": {
+                "type": "local_storage",
+                "location": str(
+                    tmp_path / "storage" / "${#/qualibrate/project}"
+                ),
+            },
+        },
+        "quam": {"state_path": str(tmp_path / "quam_state")},
+    }
+    config_path.write_text(tomli_w.dumps(config))
+    project_path = tmp_path / "projects" / "src"
+    project_path.mkdir(parents=True)
+    (project_path / "config.toml").write_text(
+        tomli_w.dumps(
+            {
+                "quam": {"state_path": str(tmp_path / "src" / "quam_state")},
+                "qualibrate": {"calibration_library": {"folder": "/cal"}},
+            }
+        )
+    )
+    _make_tree(tmp_path / "storage" / "src")
+    (tmp_path / "src" / "quam_state").mkdir(parents=True)
+    (tmp_path / "src" / "quam_state" / "state.json").write_text("{}")
+    return config_path
+
+
+def _overlay(config_path: Path, name: str) -> dict:
+    overlay_path = config_path.parent / "projects" / name / "config.toml"
+    return tomllib.loads(overlay_path.read_text())
+
+
+def test_clone_project(config_path, tmp_path):
+    clone_project(config_path, "src", "dst")
+
+    assert set(list_projects(tmp_path)) == {"src", "dst"}
+    # storage location template is solved to the new dir itself
+    assert _overlay(config_path, "dst") == {
+        "quam": {"state_path": str(tmp_path / "dst" / "quam_state")},
+        "qualibrate": {"calibration_library": {"folder": "/cal"}},
+    }
+    assert _tree(tmp_path / "storage" / "dst") == _tree(
+        tmp_path / "storage" / "src"
+    )
+    state = tmp_path / "dst" / "quam_state" / "state.json"
+    assert state.read_text() == "{}"
+    assert not state.samefile(tmp_path / "src" / "quam_state" / "state.json")
+
+
+def test_clone_project_explicit_paths(config_path, tmp_path):
+    clone_project(
+        config_path,
+        "src",
+        "dst",
+        tmp_path / "other_storage",
+        tmp_path / "other_state",
+        mode="copy",
+    )
+
+    overlay = _overlay(config_path, "dst")
+    assert overlay["qualibrate"]["storage"] == {
+        "location": str(tmp_path / "other_storage")
+    }
+    assert overlay["quam"] == {"state_path": str(tmp_path / "other_state")}
+    assert (tmp_path / "other_storage" / "top.txt").read_text() == "top"
+    assert (tmp_path / "other_state" / "state.json").is_file()
+
+
+@pytest.mark.parametrize(
+    "source, target",
+    [("missing", "dst"), ("src", "src"), ("src", ".trash")],
+)
+def test_clone_project_invalid_names(config_path, source, target):
+    with pytest.raises(ValueError):
+        clone_project(config_path, source, target)
+
+
+def test_clone_project_existing_target_path(config_path, tmp_path):
+    (tmp_path / "storage" / "dst").mkdir()
+
+    with pytest.raises(ValueError, match="already exists"):
+        clone_project(config_path, "src", "dst")
+
+    assert list_projects(tmp_path) == ["src"]
+
+
+def test_clone_project_rolls_back(mocker, config_path, tmp_path):
+    original_clone_tree = clone_m.clone_tree
+
+    def clone_tree_mock(src, dst, *args):
+        if "quam_state" in src.parts:
+            raise OSError("fail")
+        original_clone_tree(src, dst, *args)
+
+    mocker.patch.object(clone_m, "clone_tree", side_effect=clone_tree_mock)
+
+    with pytest.raises(ValueError, match="fail"):
+        clone_project(config_path, "src", "dst")
+
+    assert list_projects(tmp_path) == ["src"]
+    assert not (tmp_path / "storage" / "dst").exists()
+    assert (tmp_path / "storage" / "src" / "top.txt").is_file()
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="fcntl locks are POSIX only"
+)
+def test_clone_project_tree_cloned_without_lock(mocker, config_path, tmp_path):
+    original_clone_tree = clone_m.clone_tree
+    errors = []
+
+    def clone_tree_mock(src, dst, *args):
+        def _read():
+            try:
+                with config_lock(config_path, shared=True, timeout=0.5):
+                    pass
+            except Exception as ex:
+                errors.append(ex)
+
+        thread = threading.Thread(target=_read)
+        thread.start()
+        thread.join()
+        # project and target dirs are created before cloning
+        assert "dst" in list_projects(tmp_path)
+        assert dst.is_dir()
+        original_clone_tree(src, dst, *args)
+
+    mocker.patch.object(clone_m, "clone_tree", side_effect=clone_tree_mock)
+
+    clone_project(config_path, "src", "dst")
+
+    assert errors == []
+    assert _tree(tmp_path / "storage" / "dst") == _tree(
+        tmp_path / "storage" / "src"
+    )
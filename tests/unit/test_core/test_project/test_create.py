@@ -7,13 +7,16 @@ if sys.version_info[:2] < (3, 11):
 else:
     import tomllib
 
+from copy import deepcopy
 from pathlib import Path
 from types import SimpleNamespace
 
 import click
 import jsonpatch
+import tomli_w
 from pydantic import BaseModel, computed_field
 
+from qualibrate_config.core.layered import OverlayBuilder
 from qualibrate_config.core.project import create as create_m
 from qualibrate_config.models import PathSerializer
 from qualibrate_config.vars import (
@@ -243,11 +246,100 @@ def test_jsonpatch_to_dict_nested_fields():
     assert d["foo"]["baz"] == 2
 
 
+_BASE_CONFIG = {
+    "qualibrate": {
+        "version": 5,
+        "project": "init",
+        "storage": {"type": "local_storage", "location": "/data/init"},
+        "calibration_library": {"resolver": "r", "folder": "/cal"},
+        "database": {"host": "localhost", "port": 5432},
+    },
+    "quam": {"state_path": "/quam/init"},
+}
+
+
+@pytest.mark.parametrize(
+    "args",
+    (
+        (None, None, None, None, None),
+        (Path("/data/p"), None, None, None, None),
+        (Path("/data/init"), Path("/cal"), Path("/quam/p"), None, None),
+        (None, Path("/cal2"), Path("/quam/init"), None, None),
+        (
+            None,
+            None,
+            None,
+            SimpleNamespace(
+                host="localhost",
+                port=5433,
+                database="db",
+                username="u",
+                password="p",
+            ),
+            SimpleNamespace(is_connected=True),
+        ),
+    ),
+)
+@pytest.mark.parametrize(
+    "base", (_BASE_CONFIG, {}, {"qualibrate": {"version": 5}})
+)
+def test_overlay_builder_same_as_jsonpatch_from_args(base, args):
+    old_config = deepcopy(base)
+    config = create_m.config_for_project_from_args(deepcopy(base), *args, None)
+    expected = create_m.jsonpatch_to_dict(
+        jsonpatch.make_patch(old_config, config)
+    )
+
+    builder = OverlayBuilder(base)
+    create_m.config_for_project_from_args(builder, *args, None)
+
+    assert builder.overlay() == expected
+    assert tomli_w.dumps(builder.overlay()) == tomli_w.dumps(expected)
+
+
+def test_overlay_builder_same_as_jsonpatch_from_context(mocker, paths):
+    from_sources = {
+        "version": 5,
+        "project": "init",
+        "storage": {"type": "local_storage", "location": "/data/new"},
+        "calibration_library": {"resolver": "r", "folder": "/cal"},
+        "log_folder": "/logs",
+    }
+    mocker.patch(
+        "qualibrate_config.core.project.create.qualibrate_config_from_sources",
+        side_effect=lambda *args: deepcopy(from_sources),
+    )
+    mocker.patch(
+        "qualibrate_config.core.project.create.QualibrateTopLevelConfig",
+        side_effect=lambda d: SimpleNamespace(serialize=lambda: d),
+    )
+    context = click.Context(click.Command("dummy"))
+    args = (None, None, paths.quam_state_path, None, None, context)
+    old_config = deepcopy(_BASE_CONFIG)
+    config = create_m.config_for_project_from_context(
+        deepcopy(_BASE_CONFIG), *args
+    )
+    expected = create_m.jsonpatch_to_dict(
+        jsonpatch.make_patch(old_config, config)
+    )
+
+    builder = OverlayBuilder(_BASE_CONFIG)
+    create_m.config_for_project_from_context(builder, *args)
+
+    assert builder.overlay() == expected
+    assert tomli_w.dumps(builder.overlay()) == tomli_w.dumps(expected)
+    assert _BASE_CONFIG["qualibrate"]["storage"]["location"] == "/data/init"
+
+
 @pytest.mark.parametrize("ctx", [None, "ctx"])
 def test_create_project_success(mocker, paths, ctx):
     paths.config_path.write_text("dummy")
     old_config = {"some": "config"}
-    new_config = {"some": "new config"}
+
+    def fill_config(common_config, *args):
+        common_config["some"] = "new config"
+        return common_config
+
     list_projects_patched = mocker.patch(
         "qualibrate_config.core.project.create.list_projects", return_value=[]
     )
@@ -264,15 +356,11 @@ def test_create_project_success(mocker, paths, ctx):
     )
     patched_create_from_args = mocker.patch(
         "qualibrate_config.core.project.create.config_for_project_from_args",
-        return_value=new_config,
+        side_effect=fill_config,
     )
     patched_create_from_ctx = mocker.patch(
         "qualibrate_config.core.project.create.config_for_project_from_context",
-        return_value=new_config,
-    )
-    patched_jsonpatch_to_dict = mocker.patch(
-        "qualibrate_config.core.project.create.jsonpatch_to_dict",
-        return_value=new_config,
+        side_effect=fill_config,
     )
     patched_create_pcf = mocker.patch(
         "qualibrate_config.core.project.create.create_project_config_file"
@@ -298,23 +386,22 @@ def test_create_project_success(mocker, paths, ctx):
         if ctx is None
         else (patched_create_from_ctx, patched_create_from_args)
     )
-    patched_create_c.assert_called_once_with(
-        old_config,
+    patched_create_c.assert_called_once()
+    builder, *args = patched_create_c.call_args.args
+    assert isinstance(builder, OverlayBuilder)
+    assert args == [
         paths.storage_location,
         None,
         paths.quam_state_path,
         None,
         None,
         ctx,
-    )
+    ]
     patched_create_nc.assert_not_called()
-    patched_jsonpatch_to_dict.assert_called_once()
-    assert (
-        patched_jsonpatch_to_dict.call_args[0][0].to_string()
-        == '[{"op": "replace", "path": "/some", "value": "new config"}]'
-    )
+    # base config isn't modified
+    assert old_config == {"some": "config"}
     patched_create_pcf.assert_called_once_with(
-        paths.qualibrate_path, "proj", new_config
+        paths.qualibrate_path, "proj", {"some": "new config"}
     )
     patched_after_create.assert_called_once_with(
         paths.storage_location, paths.quam_state_path
@@ -330,6 +417,11 @@ def test_create_project_exists(mocker, paths):
         create_m.create_project(paths.config_path, "proj", None, None, None)
 
 
+def test_create_project_trash_name_is_reserved(paths):
+    with pytest.raises(ValueError, match="reserved"):
+        create_m.create_project(paths.config_path, ".trash", None, None, None)
+
+
 def test_create_project_fails_and_rolls_back(mocker, tmp_path):
     config_path = tmp_path / "config.toml"
     config_path.write_text("dummy")
@@ -348,10 +440,6 @@ def test_create_project_fails_and_rolls_back(mocker, tmp_path):
         "qualibrate_config.core.project.create.config_for_project_from_args",
         return_value={"some": "config"},
     )
-    mocker.patch(
-        "qualibrate_config.core.project.create.jsonpatch_to_dict",
-        return_value={},
-    )
     mocker.patch(
         "qualibrate_config.core.project.create.create_project_config_file",
         side_effect=OSError("fail"),
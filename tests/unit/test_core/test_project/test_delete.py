@@ -1,6 +1,10 @@
+import sys
+import threading
+
 import pytest
 
 import qualibrate_config.core.project.delete as delete_module
+from qualibrate_config.core.project.p_list import list_projects
 
 
 def test_delete_project_success(mocker, tmp_path):
@@ -92,3 +96,69 @@ def test_delete_project_path_is_none(mocker, tmp_path):
 
     with pytest.raises(RuntimeError, match="Can't resolve project"):
         delete_module.delete_project(config_path, project)
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    config_path = tmp_path / "config.toml"
+    config_path.write_text('[qualibrate]\nproject = "active"\n')
+    for project in ("active", "old"):
+        project_path = tmp_path / "projects" / project
+        project_path.mkdir(parents=True)
+        (project_path / "config.toml").write_text("")
+    return config_path
+
+
+def test_delete_project_background(mocker, config_path):
+    qualibrate_path = config_path.parent
+    remove_patched = mocker.patch(
+        "qualibrate_config.core.project.delete.remove_in_background"
+    )
+
+    delete_module.delete_project(
+        config_path, "old", background=True, detach=True
+    )
+
+    assert list_projects(qualibrate_path) == ["active"]
+    (trashed_path,) = (qualibrate_path / "projects" / ".trash").iterdir()
+    assert trashed_path.name.startswith("old-")
+    assert (trashed_path / "config.toml").is_file()
+    remove_patched.assert_called_once_with(trashed_path, True)
+
+
+def test_remove_in_background_thread(tmp_path):
+    path = tmp_path / "trashed"
+    (path / "nested").mkdir(parents=True)
+    (path / "nested" / "file").write_text("data")
+
+    delete_module.remove_in_background(path)
+
+    for thread in threading.enumerate():
+        if thread.name == "qualibrate-project-remove":
+            thread.join()
+    assert not path.exists()
+
+
+def test_remove_in_background_detached(mocker, tmp_path):
+    popen_patched = mocker.patch(
+        "qualibrate_config.core.project.delete.subprocess.Popen"
+    )
+
+    delete_module.remove_in_background(tmp_path / "trashed", detach=True)
+
+    popen_patched.assert_called_once()
+    command = popen_patched.call_args.args[0]
+    assert command[0] == sys.executable
+    assert command[-1] == str(tmp_path / "trashed")
+
+
+def test_purge_trash(config_path):
+    qualibrate_path = config_path.parent
+    for project in ("active", "old"):
+        delete_module.move_project_to_trash(qualibrate_path, project)
+    trash_path = qualibrate_path / "projects" / ".trash"
+    assert len(list(trash_path.iterdir())) == 2
+
+    assert delete_module.purge_trash(config_path) == (2, [])
+    assert list(trash_path.iterdir()) == []
+    assert delete_module.purge_trash(config_path) == (0, [])
@@ -1,3 +1,7 @@
+import json
+import os
+import threading
+import time
 from datetime import datetime
 from os import stat_result
 
@@ -13,141 +17,45 @@ def test_dt_from_ts_conversion():
     assert dt.timestamp() == round(ts)
 
 
-def test_created_at_from_storage_no_dirs(mocker, tmp_path):
-    mtime_ts = 1754298000
-    storage_stat = stat_result(
-        [16832, -1, -1, 2, 1000, 1000, 4096, 1754377837, mtime_ts, 1754299000]
-    )
-    dt = datetime.fromtimestamp(mtime_ts)
-    patched_dt_from_ts = mocker.patch(
-        "qualibrate_config.core.project.p_list._dt_from_ts", return_value=dt
-    )
-    patched_stat_ctime = mocker.patch(
-        "qualibrate_config.core.project.p_list._stat_ctime"
-    )
-    patched_file_stat_ctime = mocker.patch(
-        "qualibrate_config.core.project.p_list._file_stat_ctime"
-    )
-    assert p_list._created_at_from_storage(tmp_path, storage_stat) == dt
-    patched_stat_ctime.assert_called_once_with(storage_stat)
-    patched_dt_from_ts.assert_called_once()
-    patched_file_stat_ctime.assert_not_called()
-
-
-@pytest.mark.parametrize(
-    "storage_ts, subdir_ts, expected",
-    (
-        (1754299000, 1754298000, 1754298000),
-        (1754298000, 1754299000, 1754298000),
-    ),
-)
-def test_created_at_from_storage_with_dirs_subdir_ctime(
-    mocker, tmp_path, storage_ts, subdir_ts, expected
-):
-    subdir = tmp_path / "a" / "#node"
-    storage_stat = stat_result(
-        [16832, -1, -1, 2, 1000, 1000, 4096, 1754377837, 1754377837, storage_ts]
-    )
-    dt = datetime.fromtimestamp(subdir_ts)
-    subdir.mkdir(parents=True)
-    patched_file_stat_ctime = mocker.patch(
-        "qualibrate_config.core.project.p_list._file_stat_ctime",
-        return_value=subdir_ts,
-    )
-    patched_stat_ctime = mocker.patch(
-        "qualibrate_config.core.project.p_list._stat_ctime",
-        return_value=storage_ts,
-    )
-    patched_dt_from_ts = mocker.patch(
-        "qualibrate_config.core.project.p_list._dt_from_ts", return_value=dt
-    )
-    result = p_list._created_at_from_storage(tmp_path, storage_stat)
-    assert isinstance(result, datetime)
-    assert patched_file_stat_ctime.call_count == 2
-    patched_file_stat_ctime.assert_has_calls(
-        [mocker.call(subdir), mocker.call(subdir)]
-    )
-    patched_stat_ctime.assert_called_once_with(storage_stat)
-    patched_dt_from_ts.assert_called_once_with(expected)
-
-
-def test_last_modified_at_from_storage_no_dirs(mocker, tmp_path):
-    mtime_ts = 1754298000
-    storage_stat = stat_result(
-        [16832, -1, -1, 2, 1000, 1000, 4096, 1754377837, mtime_ts, 1754299000]
-    )
-    dt = datetime.fromtimestamp(mtime_ts)
-    patched_dt_from_ts = mocker.patch(
-        "qualibrate_config.core.project.p_list._dt_from_ts", return_value=dt
-    )
-    patched_file_stat_mtime = mocker.patch(
-        "qualibrate_config.core.project.p_list._file_stat_mtime"
-    )
-    assert p_list._last_modified_at_from_storage(tmp_path, storage_stat) == dt
-    patched_dt_from_ts.assert_called_once_with(mtime_ts)
-    patched_file_stat_mtime.assert_not_called()
-
-
 @pytest.mark.parametrize(
-    "storage_ts, subdir_ts, expected",
+    "scan, storage_ts, expected",
     (
-        (1754300000, 1754301000, 1754301000),
-        (1754302000, 1754301000, 1754302000),
+        ((0, None, None), (1754300000, 1754301000), (1754300000, 1754301000)),
+        (
+            (2, 1754200000, 1754400000),
+            (1754300000, 1754301000),
+            (1754200000, 1754400000),
+        ),
+        (
+            (2, 1754305000, 1754300500),
+            (1754300000, 1754301000),
+            (1754300000, 1754301000),
+        ),
     ),
 )
-def test_last_modified_at_from_storage_with_dirs(
-    mocker, tmp_path, storage_ts, subdir_ts, expected
-):
-    subdir = tmp_path / "a" / "#node"
-    subdir.mkdir(parents=True)
-
-    storage_stat = stat_result(
-        [16832, -1, -1, 2, 1000, 1000, 4096, 1754377837, storage_ts, 1754377837]
-    )
-    dt = datetime.fromtimestamp(expected)
-
-    patched_file_stat_mtime = mocker.patch(
-        "qualibrate_config.core.project.p_list._file_stat_mtime",
-        return_value=subdir_ts,
-    )
-    patched_dt_from_ts = mocker.patch(
-        "qualibrate_config.core.project.p_list._dt_from_ts", return_value=dt
-    )
-
-    result = p_list._last_modified_at_from_storage(tmp_path, storage_stat)
-    assert isinstance(result, datetime)
-    assert result == dt
-    assert patched_file_stat_mtime.call_count == 2
-    patched_file_stat_mtime.assert_has_calls(
-        [mocker.call(subdir), mocker.call(subdir)]
+def test_storage_stat(mocker, tmp_path, scan, storage_ts, expected):
+    ctime, mtime = storage_ts
+    mocker.patch(
+        "qualibrate_config.core.project.p_list.scan_storage",
+        return_value=scan,
     )
-    patched_dt_from_ts.assert_called_once_with(expected)
-
-
-def test_storage_stat_no_subdirs(mocker, tmp_path):
-    storage_path = tmp_path
-
-    mocker.patch("pathlib.Path.glob", return_value=[])
-    ts = 1754300000
-    dt = datetime.fromtimestamp(ts)
     mocker.patch(
         "pathlib.Path.stat",
         return_value=stat_result(
-            [16832, -1, -1, 2, 1000, 1000, 4096, ts, ts, ts]
+            [16832, -1, -1, 2, 1000, 1000, 4096, mtime, mtime, ctime]
         ),
     )
     mocker.patch(
-        "qualibrate_config.core.project.p_list._created_at_from_storage",
-        return_value=dt,
+        "qualibrate_config.core.project.p_list.stat_ctime",
+        return_value=ctime,
     )
-    mocker.patch(
-        "qualibrate_config.core.project.p_list._last_modified_at_from_storage",
-        return_value=dt,
+    result = p_list._storage_stat(tmp_path)
+    assert result == (
+        scan[0],
+        datetime.fromtimestamp(expected[0]),
+        datetime.fromtimestamp(expected[1]),
     )
 
-    result = p_list._storage_stat(storage_path)
-    assert result == (0, dt, dt)
-
 
 def test_project_stat_dir(mocker, tmp_path):
     c_ts = 1754300000
@@ -271,10 +179,24 @@ def test_verbose_list_projects_requests_config(mocker, tmp_path):
         ),
     )
 
+    base_config = {"qualibrate": {"project": "p1"}}
+    read = mocker.patch(
+        "qualibrate_config.core.project.p_list.read_config_file",
+        return_value=base_config,
+    )
+
     p_list.verbose_list_projects(config_path)
 
+    read.assert_called_once_with(
+        config_path, solve_references=False, apply_project=False
+    )
     project_stat.assert_called_once_with(
-        config_path.parent, "p1", config_path, with_config=True
+        config_path.parent,
+        "p1",
+        config_path,
+        with_config=True,
+        base_config=base_config,
+        scan_jobs=None,
     )
 
 
@@ -303,6 +225,14 @@ def test_list_projects_with_two_dirs(mocker, tmp_path):
     mock_path.assert_called_once_with(tmp_path)
 
 
+def test_list_projects_skips_trash(tmp_path):
+    projects_path = tmp_path / "projects"
+    (projects_path / "p1").mkdir(parents=True)
+    (projects_path / ".trash" / "p2-20240101T000000000000").mkdir(parents=True)
+
+    assert p_list.list_projects(tmp_path) == ["p1"]
+
+
 def test_verbose_list_projects(mocker, tmp_path):
     mocker.patch(
         "qualibrate_config.core.project.p_list.list_projects",
@@ -318,7 +248,9 @@ def test_verbose_list_projects(mocker, tmp_path):
         ),
     )
 
-    result = p_list.verbose_list_projects(tmp_path / "config.toml")
+    config_path = tmp_path / "config.toml"
+    config_path.write_text("[qualibrate]\n")
+    result = p_list.verbose_list_projects(config_path)
     assert "p1" in result
     assert isinstance(result["p1"], p_list.Project)
 
@@ -346,3 +278,286 @@ def test_print_verbose_projects_list(mocker, capsys, tmp_path):
     out = capsys.readouterr().out
     assert "Project: proj" in out
     assert "nodes_number" in out
+
+
+def test_project_stat_with_base_config(mocker, tmp_path):
+    project = "proj"
+    project_path = tmp_path / "projects" / project
+    project_path.mkdir(parents=True)
+    (project_path / "config.toml").write_text(
+        '[qualibrate.storage]\nlocation = "${#/qualibrate/root}/proj"\n'
+    )
+    base_config = {
+        "qualibrate": {
+            "project": "other",
+            "root": str(tmp_path),
+            "storage": {"location": "${#/qualibrate/root}/other"},
+        }
+    }
+    read = mocker.spy(p_list, "read_config_file")
+
+    project_obj = p_list.project_stat(
+        tmp_path,
+        project,
+        tmp_path / "config.toml",
+        with_config=True,
+        base_config=base_config,
+    )
+
+    read.assert_not_called()
+    assert project_obj.config is not None
+    assert project_obj.config["qualibrate"]["project"] == project
+    assert project_obj.config["qualibrate"]["storage"]["location"] == str(
+        tmp_path / project
+    )
+    assert base_config["qualibrate"]["project"] == "other"
+
+
+@pytest.mark.parametrize("jobs", (1, 4))
+def test_verbose_list_projects_jobs(mocker, tmp_path, jobs):
+    names = [f"p{i}" for i in range(6)]
+    mocker.patch(
+        "qualibrate_config.core.project.p_list.list_projects",
+        return_value=names,
+    )
+    threads = set()
+
+    def project_stat(qualibrate_path, name, config_path, **kwargs):
+        threads.add(threading.get_ident())
+        # later projects finish first
+        time.sleep(0.01 * (len(names) - int(name[1:])))
+        now = datetime.now().astimezone()
+        return p_list.Project(
+            name=name, nodes_number=0, created_at=now, last_modified_at=now
+        )
+
+    mocker.patch(
+        "qualibrate_config.core.project.p_list.project_stat",
+        side_effect=project_stat,
+    )
+    config_path = tmp_path / "config.toml"
+    config_path.write_text("[qualibrate]\n")
+    result = p_list.verbose_list_projects(config_path, jobs=jobs)
+    assert list(result) == names
+    assert [project.name for project in result.values()] == names
+    assert (len(threads) > 1) == (jobs > 1)
+
+
+@pytest.mark.parametrize("use_index", (True, False))
+def test_project_stat_storage_index(mocker, tmp_path, use_index):
+    project_path = tmp_path / "projects" / "proj"
+    project_path.mkdir(parents=True)
+    storage_path = tmp_path / "storage"
+    (storage_path / "2025-01-01" / "#1_node").mkdir(parents=True)
+    mocker.patch(
+        "qualibrate_config.core.project.p_list.read_config_file",
+        return_value={
+            "qualibrate": {"storage": {"location": str(storage_path)}}
+        },
+    )
+    project_obj = p_list.project_stat(
+        tmp_path, "proj", tmp_path / "config.toml", use_index=use_index
+    )
+    assert project_obj.nodes_number == 1
+    assert (project_path / ".stats").is_file() == use_index
+
+
+def test_project_stat_index_notices_writes_into_node(mocker, tmp_path):
+    project_path = tmp_path / "projects" / "proj"
+    project_path.mkdir(parents=True)
+    storage_path = tmp_path / "storage"
+    node_path = storage_path / "2025-01-01" / "#1_node"
+    node_path.mkdir(parents=True)
+    for path in (node_path, node_path.parent, storage_path):
+        os.utime(path, (1754300000, 1754300000))
+    mocker.patch(
+        "qualibrate_config.core.project.p_list.read_config_file",
+        return_value={
+            "qualibrate": {"storage": {"location": str(storage_path)}}
+        },
+    )
+    config_path = tmp_path / "config.toml"
+    before = p_list.project_stat(tmp_path, "proj", config_path)
+    assert before.last_modified_at.timestamp() == 1754300000
+    (node_path / "data.json").write_text("{}")
+    after = p_list.project_stat(tmp_path, "proj", config_path)
+    assert after.last_modified_at.timestamp() == round(
+        node_path.stat().st_mtime
+    )
+    assert after.last_modified_at > before.last_modified_at
+
+
+def _project(name, nodes_number=0, ts=1754300000):
+    dt = datetime.fromtimestamp(ts).astimezone()
+    return p_list.Project(
+        name=name,
+        nodes_number=nodes_number,
+        created_at=dt,
+        last_modified_at=dt,
+    )
+
+
+def test_iter_projects(mocker, tmp_path):
+    for name in ("p1", "p2"):
+        (tmp_path / "projects" / name).mkdir(parents=True)
+    (tmp_path / "projects" / "file").write_text("")
+    stat = mocker.spy(p_list.Path, "stat")
+    assert sorted(p_list.iter_projects(tmp_path)) == ["p1", "p2"]
+    # only the projects dir itself is checked
+    assert stat.call_count == 1
+
+
+def test_iter_projects_not_dir(tmp_path):
+    with pytest.raises(NotADirectoryError):
+        p_list.iter_projects(tmp_path)
+
+
+def test_iter_verbose_projects_completion_order(mocker, tmp_path):
+    names = ["slow", "fast"]
+    mocker.patch(
+        "qualibrate_config.core.project.p_list.list_projects",
+        return_value=names,
+    )
+
+    def project_stat(qualibrate_path, name, config_path, **kwargs):
+        time.sleep(0.2 if name == "slow" else 0)
+        return _project(name)
+
+    mocker.patch(
+        "qualibrate_config.core.project.p_list.project_stat",
+        side_effect=project_stat,
+    )
+    config_path = tmp_path / "config.toml"
+    config_path.write_text("[qualibrate]\n")
+    projects = p_list.iter_verbose_projects(config_path, jobs=2)
+    assert [project.name for project in projects] == ["fast", "slow"]
+
+
+@pytest.mark.parametrize(
+    "key, reverse, limit, expected",
+    (
+        (None, False, None, [3, 1, 2]),
+        (None, False, 2, [3, 1]),
+        (lambda x: x, False, None, [1, 2, 3]),
+        (lambda x: x, True, 2, [3, 2]),
+        (lambda x: -x, False, 1, [3]),
+    ),
+)
+def test_select(key, reverse, limit, expected):
+    assert list(p_list._select([3, 1, 2], key, reverse, limit)) == expected
+
+
+def test_select_limit_uses_heap(mocker):
+    nsmallest = mocker.spy(p_list.heapq, "nsmallest")
+    assert list(p_list._select(range(100, 0, -1), int, False, 2)) == [1, 2]
+    nsmallest.assert_called_once()
+
+
+@pytest.fixture
+def listed_projects(mocker):
+    projects = [
+        _project("b", nodes_number=5, ts=1754300000),
+        _project("a", nodes_number=1, ts=1754302000),
+        _project("c", nodes_number=9, ts=1754301000),
+    ]
+    mocker.patch(
+        "qualibrate_config.core.project.p_list.iter_projects",
+        side_effect=lambda _: iter(p.name for p in projects),
+    )
+    mocker.patch(
+        "qualibrate_config.core.project.p_list.iter_verbose_projects",
+        side_effect=lambda *args, **kwargs: iter(projects),
+    )
+    return projects
+
+
+@pytest.mark.parametrize(
+    "kwargs, expected",
+    (
+        ({}, "b\na\nc\n"),
+        ({"sort": "name"}, "a\nb\nc\n"),
+        ({"sort": "nodes", "limit": 2}, "c\nb\n"),
+        ({"sort": "last-modified"}, "a\nc\nb\n"),
+        ({"limit": 1}, "b\n"),
+        (
+            {"output_format": "ndjson", "limit": 2},
+            '{"name": "b"}\n{"name": "a"}\n',
+        ),
+        (
+            {"output_format": "json", "sort": "name"},
+            '[{"name": "a"},\n{"name": "b"},\n{"name": "c"}]\n',
+        ),
+    ),
+)
+def test_print_projects_list(
+    listed_projects, capsys, tmp_path, kwargs, expected
+):
+    p_list.print_projects_list(tmp_path / "config.toml", **kwargs)
+    assert capsys.readouterr().out == expected
+
+
+def test_print_projects_list_verbose_json(listed_projects, capsys, tmp_path):
+    p_list.print_projects_list(
+        tmp_path / "config.toml",
+        verbose=True,
+        sort="nodes",
+        limit=1,
+        output_format="json",
+    )
+    (project,) = json.loads(capsys.readouterr().out)
+    assert project["name"] == "c"
+    assert project["nodes_number"] == 9
+
+
+def test_print_projects_list_empty_json(mocker, capsys, tmp_path):
+    mocker.patch(
+        "qualibrate_config.core.project.p_list.iter_projects",
+        return_value=iter(()),
+    )
+    p_list.print_projects_list(tmp_path / "config.toml", output_format="json")
+    assert capsys.readouterr().out == "[]\n"
+
+
+def test_project_stat_solves_only_storage_location(mocker, tmp_path):
+    project_path = tmp_path / "projects" / "proj"
+    project_path.mkdir(parents=True)
+    (project_path / "config.toml").write_text(
+        '[qualibrate]\nroot = "${#/paths/data}"\n'
+    )
+    (tmp_path / "data" / "proj" / "2025-01-01" / "#1_node").mkdir(parents=True)
+    base_config = {
+        "qualibrate": {
+            "root": "/unused",
+            "storage": {"location": "${#/qualibrate/root}/proj"},
+        },
+        "paths": {"data": str(tmp_path / "data")},
+        # not needed for stats, so it isn't solved
+        "broken": {"ref": "${#/missing}"},
+    }
+    read_overlay = mocker.spy(p_list, "read_project_config_file")
+    resolve_all = mocker.spy(p_list, "resolve_references")
+
+    project_obj = p_list.project_stat(
+        tmp_path, "proj", tmp_path / "config.toml", base_config=base_config
+    )
+
+    assert project_obj.nodes_number == 1
+    assert project_obj.config is None
+    assert project_obj.updates == {"qualibrate": {"root": "${#/paths/data}"}}
+    resolve_all.assert_not_called()
+    read_overlay.assert_called_once()
+
+
+def test_storage_location():
+    config = {
+        "qualibrate": {"storage": {"location": "${#/paths/data}/storage"}},
+        "paths": {"data": "/data"},
+    }
+    assert p_list._storage_location(config) == "/data/storage"
+    assert p_list._storage_location({"qualibrate": {}}) is None
+    assert (
+        p_list._storage_location(
+            {"qualibrate": {"storage": {"location": "/plain"}}}
+        )
+        == "/plain"
+    )
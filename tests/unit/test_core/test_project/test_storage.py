@@ -0,0 +1,196 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from qualibrate_config.core.project import storage
+from qualibrate_config.core.project.storage import StorageStat, scan_storage
+
+OLD_TS = 1754300000
+
+
+def _make_storage(storage_path, nodes):
+    for name, mtime in nodes.items():
+        node = storage_path / name
+        node.mkdir(parents=True)
+        os.utime(node, (mtime, mtime))
+
+
+def _age_dirs(storage_path):
+    # date dirs modified long ago aren't rescanned when indexed
+    for path in storage_path.iterdir():
+        if path.is_dir():
+            os.utime(path, (OLD_TS, OLD_TS))
+
+
+@pytest.fixture
+def storage_path(tmp_path):
+    path = tmp_path / "storage"
+    _make_storage(
+        path,
+        {
+            "2025-01-01/#1_a": 1754300000,
+            "2025-01-01/#2_b": 1754302000,
+            "2025-01-02/#3_c": 1754301000,
+            "2025-01-02/not_node": 1754309000,
+        },
+    )
+    (path / "2025-01-02" / "#4_file").write_text("")
+    (path / "#top_level").mkdir()
+    (path / "file").write_text("")
+    return path
+
+
+def test_scan_storage(storage_path):
+    nodes = [
+        storage_path / "2025-01-01" / "#1_a",
+        storage_path / "2025-01-01" / "#2_b",
+        storage_path / "2025-01-02" / "#3_c",
+    ]
+    result = scan_storage(storage_path)
+    assert result == StorageStat(
+        3,
+        min(storage.stat_ctime(node.stat()) for node in nodes),
+        1754302000,
+    )
+
+
+def test_scan_storage_no_nodes(tmp_path):
+    (tmp_path / "2025-01-01").mkdir()
+    assert scan_storage(tmp_path) == StorageStat(0, None, None)
+
+
+def test_scan_storage_single_pass(mocker, tmp_path):
+    _make_storage(tmp_path, {"d1/#1": 1754300000, "d2/#2": 1754301000})
+    scandir = mocker.spy(storage.os, "scandir")
+    assert scan_storage(tmp_path).nodes_number == 2
+    assert scandir.call_count == 3
+
+
+def test_scan_storage_index(mocker, storage_path, tmp_path):
+    index_path = tmp_path / ".stats"
+    _age_dirs(storage_path)
+    expected = scan_storage(storage_path, index_path)
+    index = json.loads(index_path.read_text())
+    assert set(index["dirs"]) == {"2025-01-01", "2025-01-02", "#top_level"}
+    scan_dir = mocker.spy(storage, "_scan_dir")
+    assert scan_storage(storage_path, index_path) == expected
+    # only the latest date dir, its nodes may still be written to
+    scan_dir.assert_called_once_with(str(storage_path / "2025-01-02"))
+
+
+def test_scan_storage_index_notices_writes_into_latest_nodes(
+    storage_path, tmp_path
+):
+    index_path = tmp_path / ".stats"
+    _age_dirs(storage_path)
+    scan_storage(storage_path, index_path)
+    date_dir = storage_path / "2025-01-02"
+    date_dir_mtime = date_dir.stat().st_mtime_ns
+    (date_dir / "#3_c" / "data.json").write_text("{}")
+    assert date_dir.stat().st_mtime_ns == date_dir_mtime
+    result = scan_storage(storage_path, index_path)
+    assert result.max_mtime == (date_dir / "#3_c").stat().st_mtime
+
+
+def test_scan_storage_index_rescans_dirs_modified_last_day(
+    mocker, storage_path, tmp_path
+):
+    index_path = tmp_path / ".stats"
+    _age_dirs(storage_path)
+    now = time.time()
+    for name, hours in (("2025-01-01", 12), ("2025-01-02", 6)):
+        ts = now - hours * 3600
+        os.utime(storage_path / name, (ts, ts))
+    scan_storage(storage_path, index_path)
+    scan_dir = mocker.spy(storage, "_scan_dir")
+    scan_storage(storage_path, index_path)
+    assert sorted(call.args[0] for call in scan_dir.call_args_list) == [
+        str(storage_path / "2025-01-01"),
+        str(storage_path / "2025-01-02"),
+    ]
+
+
+def test_scan_storage_index_rescans_changed_dirs(
+    mocker, storage_path, tmp_path
+):
+    index_path = tmp_path / ".stats"
+    _age_dirs(storage_path)
+    scan_storage(storage_path, index_path)
+    _make_storage(storage_path, {"2025-01-02/#5_d": 1754305000})
+    scan_dir = mocker.spy(storage, "_scan_dir")
+    result = scan_storage(storage_path, index_path)
+    assert result.nodes_number == 4
+    assert result.max_mtime == 1754305000
+    scan_dir.assert_called_once_with(str(storage_path / "2025-01-02"))
+    # dir which was just modified is rescanned next time
+    scan_dir.reset_mock()
+    scan_storage(storage_path, index_path)
+    scan_dir.assert_called_once_with(str(storage_path / "2025-01-02"))
+
+
+def test_scan_storage_index_removed_dir(storage_path, tmp_path):
+    index_path = tmp_path / ".stats"
+    _age_dirs(storage_path)
+    scan_storage(storage_path, index_path)
+    (storage_path / "2025-01-02" / "#3_c").rmdir()
+    (storage_path / "2025-01-02" / "not_node").rmdir()
+    (storage_path / "2025-01-02" / "#4_file").unlink()
+    (storage_path / "2025-01-02").rmdir()
+    assert scan_storage(storage_path, index_path).nodes_number == 2
+
+
+def test_scan_storage_index_other_storage(storage_path, tmp_path):
+    index_path = tmp_path / ".stats"
+    _age_dirs(storage_path)
+    scan_storage(storage_path, index_path)
+    other = tmp_path / "other"
+    _make_storage(other, {"2025-01-01/#1": 1754300000})
+    _age_dirs(other)
+    assert scan_storage(other, index_path).nodes_number == 1
+
+
+def test_scan_storage_invalid_index(storage_path, tmp_path):
+    index_path = tmp_path / ".stats"
+    index_path.write_text("{broken")
+    assert scan_storage(storage_path, index_path).nodes_number == 3
+    assert json.loads(index_path.read_text())["version"] == 1
+
+
+def test_scan_storage_index_not_writable(mocker, storage_path, tmp_path):
+    mocker.patch.object(storage, "atomic_write", side_effect=PermissionError)
+    index_path = tmp_path / ".stats"
+    assert scan_storage(storage_path, index_path).nodes_number == 3
+    assert not index_path.exists()
+
+
+def test_scan_storage_recent_dirs_not_trusted(storage_path, tmp_path):
+    index_path = tmp_path / ".stats"
+    now = time.time()
+    os.utime(storage_path / "2025-01-01", (now, now))
+    scan_storage(storage_path, index_path)
+    dirs = json.loads(index_path.read_text())["dirs"]
+    assert dirs["2025-01-01"][0] == -1
+
+
+@pytest.mark.parametrize("jobs", (1, 3))
+def test_scan_storage_jobs(mocker, tmp_path, jobs):
+    _make_storage(
+        tmp_path,
+        {f"2025-01-{day:02d}/#{day}_node": OLD_TS + day for day in range(6)},
+    )
+    threads = set()
+    scan_dir = storage._scan_dir
+
+    def _scan(path):
+        threads.add(threading.get_ident())
+        time.sleep(0.01)
+        return scan_dir(path)
+
+    mocker.patch.object(storage, "_scan_dir", side_effect=_scan)
+    result = scan_storage(tmp_path, jobs=jobs)
+    assert result.nodes_number == 6
+    assert result.max_mtime == OLD_TS + 5
+    assert 1 < len(threads) <= jobs or jobs == len(threads) == 1
@@ -74,3 +74,22 @@ def test_switch_project_missing_directory_raises(mocker, tmp_path):
     patched_get_project_path.assert_called_once_with(tmp_path, project)
     assert f"Can't switch project to '{project}'" in str(exc_info.value)
     assert project_path.parent.as_posix() in str(exc_info.value)
+
+
+def test_switch_project_keeps_file_formatting(tmp_path):
+    config_path = tmp_path / "config.toml"
+    content = (
+        "# comment\n"
+        "[qualibrate]\n"
+        'project = "alpha"  # active\n'
+        "version = 6\n"
+        "\n"
+        "[quam]\n"
+        "x = 1\n"
+    )
+    config_path.write_text(content)
+    (tmp_path / "projects" / "beta").mkdir(parents=True)
+
+    assert switch_module.switch_project(config_path, "beta") is True
+
+    assert config_path.read_text() == content.replace('"alpha"', '"beta"')
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import pytest
+import tomli_w
+
+from qualibrate_config.core.project.path import get_project_config_path
+from qualibrate_config.core.project.update import update_project
+from qualibrate_config.models import QualibrateConfig
+from qualibrate_config.vars import QUALIBRATE_CONFIG_KEY
+
+
+@pytest.fixture
+def config_path(tmp_path: Path) -> Path:
+    path = tmp_path / "config.toml"
+    path.write_text(
+        tomli_w.dumps(
+            {
+                QUALIBRATE_CONFIG_KEY: {
+                    "version": QualibrateConfig.version,
+                    "project": "init",
+                    "storage": {"location": str(tmp_path / "storage")},
+                }
+            }
+        )
+    )
+    return path
+
+
+def test_update_project_keeps_overlay_comments(
+    tmp_path: Path, config_path: Path
+) -> None:
+    project_config_path = get_project_config_path(tmp_path, "project")
+    project_config_path.parent.mkdir(parents=True)
+    project_config_path.write_text(
+        "# project overlay\n"
+        "[qualibrate.storage]\n"
+        f'location = "{tmp_path / "old"}"  # lab storage\n'
+    )
+
+    update_project(config_path, "project", storage_location=tmp_path / "new")
+
+    assert project_config_path.read_text() == (
+        "# project overlay\n"
+        "[qualibrate.storage]\n"
+        f'location = "{tmp_path / "new"}"  # lab storage\n'
+    )
+    assert (tmp_path / "new").is_dir()
+
+
+def test_update_project_rewrites_overlay_if_cant_patch(
+    tmp_path: Path, config_path: Path
+) -> None:
+    project_config_path = get_project_config_path(tmp_path, "project")
+    project_config_path.parent.mkdir(parents=True)
+    project_config_path.write_text("# empty overlay\n")
+
+    update_project(config_path, "project", storage_location=tmp_path / "new")
+
+    assert project_config_path.read_text() == tomli_w.dumps(
+        {
+            QUALIBRATE_CONFIG_KEY: {
+                "storage": {"location": str(tmp_path / "new")}
+            }
+        }
+    )
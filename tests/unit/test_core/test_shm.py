@@ -0,0 +1,115 @@
+import struct
+import uuid
+
+import pytest
+
+from qualibrate_config.core import shm
+from qualibrate_config.core.snapshot import ConfigSnapshot
+
+
+@pytest.fixture
+def name():
+    return f"qualibrate_config_test_{uuid.uuid4().hex[:12]}"
+
+
+@pytest.fixture
+def segment(name):
+    segment = shm.SharedConfigSegment(name)
+    yield segment
+    segment.close()
+
+
+@pytest.fixture
+def reader(name):
+    reader = shm.SharedConfigReader(name)
+    yield reader
+    reader.close()
+
+
+def _snapshot(tmp_path, version, **data):
+    return ConfigSnapshot(
+        version, tmp_path / "config.toml", ((tmp_path / "a", None),), data
+    )
+
+
+def test_read_missing_segment(reader):
+    assert reader.read() is None
+
+
+def test_write_read(segment, reader, tmp_path):
+    snapshot = _snapshot(tmp_path, 1, a=1)
+    segment.write(snapshot)
+    assert reader.read() == snapshot
+
+
+def test_decoded_only_on_change(segment, reader, tmp_path, mocker):
+    segment.write(_snapshot(tmp_path, 1, a=1))
+    decode = mocker.spy(shm, "decode_message")
+    first = reader.read()
+    assert reader.read() is first
+    assert decode.call_count == 1
+    segment.write(_snapshot(tmp_path, 2, a=2))
+    assert reader.read() == _snapshot(tmp_path, 2, a=2)
+    assert decode.call_count == 2
+
+
+def test_segment_grows(segment, reader, tmp_path):
+    segment.write(_snapshot(tmp_path, 1, a=1))
+    assert reader.read() is not None
+    capacity = segment.capacity
+    big = _snapshot(tmp_path, 2, a="x" * (capacity + 1))
+    segment.write(big)
+    assert segment.capacity > capacity
+    assert reader.read() == big
+
+
+def test_write_in_progress_not_read(segment, reader, tmp_path):
+    segment.write(_snapshot(tmp_path, 1, a=1))
+    buf = segment._shm.buf
+    struct.pack_into("<Q", buf, 8, 3)  # odd sequence number
+    assert reader.read() is None
+
+
+def test_closed_segment_not_read(segment, reader, tmp_path):
+    segment.write(_snapshot(tmp_path, 1, a=1))
+    assert reader.read() is not None
+    segment.close()
+    assert reader.read() is None
+
+
+def test_live_segment_not_replaced(segment, reader, name, tmp_path):
+    snapshot = _snapshot(tmp_path, 1, a=1)
+    segment.write(snapshot)
+    other = shm.SharedConfigSegment(name)
+    with pytest.raises(RuntimeError, match="another publisher"):
+        other.write(_snapshot(tmp_path, 1, a=2))
+    assert reader.read() == snapshot
+
+
+@pytest.mark.parametrize("dead_owner", (True, False))
+def test_stale_segment_replaced(mocker, name, reader, tmp_path, dead_owner):
+    stale = shm.SharedConfigSegment(name)
+    stale.write(_snapshot(tmp_path, 1, a=1))
+    if dead_owner:
+        mocker.patch.object(shm, "_process_alive", return_value=False)
+    else:
+        stale._close(unlink=False)
+    segment = shm.SharedConfigSegment(name)
+    try:
+        segment.write(_snapshot(tmp_path, 1, a=2))
+        assert reader.read() == _snapshot(tmp_path, 1, a=2)
+    finally:
+        segment.close()
+        if stale._shm is not None:
+            # mapping of the replaced segment
+            stale._shm.close()
+            stale._shm = None
+
+
+def test_get_shared_config_name(tmp_path, monkeypatch):
+    monkeypatch.delenv("QUALIBRATE_CONFIG_SHM", raising=False)
+    name = shm.get_shared_config_name(tmp_path / "config.toml")
+    assert name.startswith("qualibrate_config_")
+    assert name != shm.get_shared_config_name(tmp_path / "other.toml")
+    monkeypatch.setenv("QUALIBRATE_CONFIG_SHM", "custom")
+    assert shm.get_shared_config_name(tmp_path / "config.toml") == "custom"
@@ -0,0 +1,57 @@
+import datetime
+
+import pytest
+
+from qualibrate_config.core.fingerprint import file_fingerprint
+from qualibrate_config.core.snapshot import ConfigSnapshot
+
+
+def test_is_current(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text("a = 1\n")
+    snapshot = ConfigSnapshot(
+        1, path, ((path, file_fingerprint(path)),), {"a": 1}
+    )
+    assert snapshot.is_current()
+    path.write_text("a = 22\n")
+    assert not snapshot.is_current()
+
+
+def test_is_current_missing_file(tmp_path):
+    path = tmp_path / "overlay.toml"
+    snapshot = ConfigSnapshot(1, tmp_path, ((path, None),), {})
+    assert snapshot.is_current()
+    path.write_text("")
+    assert not snapshot.is_current()
+
+
+def test_wire_roundtrip(tmp_path):
+    path = tmp_path / "config.toml"
+    snapshot = ConfigSnapshot(
+        3, path, ((path, (1, 2, 3, 4)), (tmp_path / "x", None)), {"a": 1}
+    )
+    wire = snapshot.to_wire()
+    # fingerprints are sent as lists
+    wire["files"] = [
+        [p, None if fp is None else list(fp)] for p, fp in wire["files"]
+    ]
+    assert ConfigSnapshot.from_wire(wire) == snapshot
+
+
+def test_env_roundtrip(tmp_path):
+    path = tmp_path / "config.toml"
+    snapshot = ConfigSnapshot(
+        1,
+        path,
+        ((path, (1, 2, 3, 4)),),
+        {"a": {"b": [1, "x"], "d": datetime.date(2024, 1, 2)}},
+    )
+    value = snapshot.to_env()
+    assert value.isascii()
+    assert ConfigSnapshot.from_env(value) == snapshot
+
+
+@pytest.mark.parametrize("value", ("", "not base64!", "eJwDAAAAAAE="))
+def test_from_env_invalid(value):
+    with pytest.raises(ValueError):
+        ConfigSnapshot.from_env(value)
@@ -0,0 +1,176 @@
+import sys
+
+import pytest
+
+if sys.version_info[:2] < (3, 11):
+    import tomli as tomllib  # type: ignore[unused-ignore,import-not-found]
+else:
+    import tomllib
+
+from qualibrate_config.core import toml_edit
+
+DOCUMENT = """\
+# main config
+name = "root"
+
+[qualibrate]  # header comment
+version = 6
+project = "p1"  # active project
+
+[qualibrate.storage]
+location = "/data"
+
+[other]
+"dotted.key" = 1
+"""
+
+
+def test_set_value_replaces_only_value():
+    result = toml_edit.set_value_in_document(
+        DOCUMENT, ("qualibrate", "project"), "p2"
+    )
+    assert result == DOCUMENT.replace('"p1"', '"p2"')
+
+
+def test_set_value_nested_table():
+    result = toml_edit.set_value_in_document(
+        DOCUMENT, ("qualibrate", "storage", "location"), "/new"
+    )
+    assert result == DOCUMENT.replace('"/data"', '"/new"')
+
+
+@pytest.mark.parametrize(
+    "value, formatted", ((2, "2"), (True, "true"), (1.5, "1.5"))
+)
+def test_set_value_other_scalars(value, formatted):
+    result = toml_edit.set_value_in_document(
+        DOCUMENT, ("qualibrate", "version"), value
+    )
+    assert result == DOCUMENT.replace("version = 6", f"version = {formatted}")
+
+
+def test_set_value_quoted_key():
+    result = toml_edit.set_value_in_document(
+        DOCUMENT, ("other", "dotted.key"), 2
+    )
+    assert result == DOCUMENT.replace('"dotted.key" = 1', '"dotted.key" = 2')
+
+
+def test_set_value_root_key():
+    result = toml_edit.set_value_in_document(DOCUMENT, ("name",), "new")
+    assert result == DOCUMENT.replace('"root"', '"new"')
+
+
+def test_set_value_appends_missing_key_to_table():
+    result = toml_edit.set_value_in_document(
+        DOCUMENT, ("qualibrate", "log_folder"), "/log"
+    )
+    assert result is not None
+    expected = tomllib.loads(DOCUMENT)
+    expected["qualibrate"]["log_folder"] = "/log"
+    assert tomllib.loads(result) == expected
+    assert result.startswith(DOCUMENT.split("[qualibrate.storage]")[0][:-1])
+    assert 'project = "p1"  # active project\nlog_folder = "/log"\n' in result
+
+
+def test_set_value_appends_to_table_at_end_without_newline():
+    result = toml_edit.set_value_in_document("[a]\nx = 1", ("a", "y"), 2)
+    assert result == "[a]\nx = 1\ny = 2\n"
+
+
+def test_set_value_appends_to_empty_root():
+    result = toml_edit.set_value_in_document("[a]\nx = 1\n", ("y",), 2)
+    assert result == "y = 2\n[a]\nx = 1\n"
+
+
+@pytest.mark.parametrize(
+    "document, keys, value",
+    (
+        (DOCUMENT, ("missing", "key"), 1),
+        (DOCUMENT, ("qualibrate", "project"), {"a": 1}),
+        (DOCUMENT, ("qualibrate", "project"), [1, 2]),
+        ('[a]\nx = """\nmulti"""\n', ("a", "x"), "v"),
+        ("[a]\nx = [\n1]\n", ("a", "x"), 1),
+        ("[[a]]\nx = 1\n", ("a", "x"), 2),
+        ('a = """\n', ("a",), 1),
+        (DOCUMENT, (), 1),
+    ),
+)
+def test_set_value_not_possible(document, keys, value):
+    assert toml_edit.set_value_in_document(document, keys, value) is None
+
+
+def test_patch_config_file(tmp_path):
+    config_file = tmp_path / "config.toml"
+    config_file.write_text(DOCUMENT)
+    config_file.chmod(0o640)
+    expected = tomllib.loads(DOCUMENT)
+    expected["qualibrate"]["project"] = "p2"
+    assert toml_edit.patch_config_file(
+        config_file, ("qualibrate", "project"), "p2", expected
+    )
+    assert config_file.read_text() == DOCUMENT.replace('"p1"', '"p2"')
+    assert config_file.stat().st_mode & 0o777 == 0o640
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_patch_config_file_mismatch_not_written(tmp_path):
+    config_file = tmp_path / "config.toml"
+    config_file.write_text(DOCUMENT)
+    expected = tomllib.loads(DOCUMENT)
+    expected["qualibrate"]["project"] = "p2"
+    expected["extra"] = 1
+    assert not toml_edit.patch_config_file(
+        config_file, ("qualibrate", "project"), "p2", expected
+    )
+    assert config_file.read_text() == DOCUMENT
+
+
+def test_patch_config_file_missing(tmp_path):
+    assert not toml_edit.patch_config_file(
+        tmp_path / "config.toml", ("a",), 1, {"a": 1}
+    )
+
+
+def test_patch_config_values(tmp_path):
+    config_file = tmp_path / "config.toml"
+    config_file.write_text(DOCUMENT)
+    expected = tomllib.loads(DOCUMENT)
+    expected["qualibrate"]["project"] = "p2"
+    expected["qualibrate"]["storage"]["location"] = "/new"
+    expected["qualibrate"]["log_folder"] = "/log"
+    assert toml_edit.patch_config_values(config_file, expected)
+    assert config_file.read_text() == (
+        DOCUMENT.replace('"p1"', '"p2"')
+        .replace('"/data"', '"/new"')
+        .replace(
+            "  # active project\n", '  # active project\nlog_folder = "/log"\n'
+        )
+    )
+
+
+def test_patch_config_values_unchanged_not_written(tmp_path, mocker):
+    config_file = tmp_path / "config.toml"
+    config_file.write_text(DOCUMENT)
+    write = mocker.patch.object(toml_edit, "atomic_write")
+    assert toml_edit.patch_config_values(config_file, tomllib.loads(DOCUMENT))
+    write.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "change",
+    (
+        lambda config: config["qualibrate"].pop("project"),
+        lambda config: config.pop("other"),
+        lambda config: config.update(new={"a": 1}),
+        lambda config: config["qualibrate"].update(storage="/data"),
+        lambda config: config.update(other=1),
+    ),
+)
+def test_patch_config_values_not_possible(tmp_path, change):
+    config_file = tmp_path / "config.toml"
+    config_file.write_text(DOCUMENT)
+    expected = tomllib.loads(DOCUMENT)
+    change(expected)
+    assert not toml_edit.patch_config_values(config_file, expected)
+    assert config_file.read_text() == DOCUMENT
@@ -0,0 +1,164 @@
+import sys
+
+import pytest
+import tomli_w
+
+if sys.version_info[:2] < (3, 11):
+    import tomli as tomllib  # type: ignore[unused-ignore,import-not-found]
+else:
+    import tomllib
+
+from qualibrate_config.core import toml_tables
+
+DOCUMENT = '''\
+title = "root"
+inline = { a = 1 }
+
+[qualibrate]
+project = "p1"  # comment [not a header]
+version = 6
+
+[qualibrate.storage]
+location = "/data/${#/qualibrate/project}"
+
+[quam]
+text = """
+[not.a.header]
+\'\'\'still "" inside\'\'\'
+"""
+literal = \'\'\'
+[also.not.header]
+\'\'\'
+matrix = [
+    [1, 2],
+    [3, 4],
+]
+
+[[runs]]
+id = 1
+
+["quoted.key" . sub]
+x = 'it"s'
+
+[runs_meta]
+count = 1
+
+[[runs]]
+id = 2
+'''
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    (
+        ("[a]", ["a"]),
+        ("[ a . b ]", ["a", "b"]),
+        ("[[a.b]]", ["a", "b"]),
+        ('["a.b".c]', ["a.b", "c"]),
+        ("['a.b'.c] # comment", ["a.b", "c"]),
+        ('["a\\"b"]', ['a"b']),
+        ("[a", None),
+        ("[a b]", None),
+        ("a = 1", None),
+        ("[]", None),
+    ),
+)
+def test_parse_header_keys(header, expected):
+    assert toml_tables.parse_header_keys(header) == expected
+
+
+def test_split_top_level_tables_keys():
+    tables = toml_tables.split_top_level_tables(DOCUMENT)
+    assert tables is not None
+    assert tables.prelude == 'title = "root"\ninline = { a = 1 }\n\n'
+    assert list(tables.tables) == [
+        "qualibrate",
+        "quam",
+        "runs",
+        "quoted.key",
+        "runs_meta",
+    ]
+    assert len(tables.tables["qualibrate"]) == 2
+    assert len(tables.tables["runs"]) == 2
+
+
+@pytest.mark.parametrize(
+    "key", ("qualibrate", "quam", "runs", "quoted.key", "runs_meta")
+)
+def test_loads_tables_matches_full_parse(key):
+    full = tomllib.loads(DOCUMENT)
+    tables = toml_tables.split_top_level_tables(DOCUMENT)
+    partial = toml_tables.loads_tables(tables, [key])
+    assert partial == {
+        "title": full["title"],
+        "inline": full["inline"],
+        key: full[key],
+    }
+
+
+def test_loads_tables_all_keys_equals_full_parse():
+    tables = toml_tables.split_top_level_tables(DOCUMENT)
+    assert toml_tables.loads_tables(
+        tables, list(tables.tables)
+    ) == tomllib.loads(DOCUMENT)
+
+
+def test_loads_tables_missing_key():
+    tables = toml_tables.split_top_level_tables("[a]\nx = 1")
+    assert toml_tables.loads_tables(tables, ["b"]) == {}
+
+
+def test_loads_tables_no_trailing_newline():
+    tables = toml_tables.split_top_level_tables("[a]\nx = 1\n[b]\ny = 2")
+    assert toml_tables.loads_tables(tables, ["b", "a"]) == {
+        "a": {"x": 1},
+        "b": {"y": 2},
+    }
+
+
+@pytest.mark.parametrize(
+    "document",
+    (
+        'a = """\nunterminated\n',
+        "a = [\n1,\n",
+        'a = "unterminated\n',
+        "[a b]\n",
+    ),
+)
+def test_split_top_level_tables_unsplittable(document):
+    assert toml_tables.split_top_level_tables(document) is None
+
+
+def test_split_escaped_quote_in_multiline_string():
+    document = 'a = """\n\\"""\n[x]\n"""\n[b]\ny = 1\n'
+    tables = toml_tables.split_top_level_tables(document)
+    assert tables is not None
+    assert list(tables.tables) == ["b"]
+    assert toml_tables.loads_tables(tables, []) == {
+        "a": tomllib.loads(document)["a"]
+    }
+
+
+def test_split_tomli_w_output():
+    config = {
+        "root": [1, [2, "]"]],
+        "qualibrate": {"project": "p", "storage": {"location": "/s"}},
+        "quam": {
+            f"q{i}": {
+                "text": "line\n[not.header]\n",
+                "ports": [[1, 2], ["[", "#"]],
+                "tables": [{"a": 1}, {"a": 2}],
+            }
+            for i in range(3)
+        },
+        "x.y": {"z": 1},
+    }
+    document = tomli_w.dumps(config)
+    tables = toml_tables.split_top_level_tables(document)
+    assert tables is not None
+    assert set(tables.tables) == {"qualibrate", "quam", "x.y"}
+    assert toml_tables.loads_tables(tables, ["qualibrate"]) == {
+        "root": config["root"],
+        "qualibrate": config["qualibrate"],
+    }
+    assert toml_tables.loads_tables(tables, list(tables.tables)) == config
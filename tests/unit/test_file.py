@@ -78,3 +78,128 @@ def test_read_config_file_with_references(mocker, config_dir):
     mocked_resolve_refs.assert_called_once_with(
         {"default_key": "default_value"}
     )
+
+
+@pytest.fixture
+def tables_config(tmp_path):
+    config_file = tmp_path / DEFAULT_CONFIG_FILENAME
+    config_file.write_text(
+        'name = "root"\n'
+        "[qualibrate]\n"
+        'project = "p1"\n'
+        "[qualibrate.storage]\n"
+        'location = "${#/paths/data}/storage"\n'
+        "[paths]\n"
+        'data = "/data"\n'
+        "[runner]\n"
+        "timeout = 1\n"
+        "[quam]\n"
+        "broken = \n"
+    )
+    project_dir = tmp_path / "projects" / "p1"
+    project_dir.mkdir(parents=True)
+    (project_dir / "config.toml").write_text("[runner]\ntimeout = 5\n")
+    return config_file
+
+
+def test_read_config_tables_skips_unrequested_tables(tables_config):
+    result = qc_file.read_config_tables(tables_config, ["runner"])
+    assert result == {
+        "name": "root",
+        "qualibrate": {
+            "project": "p1",
+            "storage": {"location": "${#/paths/data}/storage"},
+        },
+        "paths": {"data": "/data"},
+        "runner": {"timeout": 5},
+    }
+
+
+def test_read_config_tables_override_project(tables_config):
+    result = qc_file.read_config_tables(
+        tables_config, ["runner"], override_project="p2"
+    )
+    assert result["runner"] == {"timeout": 1}
+    assert result["qualibrate"]["project"] == "p2"
+
+
+def test_read_config_tables_fallback_to_full_parse(mocker, tables_config):
+    tables_config.write_text(
+        tables_config.read_text().replace("broken = \n", "ok = 1\n")
+    )
+    mocker.patch(
+        "qualibrate_config.file.split_top_level_tables", return_value=None
+    )
+    result = qc_file.read_config_tables(tables_config, ["runner"])
+    assert result == qc_file.read_config_file(
+        tables_config, solve_references=False
+    )
+    assert result["quam"] == {"ok": 1}
+
+
+def test_project_config_view(tmp_path):
+    overlay = tmp_path / "projects" / "p2" / "config.toml"
+    overlay.parent.mkdir(parents=True)
+    overlay.write_text('[qualibrate.storage]\nlocation = "/p2"\n')
+    base = {"qualibrate": {"project": "p1", "storage": {"location": "/p1"}}}
+    view = qc_file.project_config_view(
+        base, tmp_path / "config.toml", override_project="p2"
+    )
+    assert view == {
+        "qualibrate": {"project": "p2", "storage": {"location": "/p2"}}
+    }
+    assert base == {
+        "qualibrate": {"project": "p1", "storage": {"location": "/p1"}}
+    }
+    assert qc_file.project_config_view(base, tmp_path / "config.toml") == base
+
+
+def test_read_config_file_env_overrides(monkeypatch, tables_config):
+    content = tables_config.read_text().replace("broken = \n", "")
+    tables_config.write_text(content)
+    project_dir = tables_config.parent / "projects" / "p2"
+    project_dir.mkdir(parents=True)
+    (project_dir / "config.toml").write_text("[runner]\ntimeout = 7\n")
+    monkeypatch.setenv("QUALIBRATE__QUALIBRATE__PROJECT", "p2")
+    monkeypatch.setenv("QUALIBRATE__PATHS__DATA", "/mnt")
+    monkeypatch.setenv("QUALIBRATE__RUNNER__RETRIES", "3")
+    result = qc_file.read_config_file(tables_config)
+    assert result["qualibrate"] == {
+        "project": "p2",
+        "storage": {"location": "/mnt/storage"},
+    }
+    assert result["runner"] == {"timeout": 7, "retries": 3}
+    # explicitly requested project wins
+    result = qc_file.read_config_file(tables_config, override_project="p1")
+    assert result["qualibrate"]["project"] == "p1"
+    assert result["runner"] == {"timeout": 5, "retries": 3}
+    # file isn't changed
+    assert tables_config.read_text() == content
+
+
+def test_project_config_view_env_overrides(monkeypatch, tables_config):
+    monkeypatch.setenv("QUALIBRATE__RUNNER__TIMEOUT", "9")
+    monkeypatch.setenv("QUALIBRATE__QUALIBRATE__PROJECT", "p3")
+    base = {"qualibrate": {"project": "p1"}, "runner": {"timeout": 1}}
+    view = qc_file.project_config_view(
+        base, tables_config, override_project="p1"
+    )
+    assert view == qc_file.apply_project_config(
+        {"qualibrate": {"project": "p1"}, "runner": {"timeout": 1}},
+        tables_config,
+        override_project="p1",
+    )
+    assert view == {"qualibrate": {"project": "p1"}, "runner": {"timeout": 9}}
+
+
+def test_project_config_view_with_read_overlay(mocker, tmp_path):
+    read = mocker.spy(qc_file, "read_project_config_file")
+    base = {"qualibrate": {"project": "p1"}, "runner": {"timeout": 1}}
+    overlay = {"runner": {"timeout": 5}}
+    view = qc_file.project_config_view(
+        base, tmp_path / "config.toml", "p2", project_config=overlay
+    )
+    assert view["runner"]["timeout"] == 5
+    assert view["qualibrate"]["project"] == "p2"
+    assert overlay == {"runner": {"timeout": 5}}
+    read.assert_not_called()
@@ -0,0 +1,95 @@
+import multiprocessing
+import sys
+import time
+import uuid
+
+import pytest
+
+from qualibrate_config import resolvers
+from qualibrate_config.core.shm import SharedConfigReader
+from qualibrate_config.publisher import SharedConfigPublisher
+from qualibrate_config.vars import QUALIBRATE_CONFIG_KEY
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch, write_config):
+    monkeypatch.setenv(
+        "QUALIBRATE_CONFIG_SHM",
+        f"qualibrate_config_test_{uuid.uuid4().hex[:12]}",
+    )
+    path = tmp_path / "config.toml"
+    write_config(path, "p1")
+    return path
+
+
+@pytest.fixture
+def publisher(config_path):
+    with SharedConfigPublisher(config_path, watch=False) as publisher:
+        yield publisher
+
+
+def test_publish(publisher, config_path):
+    snapshot = SharedConfigReader(publisher.name).read()
+    assert snapshot is not None
+    assert snapshot.version == publisher.version == 1
+    assert snapshot.config_path == config_path
+    assert snapshot.data[QUALIBRATE_CONFIG_KEY]["project"] == "p1"
+
+
+def test_resolvers_use_shared_memory(publisher, config_path, mocker):
+    read = mocker.spy(resolvers, "read_config_file")
+    config = resolvers.get_qualibrate_config(config_path, use_cache=False)
+    assert config.storage.location == config_path.parent / "p1"
+    resolved = resolvers.get_resolved_config(config_path)
+    assert resolved[QUALIBRATE_CONFIG_KEY]["storage"]["location"] == str(
+        config_path.parent / "p1"
+    )
+    read.assert_not_called()
+
+
+def test_resolvers_ignore_outdated_snapshot(
+    publisher, config_path, write_config
+):
+    write_config(config_path, "p2")
+    assert resolvers._config_from_shared_memory(config_path) is None
+    config = resolvers.get_qualibrate_config(config_path, use_cache=False)
+    assert config.project == "p2"
+    publisher.publish()
+    served = resolvers._config_from_shared_memory(config_path)
+    assert served is not None
+    assert served[QUALIBRATE_CONFIG_KEY]["project"] == "p2"
+
+
+def test_invalid_config_not_published(publisher, config_path, write_config):
+    write_config(config_path, "p1", version=1)
+    assert not publisher.publish()
+    assert SharedConfigReader(publisher.name).read() is None
+
+
+def _child_project(config_path, queue):
+    served = resolvers._config_from_shared_memory(config_path)
+    queue.put(None if served is None else served["qualibrate"]["project"])
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fork isn't available")
+def test_child_process_reads_snapshot(publisher, config_path):
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    process = context.Process(target=_child_project, args=(config_path, queue))
+    process.start()
+    process.join(10)
+    assert queue.get(timeout=1) == "p1"
+
+
+def test_republish_on_change(config_path, write_config):
+    with SharedConfigPublisher(
+        config_path, poll_interval=0.02, debounce=0.01, use_inotify=False
+    ) as publisher:
+        write_config(config_path, "p2")
+        deadline = time.monotonic() + 5
+        while publisher.version < 2:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        snapshot = SharedConfigReader(publisher.name).read()
+    assert snapshot is not None
+    assert snapshot.data[QUALIBRATE_CONFIG_KEY]["project"] == "p2"
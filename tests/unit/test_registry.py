@@ -0,0 +1,129 @@
+import pytest
+
+from qualibrate_config import resolvers
+from qualibrate_config.models import QualibrateConfig
+from qualibrate_config.registry import ConfigRegistry
+
+
+def test_registry_keys_by_path_and_project(tmp_path, write_config):
+    user1 = tmp_path / "u1" / "config.toml"
+    user2 = tmp_path / "u2" / "config.toml"
+    write_config(user1, "p1")
+    write_config(user2, "p2")
+    registry = ConfigRegistry()
+    config1 = registry.get(user1)
+    config2 = registry.get(user2)
+    assert (config1.project, config2.project) == ("p1", "p2")
+    assert registry.get(user1) is config1
+    assert registry.get(user1, "other").project == "other"
+    assert len(registry) == 3
+    assert (user1, "other") in registry
+    stats = registry.stats
+    assert (stats.entries, stats.hits, stats.misses) == (3, 1, 3)
+    assert stats.memory > 0
+
+
+def test_registry_reloads_changed_file(tmp_path, write_config):
+    path = tmp_path / "config.toml"
+    write_config(path, "p1")
+    registry = ConfigRegistry()
+    config = registry.get(path)
+    write_config(path, "p1", log_folder="/log")
+    new_config = registry.get(path)
+    assert new_config is not config
+    assert str(new_config.log_folder) == "/log"
+
+
+def test_registry_reloads_changed_overlay(tmp_path, write_config):
+    path = tmp_path / "config.toml"
+    write_config(path, "p1")
+    registry = ConfigRegistry()
+    registry.get(path)
+    overlay = tmp_path / "projects" / "p1" / "config.toml"
+    overlay.parent.mkdir(parents=True)
+    overlay.write_text('[qualibrate.storage]\nlocation = "/other"\n')
+    assert registry.get(path).storage.location.as_posix() == "/other"
+
+
+def test_registry_max_entries(tmp_path, write_config):
+    paths = [tmp_path / str(i) / "config.toml" for i in range(3)]
+    for path in paths:
+        write_config(path, "p1")
+    registry = ConfigRegistry(max_entries=2)
+    for path in paths:
+        registry.get(path)
+    assert (paths[0], None) not in registry
+    assert registry.stats.evictions == 1
+
+
+def test_registry_max_memory(tmp_path, write_config):
+    paths = [tmp_path / str(i) / "config.toml" for i in range(3)]
+    for path in paths:
+        write_config(path, "p1")
+    registry = ConfigRegistry(max_memory=1)
+    for path in paths:
+        registry.get(path)
+    # the last loaded config is kept even if it's above the budget
+    assert len(registry) == 1
+    assert (paths[-1], None) in registry
+    assert registry.stats.evictions == 2
+
+
+def test_registry_invalidate(tmp_path, write_config):
+    user1 = tmp_path / "u1" / "config.toml"
+    user2 = tmp_path / "u2" / "config.toml"
+    write_config(user1, "p1")
+    write_config(user2, "p1")
+    registry = ConfigRegistry()
+    registry.get(user1)
+    registry.get(user1, "p2")
+    registry.get(user2)
+    registry.invalidate(user1, "p2")
+    assert (user1, "p2") not in registry and (user1, None) in registry
+    registry.invalidate(user1)
+    assert len(registry) == 1
+    registry.invalidate()
+    assert len(registry) == 0
+
+
+def test_registry_invalidate_with_overrides(
+    tmp_path, monkeypatch, write_config
+):
+    path = tmp_path / "config.toml"
+    write_config(path, "p1")
+    monkeypatch.setenv("QUALIBRATE__QUALIBRATE__LOG_FOLDER", "/log")
+    registry = ConfigRegistry()
+    config = registry.get(path, "p2")
+    assert (path, "p2") in registry
+    registry.invalidate(path, "p2")
+    assert (path, "p2") not in registry
+    assert registry.get(path, "p2") is not config
+
+
+def test_registry_shares_base_config_not_module_cache(
+    tmp_path, mocker, write_config
+):
+    path = tmp_path / "config.toml"
+    write_config(path, "p1")
+    resolvers.invalidate_config_cache()
+    read = mocker.spy(resolvers, "_read_base_config")
+    registry = ConfigRegistry()
+    registry.get(path, "p2")
+    registry.get(path, "p3")
+    read.assert_called_once()
+    assert len(resolvers._base_config_cache) == 0
+    registry.invalidate(path)
+    registry.get(path, "p2")
+    assert read.call_count == 2
+
+
+def test_registry_keys_by_auto_migrate(tmp_path, write_config):
+    path = tmp_path / "config.toml"
+    write_config(path, "p1", version=QualibrateConfig.version - 1)
+    registry = ConfigRegistry()
+    migrated = registry.get(path, persist_migration=False)
+    assert migrated.version == QualibrateConfig.version
+    # config migrated in memory isn't returned without auto migration
+    with pytest.raises(resolvers.InvalidQualibrateConfigVersionError):
+        registry.get(path, auto_migrate=False)
+    assert registry.get(path) is migrated
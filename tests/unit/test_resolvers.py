@@ -0,0 +1,317 @@
+import pytest
+
+from qualibrate_config import resolvers
+from qualibrate_config.core.cache import ConfigCache
+from qualibrate_config.models import BaseConfig, QualibrateConfig
+
+
+@pytest.fixture
+def config_path(tmp_path, write_config):
+    path = tmp_path / "config.toml"
+    write_config(path, "p1")
+    return path
+
+
+@pytest.fixture
+def load_spy(mocker):
+    return mocker.spy(resolvers, "_load_qualibrate_config")
+
+
+def test_get_qualibrate_config_cached(config_path, load_spy):
+    config = resolvers.get_qualibrate_config(config_path)
+    assert resolvers.get_qualibrate_config(config_path) is config
+    assert load_spy.call_count == 1
+
+
+def test_get_qualibrate_config_file_change(config_path, load_spy, write_config):
+    config = resolvers.get_qualibrate_config(config_path)
+    write_config(config_path, "p2")
+    new_config = resolvers.get_qualibrate_config(config_path)
+    assert new_config is not config
+    assert new_config.project == "p2"
+    assert load_spy.call_count == 2
+
+
+def test_get_qualibrate_config_project_overlay_change(config_path, load_spy):
+    config = resolvers.get_qualibrate_config(config_path)
+    overlay = config_path.parent / "projects" / "p1" / "config.toml"
+    overlay.parent.mkdir(parents=True)
+    overlay.write_text('[qualibrate.storage]\nlocation = "/other"\n')
+    new_config = resolvers.get_qualibrate_config(config_path)
+    assert new_config is not config
+    assert new_config.storage.location.as_posix() == "/other"
+
+
+def test_get_qualibrate_config_bypass_cache(config_path, load_spy):
+    config = resolvers.get_qualibrate_config(config_path)
+    fresh = resolvers.get_qualibrate_config(config_path, use_cache=False)
+    assert fresh is not config
+    # config loaded without cache isn't stored
+    assert resolvers.get_qualibrate_config(config_path) is config
+    assert load_spy.call_count == 2
+
+
+def test_get_qualibrate_config_bypass_cache_for_project(config_path):
+    resolvers.invalidate_config_cache()
+    resolvers.get_qualibrate_config(config_path, use_cache=False, project="p2")
+    assert len(resolvers.qualibrate_project_config_cache) == 0
+    assert len(resolvers._base_config_cache) == 0
+
+
+def test_get_qualibrate_config_cached_by_auto_migrate(tmp_path, write_config):
+    config_path = tmp_path / "config.toml"
+    write_config(config_path, "p1", version=QualibrateConfig.version - 1)
+    migrated = resolvers.get_qualibrate_config(
+        config_path, persist_migration=False
+    )
+    assert migrated.version == QualibrateConfig.version
+    # config migrated in memory isn't returned without auto migration
+    with pytest.raises(resolvers.InvalidQualibrateConfigVersionError):
+        resolvers.get_qualibrate_config(config_path, auto_migrate=False)
+    assert resolvers.get_qualibrate_config(config_path) is migrated
+
+
+def test_get_qualibrate_config_with_raw_config_not_cached(
+    config_path, load_spy
+):
+    raw = resolvers.read_config_file(config_path, solve_references=False)
+    resolvers.invalidate_config_cache()
+    first = resolvers.get_qualibrate_config(config_path, raw)
+    second = resolvers.get_qualibrate_config(config_path, raw)
+    assert first is not second
+    assert len(resolvers.qualibrate_config_cache) == 0
+
+
+def test_invalidate_config_cache(config_path, load_spy):
+    config = resolvers.get_qualibrate_config(config_path)
+    resolvers.invalidate_config_cache(config_path)
+    assert resolvers.get_qualibrate_config(config_path) is not config
+    resolvers.invalidate_config_cache()
+    assert len(resolvers.qualibrate_config_cache) == 0
+
+
+def test_get_qualibrate_config_env_overrides(
+    config_path, load_spy, monkeypatch
+):
+    content = config_path.read_text()
+    config = resolvers.get_qualibrate_config(config_path)
+    monkeypatch.setenv("QUALIBRATE__QUALIBRATE__PROJECT", "p2")
+    monkeypatch.setenv("QUALIBRATE__QUALIBRATE__LOG_FOLDER", "/log")
+    overridden = resolvers.get_qualibrate_config(config_path)
+    assert overridden is not config
+    assert overridden.project == "p2"
+    # references are solved after overrides are applied
+    assert overridden.storage.location == config_path.parent / "p2"
+    assert str(overridden.log_folder) == "/log"
+    assert resolvers.get_qualibrate_config(config_path) is overridden
+    assert config_path.read_text() == content
+    monkeypatch.delenv("QUALIBRATE__QUALIBRATE__PROJECT")
+    monkeypatch.delenv("QUALIBRATE__QUALIBRATE__LOG_FOLDER")
+    assert resolvers.get_qualibrate_config(config_path) is config
+    assert load_spy.call_count == 2
+    resolvers.invalidate_config_cache(config_path)
+    assert len(resolvers.qualibrate_config_cache) == 0
+
+
+def test_get_qualibrate_config_numeric_project_override(
+    config_path, monkeypatch
+):
+    monkeypatch.setenv("QUALIBRATE__QUALIBRATE__PROJECT", "123")
+    config = resolvers.get_qualibrate_config(config_path)
+    assert config.project == "123"
+    assert config.storage.location == config_path.parent / "123"
+
+
+def test_cached_configs_resolve_own_references(tmp_path, write_config):
+    first_path = tmp_path / "a" / "config.toml"
+    second_path = tmp_path / "b" / "config.toml"
+    write_config(first_path, "first")
+    write_config(second_path, "second")
+    first = resolvers.get_qualibrate_config(first_path)
+    resolvers.get_qualibrate_config(second_path)
+    assert first.storage.location == first_path.parent / "first"
+
+
+class PluginConfig(BaseConfig):
+    name: str
+    retries: int = 3
+
+
+@pytest.fixture
+def multi_config_path(tmp_path, write_config):
+    path = tmp_path / "config.toml"
+    write_config(path, "p1")
+    with path.open("a") as f_out:
+        f_out.write('\n[plugin]\nname = "plug"\n\n[quam]\nbig = [1, 2, 3]\n')
+    overlay = tmp_path / "projects" / "p1" / "config.toml"
+    overlay.parent.mkdir(parents=True)
+    overlay.write_text("[plugin]\nretries = 5\n")
+    return path
+
+
+@pytest.mark.parametrize("parallel", (False, True))
+def test_get_config_models(multi_config_path, mocker, parallel):
+    read_spy = mocker.spy(resolvers, "read_config_tables")
+    validator = mocker.Mock()
+    models = resolvers.get_config_models(
+        multi_config_path,
+        {"qualibrate": QualibrateConfig, "plugin": PluginConfig},
+        raw_config_validators=[validator],
+        parallel=parallel,
+    )
+    assert isinstance(models["qualibrate"], QualibrateConfig)
+    assert models["qualibrate"].project == "p1"
+    assert isinstance(models["plugin"], PluginConfig)
+    assert models["plugin"].name == "plug"
+    assert models["plugin"].retries == 5
+    read_spy.assert_called_once()
+    validator.assert_called_once()
+    assert "quam" not in validator.call_args.args[0]
+
+
+def test_get_config_models_with_config(tmp_path, mocker):
+    read_spy = mocker.spy(resolvers, "read_config_tables")
+    models = resolvers.get_config_models(
+        tmp_path / "missing.toml",
+        {"plugin": PluginConfig, "other": PluginConfig},
+        config={"plugin": {"name": "a"}, "other": {"name": "b"}},
+    )
+    assert models["plugin"].name == "a"
+    assert models["other"].name == "b"
+    read_spy.assert_not_called()
+
+
+@pytest.mark.parametrize("parallel", (False, True))
+def test_get_config_models_invalid_section(tmp_path, parallel):
+    with pytest.raises(ValueError, match="name"):
+        resolvers.get_config_models(
+            tmp_path / "missing.toml",
+            {"plugin": PluginConfig, "qualibrate": QualibrateConfig},
+            config={"plugin": {"name": 1}},
+            parallel=parallel,
+        )
+
+
+def test_export_qualibrate_config(config_path, monkeypatch, mocker):
+    env = resolvers.export_qualibrate_config(config_path, env={})
+    assert list(env) == ["QUALIBRATE_CONFIG_SNAPSHOT"]
+    monkeypatch.delenv("QUALIBRATE_CONFIG_FILE", raising=False)
+    monkeypatch.setenv(
+        "QUALIBRATE_CONFIG_SNAPSHOT", env["QUALIBRATE_CONFIG_SNAPSHOT"]
+    )
+    read = mocker.spy(resolvers, "read_config_file")
+    assert resolvers.get_qualibrate_config_path() == config_path
+    config = resolvers.get_qualibrate_config(use_cache=False)
+    assert config.storage.location == config_path.parent / "p1"
+    read.assert_not_called()
+
+
+def test_exported_config_outdated(config_path, monkeypatch, write_config):
+    env = resolvers.export_qualibrate_config(config_path, env={})
+    monkeypatch.setenv(
+        "QUALIBRATE_CONFIG_SNAPSHOT", env["QUALIBRATE_CONFIG_SNAPSHOT"]
+    )
+    write_config(config_path, "p2")
+    assert resolvers._config_from_env(config_path) is None
+    config = resolvers.get_qualibrate_config(config_path, use_cache=False)
+    assert config.project == "p2"
+
+
+def test_exported_config_other_file_or_invalid(
+    config_path, monkeypatch, write_config
+):
+    env = resolvers.export_qualibrate_config(config_path, env={})
+    monkeypatch.setenv(
+        "QUALIBRATE_CONFIG_SNAPSHOT", env["QUALIBRATE_CONFIG_SNAPSHOT"]
+    )
+    other = config_path.parent / "other" / "config.toml"
+    write_config(other, "p3")
+    assert resolvers._config_from_env(other) is None
+    monkeypatch.setenv("QUALIBRATE_CONFIG_SNAPSHOT", "invalid")
+    assert resolvers._config_from_env(config_path) is None
+
+
+def test_export_too_big_config(config_path, mocker):
+    mocker.patch.object(resolvers, "MAX_ENV_SNAPSHOT_SIZE", 10)
+    with pytest.raises(ValueError, match="too big"):
+        resolvers.export_qualibrate_config(config_path, env={})
+
+
+def _write_overlay(config_path, project, location):
+    overlay = config_path.parent / "projects" / project / "config.toml"
+    overlay.parent.mkdir(parents=True, exist_ok=True)
+    overlay.write_text(f'[qualibrate.storage]\nlocation = "{location}"\n')
+
+
+def test_get_qualibrate_config_for_project(config_path, mocker):
+    _write_overlay(config_path, "p2", "/p2")
+    _write_overlay(config_path, "p3", "/p3")
+    read_base = mocker.spy(resolvers, "_read_base_config")
+    p2 = resolvers.get_qualibrate_config(config_path, project="p2")
+    p3 = resolvers.get_qualibrate_config(config_path, project="p3")
+    assert (p2.project, str(p2.storage.location)) == ("p2", "/p2")
+    assert (p3.project, str(p3.storage.location)) == ("p3", "/p3")
+    # active project config isn't changed
+    assert resolvers.get_qualibrate_config(config_path).project == "p1"
+    assert resolvers.get_qualibrate_config(config_path, project="p2") is p2
+    # base file parsed once for both projects (and once for the active one)
+    assert read_base.call_count == 2
+
+
+def test_project_config_reloaded_on_overlay_change(config_path, mocker):
+    _write_overlay(config_path, "p2", "/p2")
+    _write_overlay(config_path, "p3", "/p3")
+    p2 = resolvers.get_qualibrate_config(config_path, project="p2")
+    p3 = resolvers.get_qualibrate_config(config_path, project="p3")
+    read_base = mocker.spy(resolvers, "_read_base_config")
+    _write_overlay(config_path, "p2", "/new")
+    new_p2 = resolvers.get_qualibrate_config(config_path, project="p2")
+    assert str(new_p2.storage.location) == "/new"
+    assert resolvers.get_qualibrate_config(config_path, project="p3") is p3
+    assert new_p2 is not p2
+    read_base.assert_not_called()
+
+
+def test_project_config_reloaded_on_base_change(config_path, write_config):
+    p2 = resolvers.get_qualibrate_config(config_path, project="p2")
+    write_config(config_path, "p1", log_folder="/log")
+    new_p2 = resolvers.get_qualibrate_config(config_path, project="p2")
+    assert new_p2 is not p2
+    assert str(new_p2.log_folder) == "/log"
+
+
+def test_project_config_cache_lru(config_path, mocker):
+    mocker.patch.object(
+        resolvers.qualibrate_project_config_cache, "max_entries", 2
+    )
+    for project in ("p1", "p2", "p3"):
+        resolvers.get_qualibrate_config(config_path, project=project)
+    assert len(resolvers.qualibrate_project_config_cache) == 2
+    path = config_path.absolute()
+    assert (
+        path,
+        "p1",
+        (),
+        True,
+    ) not in resolvers.qualibrate_project_config_cache
+    assert (path, "p3", (), True) in resolvers.qualibrate_project_config_cache
+
+
+def test_load_qualibrate_config_not_cached(config_path, mocker):
+    resolvers.invalidate_config_cache()
+    _write_overlay(config_path, "p2", "/p2")
+    read_base = mocker.spy(resolvers, "_read_base_config")
+    base_cache = ConfigCache()
+    p2 = resolvers.load_qualibrate_config(
+        config_path, "p2", base_config_cache=base_cache
+    )
+    resolvers.load_qualibrate_config(
+        config_path, "p3", base_config_cache=base_cache
+    )
+    assert str(p2.storage.location) == "/p2"
+    assert resolvers.load_qualibrate_config(config_path).project == "p1"
+    assert read_base.call_count == 2
+    assert len(base_cache) == 1
+    assert len(resolvers.qualibrate_config_cache) == 0
+    assert len(resolvers.qualibrate_project_config_cache) == 0
+    assert len(resolvers._base_config_cache) == 0
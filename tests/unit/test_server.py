@@ -0,0 +1,207 @@
+import time
+
+import pytest
+
+from qualibrate_config import resolvers
+from qualibrate_config.core.daemon import (
+    ConfigDaemonClient,
+    DaemonRequestError,
+)
+from qualibrate_config.server import ConfigServer
+from qualibrate_config.vars import QUALIBRATE_CONFIG_KEY
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch, write_config):
+    monkeypatch.delenv("QUALIBRATE_CONFIG_SOCKET", raising=False)
+    (tmp_path / "projects" / "p1").mkdir(parents=True)
+    (tmp_path / "projects" / "p2").mkdir()
+    path = tmp_path / "config.toml"
+    write_config(path, "p1")
+    return path
+
+
+@pytest.fixture
+def server(config_path):
+    with ConfigServer(
+        config_path, debounce=0.01, poll_interval=0.02, use_inotify=False
+    ) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    with ConfigDaemonClient(server.socket_path) as client:
+        yield client
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition wasn't met"
+        time.sleep(0.01)
+
+
+def test_server_socket(server, config_path):
+    assert server.socket_path == config_path.parent / ".config.sock"
+    assert server.socket_path.stat().st_mode & 0o777 == 0o600
+
+
+def test_get(client, config_path):
+    raw = client.get(resolved=False)
+    assert raw.config_path == config_path
+    assert raw.is_current()
+    assert [path for path, _ in raw.files] == [
+        config_path,
+        config_path.parent / "projects" / "p1" / "config.toml",
+    ]
+    assert raw.data[QUALIBRATE_CONFIG_KEY]["storage"]["location"] == str(
+        config_path.parent / "${#/qualibrate/project}"
+    )
+    resolved = client.get()
+    assert resolved.data[QUALIBRATE_CONFIG_KEY]["storage"]["location"] == str(
+        config_path.parent / "p1"
+    )
+
+
+def test_get_unchanged_not_resent(server, client, mocker):
+    first = client.get()
+    spy = mocker.spy(client, "request")
+    assert client.get() is first
+    assert spy.call_args.args[0]["since"] == first.version
+    assert spy.call_args.args[0]["instance"] == server.instance
+
+
+def test_get_after_daemon_restart(config_path, write_config):
+    server = ConfigServer(
+        config_path, poll_interval=0.02, use_inotify=False
+    ).start()
+    with ConfigDaemonClient(server.socket_path) as client:
+        try:
+            first = client.get()
+        finally:
+            server.stop()
+        write_config(config_path, "p2")
+        with ConfigServer(
+            config_path, poll_interval=0.02, use_inotify=False
+        ) as restarted:
+            # versions start over, the same version is another snapshot
+            assert restarted.version == first.version
+            snapshot = client.get()
+    assert snapshot is not first
+    assert snapshot.data[QUALIBRATE_CONFIG_KEY]["project"] == "p2"
+
+
+def test_get_pointer(client):
+    assert client.get_pointer("/qualibrate/project") == "p1"
+    with pytest.raises(DaemonRequestError, match="Invalid pointer"):
+        client.get_pointer("/missing")
+
+
+def test_list_projects(client):
+    assert sorted(client.list_projects()) == ["p1", "p2"]
+
+
+def test_unknown_operation(client):
+    with pytest.raises(DaemonRequestError, match="Unknown operation"):
+        client.request({"op": "unknown"})
+
+
+def test_reload_on_change(server, client, config_path, write_config):
+    version = client.get().version
+    write_config(config_path, "p2")
+    _wait_for(lambda: server.version > version)
+    assert client.get_pointer("/qualibrate/project") == "p2"
+
+
+def test_not_migrated_config_not_served(tmp_path, monkeypatch):
+    monkeypatch.delenv("QUALIBRATE_CONFIG_SOCKET", raising=False)
+    config_path = tmp_path / "config.toml"
+    config_path.write_text("[qualibrate]\nversion = 1\n")
+    server = ConfigServer(config_path, use_inotify=False)
+    server.refresh()
+    assert b'"ok":false' in server.handle({"op": "get"})
+
+
+def test_second_server_not_started(server, config_path):
+    with pytest.raises(RuntimeError, match="already running"):
+        ConfigServer(config_path, poll_interval=0.02, use_inotify=False).start()
+
+
+def test_stale_socket_replaced(config_path):
+    (config_path.parent / ".config.sock").write_text("")
+    with (
+        ConfigServer(
+            config_path, poll_interval=0.02, use_inotify=False
+        ) as server,
+        ConfigDaemonClient(server.socket_path) as client,
+    ):
+        assert client.ping()
+    assert not server.socket_path.exists()
+
+
+def test_resolvers_use_daemon(server, config_path, mocker):
+    read = mocker.spy(resolvers, "read_config_file")
+    config = resolvers.get_resolved_config(config_path)
+    assert config[QUALIBRATE_CONFIG_KEY]["project"] == "p1"
+    read.assert_not_called()
+    qualibrate_config = resolvers.get_qualibrate_config(
+        config_path, use_cache=False
+    )
+    assert qualibrate_config.storage.location == config_path.parent / "p1"
+    read.assert_not_called()
+
+
+def test_resolvers_fall_back_to_file(config_path, mocker):
+    read = mocker.spy(resolvers, "read_config_file")
+    config = resolvers.get_resolved_config(config_path)
+    assert config[QUALIBRATE_CONFIG_KEY]["project"] == "p1"
+    read.assert_called_once()
+
+
+def test_resolvers_ignore_stale_daemon_snapshot(
+    config_path, mocker, write_config
+):
+    with ConfigServer(config_path, poll_interval=0.02, use_inotify=False):
+        mocker.patch.object(ConfigServer, "refresh")  # snapshot isn't updated
+        write_config(config_path, "p2")
+        from_daemon = mocker.spy(resolvers, "_config_from_daemon")
+        config = resolvers.get_resolved_config(config_path)
+    assert config[QUALIBRATE_CONFIG_KEY]["project"] == "p2"
+    assert from_daemon.spy_return is None
+
+
+def test_served_config_has_no_daemon_overrides(config_path, monkeypatch):
+    monkeypatch.setenv("QUALIBRATE__QUALIBRATE__LOG_FOLDER", "/daemon")
+    with ConfigServer(
+        config_path, poll_interval=0.02, use_inotify=False
+    ) as server:
+        monkeypatch.delenv("QUALIBRATE__QUALIBRATE__LOG_FOLDER")
+        with ConfigDaemonClient(server.socket_path) as client:
+            served = client.get(resolved=False).data
+        assert "log_folder" not in served[QUALIBRATE_CONFIG_KEY]
+        config = resolvers.get_resolved_config(config_path)
+    assert "log_folder" not in config[QUALIBRATE_CONFIG_KEY]
+
+
+def test_resolvers_apply_local_overrides_to_daemon_config(
+    server, config_path, monkeypatch, mocker
+):
+    monkeypatch.setenv("QUALIBRATE__QUALIBRATE__LOG_FOLDER", "/local")
+    read = mocker.spy(resolvers, "read_config_file")
+    config = resolvers.get_resolved_config(config_path)
+    assert config[QUALIBRATE_CONFIG_KEY]["log_folder"] == "/local"
+    read.assert_not_called()
+
+
+def test_resolvers_dont_use_daemon_config_of_other_project(
+    server, config_path, monkeypatch, mocker
+):
+    monkeypatch.setenv("QUALIBRATE__QUALIBRATE__PROJECT", "p2")
+    read = mocker.spy(resolvers, "read_config_file")
+    config = resolvers.get_resolved_config(config_path)
+    assert config[QUALIBRATE_CONFIG_KEY]["project"] == "p2"
+    assert config[QUALIBRATE_CONFIG_KEY]["storage"]["location"] == str(
+        config_path.parent / "p2"
+    )
+    read.assert_called_once()
@@ -0,0 +1,225 @@
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+import tomli_w
+
+from qualibrate_config.vars import QUALIBRATE_CONFIG_KEY
+from qualibrate_config.watcher import ConfigWatcher, _PollingBackend
+
+
+def _write_overlay(qualibrate_path, project, storage):
+    overlay = qualibrate_path / "projects" / project / "config.toml"
+    overlay.parent.mkdir(parents=True, exist_ok=True)
+    with overlay.open("wb") as f_out:
+        tomli_w.dump(
+            {QUALIBRATE_CONFIG_KEY: {"storage": {"location": str(storage)}}},
+            f_out,
+        )
+
+
+@pytest.fixture
+def config_path(tmp_path, write_config):
+    path = tmp_path / "config.toml"
+    write_config(path, "p1", tmp_path / "s1")
+    return path
+
+
+@pytest.fixture(
+    params=[
+        pytest.param(
+            True,
+            id="inotify",
+            marks=pytest.mark.skipif(
+                not sys.platform.startswith("linux"), reason="linux only"
+            ),
+        ),
+        pytest.param(False, id="polling"),
+    ]
+)
+def use_inotify(request):
+    return request.param
+
+
+def _watcher(config_path, use_inotify):
+    return ConfigWatcher(
+        config_path,
+        debounce=0.05,
+        poll_interval=0.05 if not use_inotify else 1.0,
+        use_inotify=use_inotify,
+    )
+
+
+def test_config_is_loaded_lazily_and_cached(config_path, mocker):
+    watcher = ConfigWatcher(config_path)
+    get_config = mocker.spy(
+        sys.modules["qualibrate_config.watcher"], "get_qualibrate_config"
+    )
+    config = watcher.config
+    assert config.project == "p1"
+    assert watcher.config is config
+    get_config.assert_called_once_with(config_path, use_cache=True)
+
+
+def test_watched_paths_include_active_overlay(config_path, tmp_path):
+    watcher = ConfigWatcher(config_path)
+    watcher.reload()
+    assert watcher.watched_paths == (
+        config_path,
+        tmp_path / "projects" / "p1" / "config.toml",
+    )
+
+
+def test_check_without_changes_doesnt_reload(config_path):
+    watcher = ConfigWatcher(config_path)
+    config = watcher.config
+    assert watcher.check() is False
+    assert watcher.config is config
+
+
+def test_check_same_content_rewrite_doesnt_reload(config_path, tmp_path):
+    watcher = ConfigWatcher(config_path)
+    config = watcher.config
+    content = config_path.read_bytes()
+    config_path.write_bytes(content)
+    os.utime(config_path, ns=(1, 1))
+    assert watcher.check() is False
+    assert watcher.config is config
+
+
+def test_check_reloads_on_change(config_path, tmp_path, write_config):
+    watcher = ConfigWatcher(config_path)
+    received = []
+    watcher.subscribe(received.append)
+    watcher.config  # noqa: B018
+    write_config(config_path, "p1", tmp_path / "s2")
+    assert watcher.check() is True
+    assert watcher.config.storage.location == tmp_path / "s2"
+    assert received == [watcher.config]
+
+
+def test_check_keeps_old_config_on_invalid_file(config_path):
+    watcher = ConfigWatcher(config_path)
+    config = watcher.config
+    config_path.write_text("[qualibrate\n")
+    assert watcher.check() is False
+    assert watcher.config is config
+
+
+def test_unsubscribe(config_path, tmp_path, write_config):
+    watcher = ConfigWatcher(config_path)
+    received = []
+    unsubscribe = watcher.subscribe(received.append)
+    watcher.config  # noqa: B018
+    unsubscribe()
+    write_config(config_path, "p1", tmp_path / "s2")
+    watcher.check()
+    assert received == []
+
+
+def test_callback_error_doesnt_break_others(config_path):
+    watcher = ConfigWatcher(config_path)
+    received = []
+    watcher.subscribe(lambda c: 1 / 0)
+    watcher.subscribe(received.append)
+    watcher.reload()
+    assert len(received) == 1
+
+
+def test_polling_backend_always_reports_wakeup():
+    backend = _PollingBackend()
+    assert backend.wait(0) is True
+
+
+def test_stop_timeout_backend_closed_by_thread(config_path, mocker):
+    watcher = ConfigWatcher(config_path, poll_interval=0.2, use_inotify=False)
+    watcher.start()
+    thread, backend = watcher._thread, watcher._backend
+    close = mocker.spy(backend, "close")
+    watcher.stop(timeout=0)
+    # the thread is still waiting on the backend
+    assert thread.is_alive()
+    close.assert_not_called()
+    # restart doesn't resume the old thread or share its backend
+    watcher.start()
+    assert watcher._backend is not backend
+    thread.join()
+    close.assert_called_once()
+    assert watcher.running and watcher._thread.is_alive()
+    watcher.stop()
+
+
+def test_watcher_pushes_base_change(
+    config_path, tmp_path, use_inotify, write_config
+):
+    changed = threading.Event()
+    received = []
+
+    def on_change(config):
+        received.append(config)
+        changed.set()
+
+    with _watcher(config_path, use_inotify) as watcher:
+        watcher.subscribe(on_change)
+        write_config(config_path, "p1", tmp_path / "s2")
+        assert changed.wait(5)
+    assert received[-1].storage.location == tmp_path / "s2"
+
+
+def test_watcher_pushes_overlay_change(config_path, tmp_path, use_inotify):
+    _write_overlay(tmp_path, "p1", tmp_path / "o1")
+    changed = threading.Event()
+    with _watcher(config_path, use_inotify) as watcher:
+        assert watcher.config.storage.location == tmp_path / "o1"
+        watcher.subscribe(lambda c: changed.set())
+        _write_overlay(tmp_path, "p1", tmp_path / "o2")
+        assert changed.wait(5)
+        assert watcher.config.storage.location == tmp_path / "o2"
+
+
+def test_watcher_follows_project_switch(
+    config_path, tmp_path, use_inotify, write_config
+):
+    _write_overlay(tmp_path, "p2", tmp_path / "o1")
+    changed = threading.Event()
+    with _watcher(config_path, use_inotify) as watcher:
+        watcher.subscribe(lambda c: changed.set())
+        write_config(config_path, "p2", tmp_path / "s1")
+        assert changed.wait(5)
+        assert watcher.config.project == "p2"
+        changed.clear()
+        _write_overlay(tmp_path, "p2", tmp_path / "o2")
+        assert changed.wait(5)
+        assert watcher.config.storage.location == tmp_path / "o2"
+
+
+def test_watcher_debounces_bursts(config_path, tmp_path, mocker, write_config):
+    watcher = ConfigWatcher(
+        config_path, debounce=0.3, poll_interval=0.05, use_inotify=False
+    )
+    with watcher:
+        load = mocker.spy(watcher, "_load")
+        changed = threading.Event()
+        watcher.subscribe(lambda c: changed.set())
+        for i in range(5):
+            write_config(config_path, "p1", tmp_path / f"s{i}")
+        assert changed.wait(5)
+    assert load.call_count == 1
+    assert watcher.config.storage.location == tmp_path / "s4"
+
+
+def test_subscribe_queue(config_path, tmp_path, write_config):
+    async def main():
+        queue = asyncio.Queue()
+        watcher = ConfigWatcher(
+            config_path, debounce=0.05, poll_interval=0.05, use_inotify=False
+        )
+        with watcher:
+            watcher.subscribe_queue(queue)
+            write_config(config_path, "p1", tmp_path / "s2")
+            return await asyncio.wait_for(queue.get(), 5)
+
+    config = asyncio.run(main())
+    assert config.storage.location == tmp_path / "s2"